@@ -0,0 +1,90 @@
+# Contention benchmark of a ledger recording the entries sent by 8 threads, guarded by a threading.Lock, run by an
+# @active_object (the callers queue the calls and go on, the time includes draining the mailbox) and by an
+# @active_object whose record method is @batched. "in memory" calls only append to a list; "blocking" ones also sleep
+# 50us per run, as when flushing to a file or a socket, which a batched run pays once for all the calls it merges.
+# Run from the repository root: python benchmarks/bench_active_object.py
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from decorators import active_object, batched  # noqa: E402
+
+THREADS = 8
+
+
+class LockedLedger:
+    def __init__(self, delay: float):
+        self.entries = []
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def record(self, entry):
+        with self.lock:
+            if self.delay:
+                time.sleep(self.delay)
+            self.entries.append(entry)
+
+    def size(self):
+        with self.lock:
+            return len(self.entries)
+
+
+@active_object
+class ActiveLedger:
+    def __init__(self, delay: float):
+        self.entries = []
+        self.delay = delay
+
+    def record(self, entry):
+        if self.delay:
+            time.sleep(self.delay)
+        self.entries.append(entry)
+
+    def size(self):
+        return len(self.entries)
+
+
+@active_object
+class BatchedLedger:
+    def __init__(self, delay: float):
+        self.entries = []
+        self.delay = delay
+
+    @batched
+    def record(self, entries):
+        if self.delay:
+            time.sleep(self.delay)
+        self.entries.extend(entries)
+
+    def size(self):
+        return len(self.entries)
+
+
+def bench(label: str, ledger, operations: int):
+    def work():
+        record = ledger.record
+        for entry in range(operations):
+            record(entry)
+
+    threads = [threading.Thread(target=work) for _ in range(THREADS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    size = ledger.size()
+    # The size of an active object is a future, resolved once the calls queued before it ran.
+    size = size.result() if hasattr(size, "result") else size
+    elapsed = time.perf_counter() - start
+    assert size == THREADS * operations, size
+    print(f"{label:<36} {THREADS * operations / elapsed:14,.0f} ops/s")
+
+
+if __name__ == "__main__":
+    for delay, operations, scenario in ((0.0, 50_000, "in memory"), (0.00005, 500, "blocking")):
+        for name, ledger_class in (("threading.Lock", LockedLedger), ("active_object", ActiveLedger),
+                                   ("active_object, batched", BatchedLedger)):
+            bench(f"{scenario}, {name}", ledger_class(delay), operations)
@@ -0,0 +1,35 @@
+# Hit latency of @cache_aside with each cache backend.
+# Run from the repository root: python benchmarks/bench_cache_backends.py
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from decorators import DiskBackend, MemoryBackend, SharedMemoryBackend, cache_aside  # noqa: E402
+
+NUMBER = 100_000
+
+
+def bench(label: str, backend):
+    @cache_aside(backend=backend)
+    def load(row_id: int) -> dict:
+        return {"id": row_id, "name": f"row {row_id}"}
+
+    load(1)
+    best = min(timeit.repeat(lambda: load(1), number=NUMBER, repeat=5))
+    print(f"{label:<24} {best / NUMBER * 10 ** 9:10.1f} ns per hit")
+
+
+if __name__ == "__main__":
+    directory = tempfile.mkdtemp()
+    shared = SharedMemoryBackend(f"bench-cache-{os.getpid()}")
+    try:
+        bench("default (no backend)", None)
+        bench("MemoryBackend", MemoryBackend())
+        bench("SharedMemoryBackend", shared)
+        bench("DiskBackend", DiskBackend(os.path.join(directory, "cache.db")))
+    finally:
+        shared.close()
+        os.unlink(shared.path)
@@ -0,0 +1,53 @@
+# Scaling of a CPU-bound @compute_kernel over the number of worker processes, against a plain loop. Expect close to
+# linear speedup up to the number of cores (printed first), and none past it.
+# Run from the repository root: python benchmarks/bench_compute_kernel.py
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from decorators import compute_kernel, thread_pool  # noqa: E402
+
+ITEMS = 200_000
+
+
+@compute_kernel
+def collatz_steps(n: int) -> int:
+    steps = 0
+    n += 1
+    while n != 1:
+        n = n // 2 if n % 2 == 0 else 3 * n + 1
+        steps += 1
+    return steps
+
+
+def bench(label: str, run, baseline=None) -> float:
+    run()  # warm up (starts the worker processes)
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+    speedup = f"{baseline / elapsed:6.2f}x" if baseline else ""
+    print(f"{label:<36} {elapsed * 1000:10.1f} ms {ITEMS / elapsed:14,.0f} items/s {speedup}")
+    return result, elapsed
+
+
+if __name__ == "__main__":
+    cores = os.cpu_count() or 1
+    print(f"{cores} CPUs")
+    expected, baseline = bench("plain loop", lambda: [collatz_steps(n) for n in range(ITEMS)])
+    for workers in sorted({1, 2, 4, cores, 2 * cores}):
+        result, _ = bench(f"compute_kernel.map, {workers} workers",
+                          lambda: collatz_steps.map(range(ITEMS), workers=workers), baseline)
+        assert result == expected
+    try:
+        import numpy
+    except ImportError:
+        print("numpy is not installed, shared memory path skipped")
+    else:
+        items = numpy.arange(ITEMS)
+        for workers in sorted({2, cores}):
+            result, _ = bench(f"compute_kernel.map, numpy, {workers} workers",
+                              lambda: collatz_steps.map(items, workers=workers), baseline)
+            assert result.tolist() == expected
+    thread_pool.shutdown()
@@ -0,0 +1,65 @@
+# Construction and serialization speed of @data_transfer_object records against dataclasses(slots=True).
+# Run from the repository root: python benchmarks/bench_dto.py
+import dataclasses
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from decorators import data_transfer_object  # noqa: E402
+
+NUMBER = 200_000
+
+
+@data_transfer_object
+class Order:
+    id: int
+    customer: str
+    amount: float
+    paid: bool = False
+
+
+@data_transfer_object(frozen=True)
+class FrozenOrder:
+    id: int
+    customer: str
+    amount: float
+    paid: bool = False
+
+
+@dataclasses.dataclass(slots=True)
+class OrderData:
+    id: int
+    customer: str
+    amount: float
+    paid: bool = False
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class FrozenOrderData:
+    id: int
+    customer: str
+    amount: float
+    paid: bool = False
+
+
+def bench(label: str, function, number: int = NUMBER):
+    best = min(timeit.repeat(function, number=number, repeat=5))
+    print(f"{label:<44} {best / number * 10 ** 9:10.1f} ns")
+
+
+if __name__ == "__main__":
+    for cls in (Order, FrozenOrder, OrderData, FrozenOrderData):
+        bench(f"construct {cls.__name__}", lambda: cls(1, "acme", 9.5))
+    order, order_data = Order(1, "acme", 9.5), OrderData(1, "acme", 9.5)
+    bench("Order.to_tuple()", order.to_tuple)
+    bench("dataclasses.astuple(OrderData)", lambda: dataclasses.astuple(order_data))
+    bench("Order.to_dict()", order.to_dict)
+    bench("dataclasses.asdict(OrderData)", lambda: dataclasses.asdict(order_data))
+    orders = [Order(i, "acme", i * 1.5) for i in range(1000)]
+    orders_data = [OrderData(i, "acme", i * 1.5) for i in range(1000)]
+    bench("Order.to_json(1000 orders)", lambda: Order.to_json(orders), 200)
+    bench("json.dumps(asdict(1000 orders))", lambda: json.dumps([dataclasses.asdict(o) for o in orders_data]), 200)
+    bench("Order.to_columns(1000 orders)", lambda: Order.to_columns(orders), 200)
@@ -0,0 +1,84 @@
+# Throughput of an EventBus topic with 1000 subscribers (bound methods counting their events), in events published per
+# second, the time including the delivery of all the events: "sync" calls every subscriber in the publisher, "thread"
+# queues the events per subscriber and drains the queues on a thread pool, one call per event or per batch, and
+# "asyncio" drains them as tasks of the event loop. The slow subscriber runs add 10 subscribers sleeping 1ms per call:
+# in sync mode they hold the publisher up, in thread mode their bounded queues drop the oldest events instead.
+# Run from the repository root: python benchmarks/bench_event_bus.py
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from decorators import EventBus, thread_pool  # noqa: E402
+
+SUBSCRIBERS = 1000
+
+
+class Counter:
+    def __init__(self):
+        self.events = 0
+
+    def on_event(self, event):
+        self.events += 1
+
+    def on_batch(self, events):
+        self.events += len(events)
+
+    async def on_batch_async(self, events):
+        self.events += len(events)
+
+
+def slow(event):
+    time.sleep(0.001)
+
+
+def subscribe(bus: EventBus, counters: list, method: str, slow_subscribers: int = 0, **options):
+    for counter in counters:
+        bus.subscribe("tick", getattr(counter, method), **options)
+    for _ in range(slow_subscribers):
+        bus.subscribe("tick", slow, **({"maxsize": 64, "policy": "drop_oldest"} if bus.mode != "sync" else {}))
+
+
+def bench(label: str, events: int, mode: str, method: str = "on_event", slow_subscribers: int = 0, **options):
+    bus = EventBus(mode, pool="bench")
+    counters = [Counter() for _ in range(SUBSCRIBERS)]
+    subscribe(bus, counters, method, slow_subscribers, **options)
+    start = time.perf_counter()
+    for event in range(events):
+        bus.publish("tick", event)
+    published = time.perf_counter() - start
+    bus.drain()
+    elapsed = time.perf_counter() - start
+    # Coalesced events are replaced by newer ones while queued, so fewer of them reach the subscribers.
+    assert all(counter.events == events or "coalesce" in options for counter in counters)
+    print(f"{label:<44} {events / elapsed:10,.0f} events/s {SUBSCRIBERS * events / elapsed:12,.0f} deliveries/s"
+          f"   publish {published / events * 1e6:9.1f} us/event")
+
+
+async def bench_async(label: str, events: int, **options):
+    bus = EventBus("asyncio")
+    counters = [Counter() for _ in range(SUBSCRIBERS)]
+    subscribe(bus, counters, "on_batch_async", **options)
+    start = time.perf_counter()
+    for event in range(events):
+        bus.publish("tick", event)
+    published = time.perf_counter() - start
+    while any(counter.events < events for counter in counters):
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44} {events / elapsed:10,.0f} events/s {SUBSCRIBERS * events / elapsed:12,.0f} deliveries/s"
+          f"   publish {published / events * 1e6:9.1f} us/event")
+
+
+if __name__ == "__main__":
+    thread_pool("bench", max_workers=4, max_queue=None)
+    bench("sync", 2_000, "sync")
+    bench("thread, one call per event", 2_000, "thread")
+    bench("thread, batch=256", 2_000, "thread", "on_batch", batch=256)
+    bench("thread, batch=256, coalesce", 2_000, "thread", "on_batch", batch=256, coalesce=lambda event: event % 16)
+    asyncio.run(bench_async("asyncio, batch=256", 2_000, batch=256))
+    bench("sync, 10 slow subscribers", 200, "sync", slow_subscribers=10)
+    bench("thread, batch=256, 10 slow subscribers", 200, "thread", "on_batch", slow_subscribers=10, batch=256)
+    thread_pool.shutdown()
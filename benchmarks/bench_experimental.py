@@ -0,0 +1,49 @@
+# Per-call cost of @experimental functions after their first warning: called by name (the original is back in the
+# module), through a reference to the wrapper taken before the first call, and in the per_call_site and count modes.
+# Run from the repository root: python benchmarks/bench_experimental.py
+import os
+import sys
+import timeit
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from decorators import experimental  # noqa: E402
+
+NUMBER = 1_000_000
+
+
+def plain(x):
+    return x
+
+
+@experimental
+def once(x):
+    return x
+
+
+@experimental(per_call_site=True)
+def per_site(x):
+    return x
+
+
+@experimental(count=True)
+def counted(x):
+    return x
+
+
+def bench(label: str, statement: str):
+    elapsed = min(timeit.repeat(statement, number=NUMBER, repeat=5, globals=globals()))
+    print(f"{label:<44} {elapsed / NUMBER * 1e9:8.1f} ns/call")
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore")
+    retained = once
+    once(0)
+    bench("undecorated", "plain(1)")
+    bench("experimental, by name", "once(1)")
+    bench("experimental, reference taken before", "retained(1)")
+    bench("experimental(per_call_site=True)", "per_site(1)")
+    bench("experimental(count=True)", "counted(1)")
+    print(experimental.counts())
@@ -0,0 +1,48 @@
+# Memory per instance and construction throughput of a small value class, plain and with @flyweight.
+# Run from the repository root: python benchmarks/bench_flyweight.py
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from decorators import flyweight  # noqa: E402
+
+COUNT = 200_000
+# Number of distinct argument combinations among the constructed objects.
+DISTINCT = 1_000
+
+
+class Point:
+    x: int
+    y: int
+
+    def __init__(self, x: int, y: int):
+        self.x = x
+        self.y = y
+
+
+SlottedPoint = flyweight(slots=True)(type("Point", (), {"__annotations__": Point.__annotations__,
+                                                          "__init__": Point.__init__}))
+InternedPoint = flyweight(type("Point", (), {"__init__": Point.__init__}))
+
+
+def bench(label: str, cls: type, distinct: int):
+    tracemalloc.start()
+    start = time.perf_counter()
+    points = [cls(i % distinct, 0) for i in range(COUNT)]
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list itself holds 8 bytes per item.
+    per_instance = (size - 8 * len(points)) / COUNT
+    print(f"{label:<36} {per_instance:8.1f} bytes/instance {COUNT / elapsed:12,.0f} constructions/s")
+
+
+if __name__ == "__main__":
+    bench("plain, all distinct", Point, COUNT)
+    bench("@flyweight(slots=True), all distinct", SlottedPoint, COUNT)
+    bench(f"plain, {DISTINCT} distinct", Point, DISTINCT)
+    bench(f"@flyweight, {DISTINCT} distinct", InternedPoint, DISTINCT)
+    bench(f"@flyweight(slots=True), {DISTINCT} distinct", SlottedPoint, DISTINCT)
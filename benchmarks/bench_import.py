@@ -0,0 +1,55 @@
+# Import cost of the package, per decorator: each statement runs in a fresh interpreter with -X importtime, the time is
+# the best of REPEAT runs and the modules are those the statement loaded. Exits with an error when a light decorator
+# loads one of the HEAVY modules, so that an eager import added to the package shows up as a regression.
+# Run from the repository root: python benchmarks/bench_import.py
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPEAT = 7
+# The concurrency and caching engines, and the modules only they need.
+HEAVY = ("asyncio", "concurrent.futures", "sqlite3", "decorators._concurrency", "decorators._caching")
+STATEMENTS = [
+    # (statement, whether it may load HEAVY modules)
+    ("import decorators", False),
+    ("from decorators import url", False),
+    ("from decorators import timed", False),
+    ("from decorators import singleton", False),
+    ("from decorators import retry", False),
+    ("from decorators import observer", False),
+    ("from decorators import thread_pool", True),
+    ("from decorators import cache_aside", True),
+    ("from decorators import *", True),
+]
+PROGRAM = "import time; start = time.perf_counter(); {}; print(time.perf_counter() - start)"
+
+
+def loaded(stderr: str) -> list:
+    # -X importtime lines are "import time: self | cumulative | name", the names indented by nesting level.
+    return [line.rsplit("|", 1)[1].strip() for line in stderr.splitlines()[1:] if line.startswith("import time:")]
+
+
+def run(program: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, "-X", "importtime", "-c", program], cwd=ROOT, capture_output=True,
+                          text=True, check=True)
+
+
+def measure(statement: str, baseline: set):
+    runs = [run(PROGRAM.format(statement)) for _ in range(REPEAT)]
+    modules = [name for name in loaded(runs[0].stderr) if name not in baseline]
+    return min(float(result.stdout) for result in runs), modules
+
+
+if __name__ == "__main__":
+    baseline = set(loaded(run(PROGRAM.format("pass")).stderr))
+    regressions = []
+    for statement, heavy in STATEMENTS:
+        elapsed, modules = measure(statement, baseline)
+        print(f"{statement:<36} {elapsed * 1e3:8.1f} ms {len(modules):6} modules")
+        unexpected = [name for name in HEAVY if name in modules]
+        if unexpected and not heavy:
+            regressions.append(f"{statement} loads {', '.join(unexpected)}")
+    for regression in regressions:
+        print(f"regression: {regression}")
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,102 @@
+# Contention benchmark of a shared dict cache updated by 8 threads (90% reads), guarded by one threading.Lock, by a
+# @read_write_lock class and by a @lock_striping class. "in memory" critical sections only touch the dict (the cost
+# of the locks themselves); "blocking" ones also sleep 50us while holding the lock, as with I/O or GIL releasing
+# work, which is where concurrent readers and disjoint stripes pay off.
+# Run from the repository root: python benchmarks/bench_locks.py
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from decorators import lock_striping, read_write_lock, reader, striped, writer  # noqa: E402
+
+THREADS = 8
+KEYS = 1024
+
+
+class LockedCache:
+    def __init__(self, delay: float):
+        self.data = {}
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if self.delay:
+                time.sleep(self.delay)
+            return self.data.get(key)
+
+    def set(self, key, value):
+        with self.lock:
+            if self.delay:
+                time.sleep(self.delay)
+            self.data[key] = value
+
+
+@read_write_lock(writer_preference=True)
+class ReadWriteCache:
+    def __init__(self, delay: float):
+        self.data = {}
+        self.delay = delay
+
+    @reader
+    def get(self, key):
+        if self.delay:
+            time.sleep(self.delay)
+        return self.data.get(key)
+
+    @writer
+    def set(self, key, value):
+        if self.delay:
+            time.sleep(self.delay)
+        self.data[key] = value
+
+
+@lock_striping(64)
+class StripedCache:
+    def __init__(self, delay: float):
+        self.data = {}
+        self.delay = delay
+
+    @striped
+    def get(self, key):
+        if self.delay:
+            time.sleep(self.delay)
+        return self.data.get(key)
+
+    @striped
+    def set(self, key, value):
+        if self.delay:
+            time.sleep(self.delay)
+        self.data[key] = value
+
+
+def bench(label: str, cache, operations: int):
+    plan = [(random.random() < 0.1, random.randrange(KEYS)) for _ in range(operations)]
+
+    def work():
+        get, set = cache.get, cache.set
+        for write, key in plan:
+            if write:
+                set(key, key)
+            else:
+                get(key)
+
+    threads = [threading.Thread(target=work) for _ in range(THREADS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {THREADS * operations / elapsed:14,.0f} ops/s")
+
+
+if __name__ == "__main__":
+    for delay, operations, scenario in ((0.0, 100_000, "in memory"), (0.00005, 500, "blocking")):
+        for name, cache_class in (("threading.Lock", LockedCache), ("read_write_lock", ReadWriteCache),
+                                  ("lock_striping(64)", StripedCache)):
+            bench(f"{scenario}, {name}", cache_class(delay), operations)
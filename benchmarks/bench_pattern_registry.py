@@ -0,0 +1,55 @@
+# Import-time cost of the pattern index: executes a generated module of CLASSES classes decorated with two marker
+# patterns each, with the indexing decorators, with the same decorators unwrapped (no index) and without decorators,
+# then times index lookups.
+# Run from the repository root: python benchmarks/bench_pattern_registry.py
+import os
+import sys
+import time
+import timeit
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import decorators  # noqa: E402
+from decorators import pattern  # noqa: E402
+
+CLASSES = 5_000
+
+
+def source(decorated: bool) -> str:
+    lines = []
+    for number in range(CLASSES):
+        if decorated:
+            lines.append("@null_object" if number % 2 else "@model")
+            lines.append("@behavioural")
+        lines.append(f"class Class{number}:\n    value = {number}\n")
+    return "\n".join(lines)
+
+
+def run(label: str, code, namespace: dict) -> float:
+    best = float("inf")
+    for attempt in range(5):
+        module = types.ModuleType(f"generated_{label.split()[0]}_{attempt}")
+        module.__dict__.update(namespace)
+        start = time.perf_counter()
+        exec(code, module.__dict__)
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<36} {best * 1000:10.2f} ms {best / CLASSES * 1e6:8.2f} us/class")
+    return best
+
+
+if __name__ == "__main__":
+    decorated = compile(source(True), "generated", "exec")
+    plain = compile(source(False), "generated", "exec")
+    indexing = {name: getattr(decorators, name) for name in ("null_object", "model", "behavioural")}
+    unwrapped = {name: function.__wrapped__ for name, function in indexing.items()}
+    base = run("no decorators", plain, {})
+    run("decorators without index", decorated, unwrapped)
+    run("decorators with index", decorated, indexing)
+    lookups = 1_000_000
+    for label, statement in (("pattern.by_pattern('model')", lambda: pattern.by_pattern("model")),
+                             ("pattern.of(cls)", lambda: pattern.of(decorators.Tray if hasattr(decorators, "Tray")
+                                                                     else decorators.MemoryBackend))):
+        elapsed = min(timeit.repeat(statement, number=lookups // 100, repeat=3)) / (lookups // 100)
+        print(f"{label:<36} {elapsed * 1e6:10.2f} us")
+    print(f"classes indexed under 'model': {len(pattern.by_pattern('model')):,}")
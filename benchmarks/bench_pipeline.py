@@ -0,0 +1,63 @@
+# Throughput of two stage @pipeline runs per worker kind, item by item and micro-batched, and the peak memory of a run
+# over an input much larger than the queues (it stays flat whatever ITEMS is).
+# Run from the repository root: python benchmarks/bench_pipeline.py
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from decorators import pipeline  # noqa: E402
+
+ITEMS = 200_000
+
+
+def double(items):
+    for item in items:
+        yield item * 2
+
+
+def double_batches(batches):
+    for batch in batches:
+        yield from [item * 2 for item in batch]
+
+
+async def double_async(items):
+    async for item in items:
+        yield item * 2
+
+
+async def double_async_batches(batches):
+    async for batch in batches:
+        for item in batch:
+            yield item * 2
+
+
+thread_stage = pipeline(double)
+thread_batched = pipeline(double_batches, batch=256)
+process_stage = pipeline(double_batches, workers=2, kind="process", batch=256)
+async_stage = pipeline(double_async)
+async_batched = pipeline(double_async_batches, batch=256)
+
+
+def bench(label: str, stages):
+    flow = range(ITEMS)
+    for stage in stages:
+        flow = flow | stage
+    start = time.perf_counter()
+    count = flow.run()
+    elapsed = time.perf_counter() - start
+    assert count == ITEMS
+    print(f"{label:<36} {count / elapsed:14,.0f} items/s")
+
+
+if __name__ == "__main__":
+    bench("threads", [thread_stage, thread_stage])
+    bench("threads, batch=256", [thread_batched, thread_batched])
+    bench("asyncio", [async_stage, async_stage])
+    bench("asyncio, batch=256", [async_batched, async_batched])
+    bench("processes x2, batch=256", [process_stage, thread_batched])
+    tracemalloc.start()
+    (range(10 * ITEMS) | thread_batched | thread_batched).run()
+    print(f"{'peak memory, ' + format(10 * ITEMS, ',') + ' items':<36} {tracemalloc.get_traced_memory()[1]:14,} bytes")
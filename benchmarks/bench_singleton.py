@@ -0,0 +1,46 @@
+# Steady-state cost of getting the instance of a @singleton class, compared with the usual alternatives: reading a
+# module global and calling an accessor function that lazily fills a module global.
+# Run from the repository root: python benchmarks/bench_singleton.py
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from decorators import singleton  # noqa: E402
+
+
+@singleton
+class Client:
+    pass
+
+
+class PlainClient:
+    pass
+
+
+_client = None
+
+
+def get_client():
+    global _client
+    if _client is None:
+        _client = PlainClient()
+    return _client
+
+
+CLIENT = PlainClient()
+NUMBER = 1_000_000
+
+
+def bench(label: str, statement: str):
+    best = min(timeit.repeat(statement, globals=globals(), number=NUMBER, repeat=5))
+    print(f"{label:<32} {best / NUMBER * 10 ** 9:8.1f} ns")
+
+
+if __name__ == "__main__":
+    Client()
+    bench("module global", "CLIENT")
+    bench("accessor function", "get_client()")
+    bench("@singleton Client()", "Client()")
+    bench("plain PlainClient()", "PlainClient()")
@@ -0,0 +1,42 @@
+# Per-call cost of getting the current thread's (or task's) instance of a @thread_specific_storage class, against a
+# threading.local attribute read and against constructing the object on every call.
+# Run from the repository root: python benchmarks/bench_thread_specific_storage.py
+import asyncio
+import os
+import sys
+import threading
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from decorators import thread_specific_storage  # noqa: E402
+
+NUMBER = 1_000_000
+
+
+class Parser:
+    def __init__(self):
+        self.buffer = bytearray(64)
+
+
+PerTask = thread_specific_storage(Parser)
+PerThread = thread_specific_storage(Parser, per_task=False)
+local = threading.local()
+local.parser = Parser()
+
+
+def bench(label: str, statement, number: int = NUMBER):
+    elapsed = min(timeit.repeat(statement, number=number, repeat=5))
+    print(f"{label:<44} {elapsed / number * 1e9:8.1f} ns/call")
+
+
+async def in_task():
+    bench("PerTask(), in an asyncio task", PerTask)
+
+
+if __name__ == "__main__":
+    bench("threading.local attribute read", lambda: local.parser)
+    bench("Parser(), new instance", Parser)
+    bench("PerThread(), per_task=False", PerThread)
+    bench("PerTask(), in a thread", PerTask)
+    asyncio.run(in_task())
@@ -0,0 +1,45 @@
+# Throughput of rate limit checks over many distinct keys, for both algorithms, directly on the RateLimiter and through
+# a @throttling function.
+# Run from the repository root: python benchmarks/bench_throttling.py
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from decorators import RateLimiter, ThrottledError, throttling  # noqa: E402
+
+KEYS = 100_000
+CHECKS = 1_000_000
+
+
+def bench(label: str, check, keys):
+    start = time.perf_counter()
+    for key in keys:
+        check(key)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44} {len(keys) / elapsed:14,.0f} checks/s")
+
+
+def call(function):
+    def check(key):
+        try:
+            function(key)
+        except ThrottledError:
+            pass
+    return check
+
+
+if __name__ == "__main__":
+    keys = [f"tenant-{random.randrange(KEYS)}" for _ in range(CHECKS)]
+    for algorithm in ("token_bucket", "sliding_window"):
+        limiter = RateLimiter(100, per=1.0, algorithm=algorithm, max_keys=KEYS)
+        bench(f"RateLimiter.try_acquire, {algorithm}", limiter.try_acquire, keys)
+
+        @throttling(100, key=lambda tenant: tenant, algorithm=algorithm, max_keys=KEYS)
+        def handle(tenant):
+            return tenant
+
+        bench(f"@throttling call, {algorithm}", call(handle), keys)
+        print(f"{'':<44} {handle.limiter.stats()['keys']:14,} keys tracked")
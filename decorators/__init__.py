@@ -0,0 +1,49 @@
+import importlib
+
+# The decorators are loaded on first use, from the module of their family: importing the package only builds this
+# table, and `from decorators import timed` loads the timing module without the concurrency and caching engines (and
+# the asyncio, concurrent.futures or sqlite3 modules they import).
+_MODULES = {
+    "_documentation": ("ExperimentalWarning", "doc_urls", "experimental", "url"),
+    "_timing": ("timed",),
+    "_patterns": ("behavioural", "concurrency", "creational", "data_pattern", "gof_pattern", "micro_service", "pattern",
+                  "structural"),
+    "_creational": ("abstract_factory", "builder", "dependency_injection", "factory", "lazy_initialization", "multiton",
+                    "object_pool", "prototype", "raii", "resource_aquisition_is_initialization", "singleton",
+                    "virtual_proxy"),
+    "_structural": ("adapter", "bridge", "composite", "decorator", "extension_object", "facade", "flyweight",
+                    "front_controller", "marker", "module", "proxy", "translator", "twin", "wrapper"),
+    "_behavioural": ("EventBus", "Subscription", "blackboard", "chain_of_responsibility", "command", "interpreter",
+                     "iterator", "mediator", "memento", "null_object", "objects_for_states", "observer",
+                     "publish_subscribe", "servant", "specification", "state", "state_design", "strategy", "template",
+                     "visitor"),
+    "_concurrency": ("BoundedExecutor", "Pipeline", "PoolFullError", "ReadWriteLock", "Stage", "StripedLock",
+                     "active_object", "batched", "binding_properties", "blockchain", "compute_kernel",
+                     "double_checked_locking", "event_based_asynchronous", "future", "guarded_suspension", "join",
+                     "lock", "lock_striping", "mdp", "messaging_design", "monitor", "optimistic_initialization",
+                     "pipeline", "reactor", "read_write_lock", "reader", "scheduler", "striped", "thread_pool",
+                     "thread_specific_storage", "writer"),
+    "_data": ("data_access_layer", "data_transfer_object", "dto"),
+    "_mvc": ("alert_view", "controller", "data_entry_view", "domain_management_view", "model", "model_view",
+             "mvc_pattern", "mvvm_pattern", "selection_view", "view"),
+    "_micro_services": ("CircuitBreaker", "CircuitOpenError", "RateLimiter", "RetryBudget", "ThrottledError",
+                        "circuit_breaker", "rest", "retry", "throttling"),
+    "_caching": ("CacheBackend", "DiskBackend", "MemoryBackend", "SharedMemoryBackend", "cache_aside"),
+    "_other": ("business_delegate", "intercepting_filter", "service_locator", "smart_enum", "smart_pointer",
+               "type_safe_enum"),
+}
+_LAZY = {name: module for module, names in _MODULES.items() for name in names}
+__all__ = sorted(_LAZY)
+
+
+def __getattr__(name: str):
+    # Called for the names not loaded yet. The value is stored in the package, so later lookups do not get here.
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
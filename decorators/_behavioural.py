@@ -0,0 +1,510 @@
+import functools
+import itertools
+import queue
+import sys
+import threading
+import time
+import weakref
+from collections import deque
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ._patterns import behavioural, gof_pattern
+
+
+# region Behavioral Patterns
+_MODES = ("sync", "thread", "asyncio")
+_POLICIES = ("block", "drop_oldest", "drop_newest")
+
+
+def _no_subscriber() -> None:
+    return None
+
+
+class Subscription:
+    # A callback subscribed to a topic of an EventBus. In "sync" mode publish calls it right away; in "thread" and
+    # "asyncio" modes events are queued (at most maxsize, then the policy applies: "block" the publisher, "drop_oldest"
+    # or "drop_newest" event) and delivered in order by a single drain at a time, run on a thread pool or as a task of
+    # the event loop the subscription was made from. With batch the callback gets lists of up to batch events, with
+    # coalesce(event) a key, a queued event is replaced by a newer one of the same key.
+    def __init__(self, bus: "EventBus", topic: Any, callback: Callable, mode: str, batch: Optional[int],
+                 coalesce: Optional[Callable[[Any], Any]], maxsize: Optional[int], policy: str, weak: bool):
+        if mode not in _MODES:
+            raise ValueError(f"unknown mode {mode!r}, use sync, thread or asyncio")
+        if policy not in _POLICIES:
+            raise ValueError(f"unknown policy {policy!r}, use block, drop_oldest or drop_newest")
+        if mode == "sync" and (batch or coalesce or maxsize):
+            raise ValueError("batch, coalesce and maxsize need a queued mode, thread or asyncio")
+        if mode == "asyncio" and maxsize and policy == "block":
+            # Publishing from the event loop would block the loop that drains the queue.
+            raise ValueError("a bounded asyncio subscription needs the drop_oldest or drop_newest policy")
+        self.bus = bus
+        self.topic = topic
+        self.mode = mode
+        self.batch = batch
+        self.coalesce = coalesce
+        self.maxsize = maxsize
+        self.policy = policy
+        if not weak:
+            self.ref = lambda: callback
+        else:
+            # Weak references do not keep the subscribers alive: a collected subscriber is unsubscribed. Bound methods
+            # are referenced through weakref.WeakMethod, as a new bound method object is created on every access.
+            forget = functools.partial(_forget, weakref.ref(self))
+            self.ref = (weakref.WeakMethod(callback, forget) if hasattr(callback, "__self__")
+                        and hasattr(callback, "__func__") else weakref.ref(callback, forget))
+        self.events: Any = {} if coalesce is not None else deque()
+        self.scheduled = False
+        self.lock = threading.Lock()
+        self.not_full = threading.Condition(self.lock)
+        self.waiting = 0
+        self.delivered = self.calls = self.dropped = self.coalesced = self.failed = self.peak = 0
+        self.task = None
+        if mode == "sync":
+            self.put = self._call
+        else:
+            self.put = self._enqueue
+        if mode == "asyncio":
+            import asyncio
+            self.loop = asyncio.get_running_loop()
+            self.loop_thread = threading.get_ident()
+
+    def cancel(self):
+        # Unsubscribes: events still queued are dropped.
+        self.bus.unsubscribe(self)
+
+    def _call(self, event: Any):
+        callback = self.ref()
+        if callback is None:
+            return
+        try:
+            callback(event)
+        except Exception as exc:
+            self.failed += 1
+            self.bus._error(exc, self)
+        self.calls += 1
+        self.delivered += 1
+
+    def _enqueue(self, event: Any):
+        events = self.events
+        if self.coalesce is not None:
+            key = self.coalesce(event)
+            with self.lock:
+                if key in events:
+                    events[key] = event
+                    self.coalesced += 1
+                    return
+                if self.maxsize is not None and len(events) >= self.maxsize and not self._make_room():
+                    return
+                events[key] = event
+        else:
+            if self.maxsize is not None and len(events) >= self.maxsize:
+                with self.lock:
+                    if len(events) >= self.maxsize and not self._make_room():
+                        return
+            events.append(event)
+        size = len(events)
+        if size > self.peak:
+            self.peak = size
+        if not self.scheduled and self._claim():
+            self._schedule()
+
+    def _make_room(self) -> bool:
+        # Called with the lock held when the queue is full; False when the event is to be dropped.
+        if self.policy == "drop_newest":
+            self.dropped += 1
+            return False
+        if self.policy == "drop_oldest":
+            events = self.events
+            if self.coalesce is not None:
+                del events[next(iter(events))]
+            else:
+                events.popleft()
+            self.dropped += 1
+            return True
+        self.waiting += 1
+        try:
+            while len(self.events) >= self.maxsize and self.ref is not _no_subscriber:
+                self.not_full.wait()
+        finally:
+            self.waiting -= 1
+        return True
+
+    def _drop_events(self):
+        with self.lock:
+            self.events.clear()
+            self.scheduled = False
+            self.not_full.notify_all()
+
+    def _claim(self) -> bool:
+        # Makes the caller the one scheduling the drain, if no drain is scheduled or running.
+        with self.lock:
+            if self.scheduled:
+                return False
+            self.scheduled = True
+            return True
+
+    def _schedule(self):
+        if self.mode == "thread":
+            self.bus._dispatch(self)
+        elif threading.get_ident() == self.loop_thread:
+            self._start_task()
+        else:
+            self.loop.call_soon_threadsafe(self._start_task)
+
+    def _start_task(self):
+        # The loop only keeps weak references to its tasks.
+        self.task = self.loop.create_task(self._drain_async())
+
+    def _take(self) -> list:
+        # Up to batch (or 1) queued events, oldest first.
+        limit = self.batch or 1
+        events = self.events
+        if self.coalesce is not None:
+            with self.lock:
+                taken = [events.pop(key) for key in list(itertools.islice(events, limit))]
+        else:
+            taken = []
+            try:
+                while len(taken) < limit:
+                    taken.append(events.popleft())
+            except IndexError:
+                pass
+        if self.waiting and taken:
+            with self.lock:
+                self.not_full.notify_all()
+        return taken
+
+    def _done(self) -> bool:
+        # Ends a drain, unless events were queued while it finished (their publisher saw it still scheduled).
+        self.scheduled = False
+        return not self.events or not self._claim()
+
+    def _delivered(self, taken: list, exc: Optional[Exception]):
+        self.calls += 1
+        self.delivered += len(taken)
+        if exc is not None:
+            self.failed += 1
+            self.bus._error(exc, self)
+
+    def _drain(self):
+        while True:
+            taken = self._take()
+            while taken:
+                callback = self.ref()
+                if callback is None:
+                    # Unsubscribed: the events still queued are dropped, and blocked publishers let go.
+                    self._drop_events()
+                    return
+                try:
+                    callback(taken if self.batch else taken[0])
+                except Exception as exc:
+                    self._delivered(taken, exc)
+                else:
+                    self._delivered(taken, None)
+                taken = self._take()
+            if self._done():
+                return
+
+    async def _drain_async(self):
+        while True:
+            taken = self._take()
+            while taken:
+                callback = self.ref()
+                if callback is None:
+                    # Unsubscribed: the events still queued are dropped, and blocked publishers let go.
+                    self._drop_events()
+                    return
+                try:
+                    result = callback(taken if self.batch else taken[0])
+                    if hasattr(result, "__await__"):
+                        await result
+                except Exception as exc:
+                    self._delivered(taken, exc)
+                else:
+                    self._delivered(taken, None)
+                taken = self._take()
+            if self._done():
+                self.task = None
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "topic": self.topic,
+            "mode": self.mode,
+            "queued": len(self.events),
+            "peak_queued": self.peak,
+            "delivered": self.delivered,
+            "calls": self.calls,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+        }
+
+
+def _forget(subscription: Any, _):
+    # Called when a weakly referenced subscriber is collected, which may happen in a thread holding the lock of the bus
+    # or of the subscription: it only stops the deliveries, the bus unsubscribes it on its next subscribe or publish.
+    subscription = subscription()
+    if subscription is not None:
+        subscription.ref = _no_subscriber
+        subscription.bus._collected.append(subscription)
+
+
+class EventBus:
+    # In-process publish/subscribe. Subscriptions are indexed by topic (any hashable) in tuples replaced on change, so
+    # publish reads them without locking, and hold their callbacks through weak references by default (weak=False
+    # for lambdas and closures nothing else refers to). mode is the default dispatch of the subscriptions: "sync",
+    # "thread" (drained by runners on the thread_pool(pool) executor, so slow subscribers do not hold publishers up) or
+    # "asyncio".
+    # Exceptions of the subscribers are passed to on_error(exc, subscription), by default to sys.excepthook; they never
+    # reach the publisher.
+    def __init__(self, mode: str = "sync", *, pool: str = "observer",
+                 on_error: Optional[Callable[[Exception, Subscription], None]] = None):
+        if mode not in _MODES:
+            raise ValueError(f"unknown mode {mode!r}, use sync, thread or asyncio")
+        self.mode = mode
+        self.pool = pool
+        self.on_error = on_error
+        self._topics: Dict[Any, Tuple[Subscription, ...]] = {}
+        self._lock = threading.Lock()
+        # "thread" subscriptions with events to deliver, drained by up to max_workers runners of the pool. Scheduling a
+        # subscription is a put on this queue rather than a task of the pool, which costs much more per event.
+        self._ready: Any = queue.SimpleQueue()
+        self._runners = 0
+        self._executor = None
+        # Subscriptions of collected subscribers, see _forget.
+        self._collected: List[Subscription] = []
+
+    def subscribe(self, topic: Any, callback: Callable, *, mode: Optional[str] = None, batch: Optional[int] = None,
+                  coalesce: Optional[Callable[[Any], Any]] = None, maxsize: Optional[int] = None,
+                  policy: str = "block", weak: bool = True) -> Subscription:
+        if self._collected:
+            self._unsubscribe_collected()
+        subscription = Subscription(self, topic, callback, mode or self.mode, batch, coalesce, maxsize, policy, weak)
+        with self._lock:
+            self._topics[topic] = self._topics.get(topic, ()) + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscriptions = tuple(other for other in self._topics.get(subscription.topic, ())
+                                  if other is not subscription)
+            if subscriptions:
+                self._topics[subscription.topic] = subscriptions
+            else:
+                self._topics.pop(subscription.topic, None)
+        with subscription.lock:
+            subscription.ref = _no_subscriber
+            subscription.events.clear()
+            subscription.not_full.notify_all()
+
+    def _unsubscribe_collected(self):
+        collected = self._collected
+        while collected:
+            self.unsubscribe(collected.pop())
+
+    def subscribers(self, topic: Any) -> Tuple[Callable, ...]:
+        return tuple(callback for callback in (subscription.ref() for subscription in self._topics.get(topic, ()))
+                     if callback is not None)
+
+    def publish(self, topic: Any, event: Any) -> int:
+        # Delivers (sync) or queues the event for every subscriber of topic, returns their number.
+        if self._collected:
+            self._unsubscribe_collected()
+        subscriptions = self._topics.get(topic, ())
+        for subscription in subscriptions:
+            subscription.put(event)
+        return len(subscriptions)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        # Waits until the queues of the "thread" subscriptions are empty, False if timeout expired first.
+        deadline = None if timeout is None else monotonic() + timeout
+        for subscriptions in list(self._topics.values()):
+            for subscription in subscriptions:
+                while subscription.mode == "thread" and (subscription.scheduled or subscription.events):
+                    if deadline is not None and monotonic() > deadline:
+                        return False
+                    time.sleep(0.0005)
+        return True
+
+    def stats(self) -> Dict[Any, List[Dict[str, Any]]]:
+        return {topic: [subscription.stats() for subscription in subscriptions]
+                for topic, subscriptions in list(self._topics.items())}
+
+    def _dispatch(self, subscription: Subscription):
+        self._ready.put(subscription)
+        if self._executor is None or self._executor.closed:
+            from ._concurrency import thread_pool
+            self._executor = thread_pool(self.pool)
+        if self._runners < self._executor.max_workers:
+            with self._lock:
+                if self._runners >= self._executor.max_workers:
+                    return
+                self._runners += 1
+            self._executor.submit(self._run)
+
+    def _run(self):
+        # Runner draining the ready subscriptions, one at a time, until there are none left; a slow subscriber only
+        # holds its own runner up.
+        ready = self._ready
+        while True:
+            try:
+                ready.get_nowait()._drain()
+            except queue.Empty:
+                with self._lock:
+                    self._runners -= 1
+                # A subscription made ready meanwhile may have found all the runners still busy.
+                if ready.empty():
+                    return
+                with self._lock:
+                    if self._runners >= self._executor.max_workers:
+                        return
+                    self._runners += 1
+
+    def _error(self, exc: Exception, subscription: Subscription):
+        if self.on_error is not None:
+            self.on_error(exc, subscription)
+        else:
+            sys.excepthook(type(exc), exc, exc.__traceback__)
+
+
+@behavioural
+@gof_pattern
+def chain_of_responsibility(cls: Any) -> Any:
+    # Object-oriented version of an if ladder idiom (if  ... elif ... elif ... else ...)
+    # It works by constructing a chain of processing objects.
+    return cls
+
+
+@behavioural
+@gof_pattern
+def command(cls: Any) -> Any:
+    # Encapsulates a request as an object. It is especially useful for building user interfaces where it allows for the
+    # support of undoable operations.
+    return cls
+
+
+@behavioural
+@gof_pattern
+def interpreter(cls: Any) -> Any:
+    # Defines a representation of a language grammar and gives an interpreter for that grammar.
+    return cls
+
+
+@behavioural
+@gof_pattern
+def iterator(cls: Any) -> Any:
+    # Provides a way to access elements of an aggregate object (list, array, symbol table, tree, and so on)
+    # sequentially, without exposing the underlying implementation of that object.
+    return cls
+
+
+@behavioural
+@gof_pattern
+def mediator(cls: Any) -> Any:
+    # Defines an object that handles interaction between other objects. This pattern supports loose coupling by
+    # preventing objects from referring to one another explicitly.
+    return cls
+
+
+@behavioural
+@gof_pattern
+def memento(cls: Any) -> Any:
+    # Specifies how to store and restore an object's internal state without violating encapsulation.
+    return cls
+
+
+@behavioural
+@gof_pattern
+def observer(cls: Any = None, *, topic: Any = None, bus: Optional[EventBus] = None, mode: Optional[str] = None,
+             batch: Optional[int] = None, coalesce: Optional[Callable[[Any], Any]] = None,
+             maxsize: Optional[int] = None, policy: str = "block", weak: bool = True) -> Any:
+    # It provides another way to prevent tight coupling in a system, by setting up a system where a change of objects
+    # results in all of its dependents being notified about the change.
+    # @observer("topic") subscribes a function to topic on bus, by default the shared observer.bus, with the options
+    # of EventBus.subscribe; observer.publish(topic, event) publishes on the shared bus. A class given positionally is
+    # the class being decorated, which stays a documentation marker, so topics that are classes (event types) are
+    # given by keyword: @observer(topic=UserCreated).
+    if isinstance(cls, type):
+        return cls
+    if not callable(cls):
+        if cls is not None and topic is not None:
+            raise TypeError("observer() got the topic both positionally and by keyword")
+        topic = cls if cls is not None else topic
+        return lambda function: observer(function, topic=topic, bus=bus, mode=mode, batch=batch, coalesce=coalesce,
+                                         maxsize=maxsize, policy=policy, weak=weak)
+    if topic is not None:
+        (bus or observer.bus).subscribe(topic, cls, mode=mode, batch=batch, coalesce=coalesce, maxsize=maxsize,
+                                        policy=policy, weak=weak)
+    return cls
+
+
+observer.bus = EventBus()
+observer.publish = observer.bus.publish
+
+
+publish_subscribe = observer
+
+
+@behavioural
+@gof_pattern
+def state(cls: Any) -> Any:
+    # Allows an object to change its behavior when there is a change to its internal state.
+    return cls
+
+
+@behavioural
+@gof_pattern
+def strategy(cls: Any) -> Any:
+    # A family of algorithms that can be used interchangeably.
+    return cls
+
+
+@behavioural
+@gof_pattern
+def template(cls: Any) -> Any:
+    # Defines a skeleton of on operation and defers some steps to subclasses.
+    return cls
+
+
+@behavioural
+@gof_pattern
+def visitor(cls: Any) -> Any:
+    # Specifies an operation that is performed on all elements of an object's internal structure
+    return cls
+
+
+@behavioural
+def blackboard(cls: Any) -> Any:
+    # Artificial intelligence (AI) pattern for combining different data sources.
+    return cls
+
+
+@behavioural
+def null_object(cls: Any) -> Any:
+    # Removes the reason for using a nil, null, None pointer, by providing a special, default value for a class.
+    return cls
+
+
+@behavioural
+def servant(cls: Any) -> Any:
+    # Defines an object that implements a common functionality for a group of classes.
+    return cls
+
+
+@behavioural
+def specification(cls: Any) -> Any:
+    # Provides support for business logic that can be recombined by chaining the rules together with boolean operations.
+    return cls
+
+
+@behavioural
+def state_design(cls: Any) -> Any:
+    # An object can encapsulate multiple behaviors based on its internal state.
+    # Defined in Learning Python Design Patterns - Second Edition by Chetan Giridhar
+    return cls
+
+
+objects_for_states = state_design
+# endregion
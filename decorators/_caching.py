@@ -0,0 +1,499 @@
+import asyncio
+import contextlib
+import functools
+import hashlib
+import inspect
+import mmap
+import os
+import pickle
+import sqlite3
+import stat
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from time import monotonic, perf_counter_ns
+from typing import Any, Callable, Dict, Optional, Protocol, Tuple
+
+from ._common import _MISSING, _default_key, _qualified_name
+from ._documentation import url
+from ._patterns import micro_service
+from ._timing import _Histogram
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+# region Micro-services Patterns
+class CacheBackend(Protocol):
+    # Storage used by @cache_aside. get returns default when the key is missing or expired, ttl is in seconds (None
+    # never expires). clear(prefix) only drops the keys that are (prefix, ...) pairs, the keys of the @cache_aside
+    # function named prefix. Backends may also implement __len__, which is then reported by stats().
+    def get(self, key: Any, default: Any = None) -> Any:
+        ...
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None):
+        ...
+
+    def delete(self, key: Any):
+        ...
+
+    def clear(self, prefix: Optional[str] = None):
+        ...
+
+
+class MemoryBackend:
+    # In-process cache store, the default of @cache_aside: a dict in LRU order (OrderedDict) with an optional expiry
+    # time per entry, all operations are O(1). Reads take no lock.
+    def __init__(self, maxsize: Optional[int] = None):
+        self.maxsize = maxsize
+        self.evictions = 0
+        self._entries: "OrderedDict[Any, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        if entry[1] is not None and entry[1] <= monotonic():
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            return default
+        if self.maxsize is not None:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                pass
+        return entry[0]
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None):
+        entry = (value, None if ttl is None else monotonic() + ttl)
+        with self._lock:
+            self._entries[key] = entry
+            if self.maxsize is not None:
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+
+    def delete(self, key: Any):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self, prefix: Optional[str] = None):
+        with self._lock:
+            if prefix is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if _is_prefixed(key, prefix)]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _is_prefixed(key: Any, prefix: str) -> bool:
+    return type(key) is tuple and len(key) == 2 and key[0] == prefix
+
+
+def _digest(value: Any, size: int) -> bytes:
+    return hashlib.blake2b(pickle.dumps(value, pickle.HIGHEST_PROTOCOL), digest_size=size).digest()
+
+
+def _key_digest(key: Any) -> bytes:
+    # Process independent identity of a cache key (hash() is randomized per process). The first half of the digest of a
+    # (prefix, ...) pair is that of its prefix, which clear(prefix) looks for.
+    if type(key) is tuple and len(key) == 2 and isinstance(key[0], str):
+        return _digest(key[0], 8) + _digest(key[1], 8)
+    return _digest(key, 16)
+
+
+class SharedMemoryBackend:
+    # Cache store shared by all the processes of a host: a fixed size hash table in a memory mapped file, by default in
+    # /dev/shm so that it lives in memory. Keys and values are pickled, keys are identified by a 128 bit hash. A key
+    # maps to a set of `ways` slots and the oldest entry of the set is replaced when all of them are taken; values that
+    # do not fit in a slot are not cached (counted in oversize).
+    # Writers are serialized with a file lock. Readers take no lock: every slot has a sequence number that is odd while
+    # the slot is written (seqlock), and a read that sees it change is retried.
+    # Unpickling runs code chosen by whoever wrote the file, so it is only shared by the processes of the user owning
+    # it: the file is created readable and writable by that user only, symbolic links are not followed and an
+    # existing file owned by another user or open to other users is refused with PermissionError.
+    _HEADER = struct.Struct("<8sIIII")  # magic, slots, slot size, ways, generation
+    _SLOT = struct.Struct("<Q16sddII")  # sequence, key digest, stored at, expires at, generation, value length
+    _MAGIC = b"DECOSHM1"
+    _RETRIES = 3
+
+    def __init__(self, name: str, slots: int = 4096, slot_size: int = 1024, ways: int = 4):
+        if fcntl is None:
+            raise RuntimeError("SharedMemoryBackend needs fcntl file locks, which this platform does not have")
+        if slots % ways or slot_size <= self._SLOT.size:
+            raise ValueError(f"slots must be a multiple of ways and slot_size larger than {self._SLOT.size}")
+        if os.sep not in name:
+            name = os.path.join("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), name)
+        self.path = name
+        self.slots = slots
+        self.slot_size = slot_size
+        self.ways = ways
+        self.oversize = 0
+        self._sets = slots // ways
+        self._lock = threading.Lock()
+        self._fd = os.open(name, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+        try:
+            status = os.fstat(self._fd)
+            if not stat.S_ISREG(status.st_mode) or status.st_uid != os.getuid() or status.st_mode & 0o077:
+                raise PermissionError(f"{name} is not a regular file private to the current user, not opening it as a "
+                                      f"cache: mode {stat.filemode(status.st_mode)}, owner uid {status.st_uid}")
+        except BaseException:
+            os.close(self._fd)
+            raise
+        size = self._HEADER.size + slots * slot_size
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size == 0:
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, self._HEADER.pack(self._MAGIC, slots, slot_size, ways, 1), 0)
+            magic, *layout, _ = self._HEADER.unpack(os.pread(self._fd, self._HEADER.size, 0))
+            if magic != self._MAGIC or layout != [slots, slot_size, ways]:
+                raise ValueError(f"{name} holds a cache with a different layout: slots, slot_size, ways = {layout}")
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._map = mmap.mmap(self._fd, size)
+
+    def _generation(self) -> int:
+        return self._HEADER.unpack_from(self._map, 0)[4]
+
+    def _offsets(self, digest: bytes) -> range:
+        # From the second half of the digest, as the keys of a function share the first.
+        first = int.from_bytes(digest[8:], "little") % self._sets * self.ways
+        start = self._HEADER.size + first * self.slot_size
+        return range(start, start + self.ways * self.slot_size, self.slot_size)
+
+    def _read(self, offset: int, digest: bytes, generation: int) -> Optional[Tuple[float, bytes]]:
+        # Returns (expires at, pickled value) if the slot holds the key, None otherwise.
+        for _ in range(self._RETRIES):
+            sequence, slot_digest, _, expires, slot_generation, length = self._SLOT.unpack_from(self._map, offset)
+            if sequence & 1:
+                continue
+            if slot_digest != digest or slot_generation != generation:
+                return None
+            start = offset + self._SLOT.size
+            data = self._map[start:start + length]
+            if self._SLOT.unpack_from(self._map, offset)[0] == sequence:
+                return expires, data
+        return None
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        digest = _key_digest(key)
+        generation = self._generation()
+        for offset in self._offsets(digest):
+            entry = self._read(offset, digest, generation)
+            if entry is not None:
+                if entry[0] and entry[0] <= time.time():
+                    return default
+                return pickle.loads(entry[1])
+        return default
+
+    def _write(self, offset: int, digest: bytes, expires: float, generation: int, data: bytes):
+        # Needs the locks.
+        sequence = self._SLOT.unpack_from(self._map, offset)[0] | 1
+        self._map[offset:offset + 8] = sequence.to_bytes(8, "little")
+        start = offset + self._SLOT.size
+        self._map[start:start + len(data)] = data
+        self._SLOT.pack_into(self._map, offset, sequence, digest, time.time(), expires, generation, len(data))
+        self._map[offset:offset + 8] = (sequence + 1).to_bytes(8, "little")
+
+    @contextlib.contextmanager
+    def _locked(self):
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None):
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.slot_size - self._SLOT.size:
+            self.oversize += 1
+            return
+        digest = _key_digest(key)
+        now = time.time()
+        expires = now + ttl if ttl is not None else 0.0
+        with self._locked():
+            generation = self._generation()
+            victim, oldest = None, None
+            for offset in self._offsets(digest):
+                _, slot_digest, stored, slot_expires, slot_generation, _ = self._SLOT.unpack_from(self._map, offset)
+                if slot_generation == generation and slot_digest == digest:
+                    victim = offset
+                    break
+                if slot_generation != generation or (slot_expires and slot_expires <= now):
+                    stored = -1.0
+                if oldest is None or stored < oldest:
+                    victim, oldest = offset, stored
+            self._write(victim, digest, expires, generation, data)
+
+    def delete(self, key: Any):
+        digest = _key_digest(key)
+        with self._locked():
+            for offset in self._offsets(digest):
+                if self._SLOT.unpack_from(self._map, offset)[1] == digest:
+                    self._write(offset, bytes(16), 0.0, 0, b"")
+
+    def clear(self, prefix: Optional[str] = None):
+        # Invalidates every slot at once by moving to a new generation, or with a prefix empties the slots of its keys.
+        with self._locked():
+            magic, slots, slot_size, ways, generation = self._HEADER.unpack_from(self._map, 0)
+            if prefix is None:
+                self._HEADER.pack_into(self._map, 0, magic, slots, slot_size, ways, generation + 1)
+                return
+            prefix_digest = _digest(prefix, 8)
+            for offset in range(self._HEADER.size, len(self._map), self.slot_size):
+                _, slot_digest, _, _, slot_generation, _ = self._SLOT.unpack_from(self._map, offset)
+                if slot_generation == generation and slot_digest[:8] == prefix_digest:
+                    self._write(offset, bytes(16), 0.0, 0, b"")
+
+    def __len__(self) -> int:
+        generation = self._generation()
+        now = time.time()
+        count = 0
+        for offset in range(self._HEADER.size, len(self._map), self.slot_size):
+            _, _, _, expires, slot_generation, _ = self._SLOT.unpack_from(self._map, offset)
+            if slot_generation == generation and not (expires and expires <= now):
+                count += 1
+        return count
+
+    def close(self):
+        self._map.close()
+        os.close(self._fd)
+
+
+class DiskBackend:
+    # Persistent cache store in a SQLite database file, which keeps the cache warm across restarts and can be shared by
+    # the processes of a host. Keys are stored by their 128 bit hash and values pickled. With maxsize the oldest
+    # entries are trimmed as new ones are added.
+    _TRIM_EVERY = 64
+
+    def __init__(self, path: str, maxsize: Optional[int] = None):
+        self.path = path
+        self.maxsize = maxsize
+        self._local = threading.local()
+        self._writes = 0
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS cache (key BLOB PRIMARY KEY, value BLOB, expires REAL, stored REAL)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections cannot be shared by threads, every thread gets its own.
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, isolation_level=None, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        row = self._connection().execute("SELECT value, expires FROM cache WHERE key = ?",
+                                         (_key_digest(key),)).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return default
+        return pickle.loads(row[0])
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None):
+        now = time.time()
+        connection = self._connection()
+        connection.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+                           (_key_digest(key), pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+                            None if ttl is None else now + ttl, now))
+        self._writes += 1
+        if self.maxsize is not None and not self._writes % self._TRIM_EVERY:
+            connection.execute("DELETE FROM cache WHERE expires <= ?", (now,))
+            connection.execute("DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY stored DESC "
+                               "LIMIT -1 OFFSET ?)", (self.maxsize,))
+
+    def delete(self, key: Any):
+        self._connection().execute("DELETE FROM cache WHERE key = ?", (_key_digest(key),))
+
+    def clear(self, prefix: Optional[str] = None):
+        if prefix is None:
+            self._connection().execute("DELETE FROM cache")
+        else:
+            self._connection().execute("DELETE FROM cache WHERE substr(key, 1, 8) = ?", (_digest(prefix, 8),))
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM cache WHERE expires IS NULL OR expires > ?",
+                                          (time.time(),)).fetchone()[0]
+
+
+class _Flight:
+    # A load in progress, shared by the callers that missed the same key meanwhile.
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class _CacheMetrics:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        # Misses served by the load of another caller.
+        self.coalesced = 0
+        self.errors = 0
+        self.load_times = _Histogram()
+
+
+@micro_service
+@url("https://docs.microsoft.com/en-us/previous-versions/msp-n-p/dn589799(v=pandp.10)")
+def cache_aside(func: Any = None, *, ttl: Optional[float] = None, maxsize: Optional[int] = None,
+                key: Optional[Callable] = None, backend: Optional[CacheBackend] = None) -> Any:
+    # In situations where data is more frequently read than updated, applications use a cache to optimize repeated
+    # access to information stored in a database or data store. In some systems, that type of caching mechanism is
+    # built-in and works automatically. When this is not the case, we have to implement it in the application ourselves,
+    # using a caching strategy that is suitable for the particular use case.
+    # Caches the results of a function (or coroutine function, or method) per key(*args, **kwargs), by default the
+    # arguments themselves, for ttl seconds and up to maxsize entries (LRU). Concurrent misses on the same key run the
+    # function once and share the result (single-flight). The wrapper has invalidate(*args, **kwargs) dropping the
+    # entry of the given arguments, clear() and stats(). On a class it stays a documentation marker.
+    # The entries are kept in a private MemoryBackend(maxsize) unless another backend is given, such as a
+    # SharedMemoryBackend shared by the worker processes of a host or a persistent DiskBackend. A given backend can be
+    # shared by several functions, their keys are prefixed with the function name (clear() only drops those of the
+    # function) and must be picklable when the backend pickles them.
+    if func is None:
+        return lambda function: cache_aside(function, ttl=ttl, maxsize=maxsize, key=key, backend=backend)
+    if isinstance(func, type):
+        return func
+    if backend is not None and maxsize is not None:
+        raise ValueError("maxsize only applies to the default backend, size the given backend instead")
+    store = backend if backend is not None else MemoryBackend(maxsize)
+    namespace = _qualified_name(func) if backend is not None else None
+    metrics = _CacheMetrics()
+    flights: Dict[Any, Any] = {}
+    lock = threading.Lock()
+    store_get = store.get
+
+    def cache_key(args: tuple, kwargs: dict) -> Any:
+        if key is not None:
+            item_key = key(*args, **kwargs)
+        else:
+            item_key = _default_key(*args, **kwargs) if kwargs else args
+        return item_key if namespace is None else (namespace, item_key)
+
+    def loaded(start: int):
+        metrics.load_times.record(perf_counter_ns() - start)
+
+    if inspect.iscoroutinefunction(func):
+        async def load(item_key: Any, args: tuple, kwargs: dict):
+            # Runs in a task of its own, so that a caller cancelled while waiting does not cancel the load of the
+            # others.
+            try:
+                # Another load of this key may have completed between the miss and taking the lock.
+                value = store_get(item_key, _MISSING)
+                if value is not _MISSING:
+                    metrics.hits += 1
+                    return value
+                metrics.misses += 1
+                start = perf_counter_ns()
+                value = await func(*args, **kwargs)
+                loaded(start)
+                store.set(item_key, value, ttl)
+                return value
+            except BaseException:
+                metrics.errors += 1
+                raise
+            finally:
+                with lock:
+                    if flights.get(item_key) is asyncio.current_task():
+                        del flights[item_key]
+
+        def retrieved(flight):
+            # So that a failed load whose callers were all cancelled does not log "exception never retrieved".
+            if not flight.cancelled():
+                flight.exception()
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            item_key = cache_key(args, kwargs)
+            value = store_get(item_key, _MISSING)
+            if value is not _MISSING:
+                metrics.hits += 1
+                return value
+            loop = asyncio.get_running_loop()
+            with lock:
+                flight = flights.get(item_key)
+                if flight is None or flight.get_loop() is not loop:
+                    flight = flights[item_key] = loop.create_task(load(item_key, args, kwargs))
+                    flight.add_done_callback(retrieved)
+                else:
+                    metrics.coalesced += 1
+            return await asyncio.shield(flight)
+    else:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            item_key = cache_key(args, kwargs)
+            value = store_get(item_key, _MISSING)
+            if value is not _MISSING:
+                metrics.hits += 1
+                return value
+            with lock:
+                flight = flights.get(item_key)
+                leader = flight is None
+                if leader:
+                    flight = flights[item_key] = _Flight()
+            if not leader:
+                metrics.coalesced += 1
+                flight.event.wait()
+                if flight.error is not None:
+                    raise flight.error
+                return flight.value
+            try:
+                # Another load of this key may have completed between the miss and taking the lock.
+                value = store_get(item_key, _MISSING)
+                if value is not _MISSING:
+                    metrics.hits += 1
+                else:
+                    metrics.misses += 1
+                    start = perf_counter_ns()
+                    value = func(*args, **kwargs)
+                    loaded(start)
+                    store.set(item_key, value, ttl)
+                flight.value = value
+                return value
+            except BaseException as exc:
+                metrics.errors += 1
+                flight.error = exc
+                raise
+            finally:
+                with lock:
+                    del flights[item_key]
+                flight.event.set()
+
+    def invalidate(*args, **kwargs):
+        store.delete(cache_key(args, kwargs))
+
+    def stats() -> Dict[str, Any]:
+        lookups = metrics.hits + metrics.misses + metrics.coalesced
+        return {
+            "size": len(store) if hasattr(store, "__len__") else None,
+            "hits": metrics.hits,
+            "misses": metrics.misses,
+            "coalesced": metrics.coalesced,
+            "errors": metrics.errors,
+            "evictions": getattr(store, "evictions", 0),
+            "hit_ratio": metrics.hits / lookups if lookups else 0.0,
+            "load": metrics.load_times.summary(),
+        }
+
+    wrapper.invalidate = invalidate
+    # A given backend may hold the entries of other functions, only those of this one are dropped.
+    wrapper.clear = store.clear if namespace is None else functools.partial(store.clear, namespace)
+    wrapper.stats = stats
+    return wrapper
+
+# endregion
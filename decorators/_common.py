@@ -0,0 +1,100 @@
+import operator
+from typing import Any, Callable, ClassVar, Dict, Tuple, get_origin
+
+
+_MISSING = object()
+_KWARGS_MARK = object()
+
+
+def _default_key(*args, **kwargs) -> Any:
+    if kwargs:
+        return args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+    return args
+
+
+def _qualified_name(obj: Any) -> str:
+    name = getattr(obj, "__qualname__", None) or getattr(obj, "__name__", None) or repr(obj)
+    return f"{getattr(obj, '__module__', None)}.{name}"
+
+
+# Metaclass of the classes returned by _with_call, one per metaclass of the decorated classes, so that classes
+# deriving from several of them (class C(A, B) over two singletons) have no metaclass conflict. Its __call__ is a
+# property returning the __with_call__ class method of the class, which adds no Python frame to cls(...).
+_call_metaclasses: Dict[type, type] = {}
+_dispatch_call = property(operator.attrgetter("__with_call__"))
+
+
+def _base_call(cls: type) -> Callable:
+    # How cls(...) is handled before a _with_call decorator replaces it: by the call of a decorator applied earlier,
+    # or by its metaclass.
+    inherited = getattr(cls, "__with_call__", None)
+    return inherited.__func__ if inherited is not None else type(cls).__call__
+
+
+def _with_call(cls: type, call: Callable) -> type:
+    # Returns a subclass of cls whose instantiation, cls(...), is handled by call(klass, *args, **kwargs) instead of
+    # type.__call__. The subclass keeps the name, module and docstring of cls and adds no instance layout, so
+    # isinstance, subclassing and zero-argument super() in the methods of cls keep working. call constructs real
+    # instances with _base_call(cls)(klass, *args, **kwargs). call is stored in the class, so its subclasses use it
+    # too, with their own class as klass.
+    meta = type(cls)
+    if meta not in _call_metaclasses.values():
+        meta = _call_metaclasses.get(meta) or _call_metaclasses.setdefault(
+            meta, type(meta.__name__, (meta,), {"__call__": _dispatch_call, "__module__": __name__}))
+    namespace = {"__module__": cls.__module__, "__qualname__": cls.__qualname__, "__doc__": cls.__doc__,
+                 "__slots__": (), "__with_call__": classmethod(call)}
+    if "__doc_urls__" in cls.__dict__:
+        namespace["__doc_urls__"] = cls.__dict__["__doc_urls__"]
+    return meta(cls.__name__, (cls,), namespace)
+
+
+def _fields(cls: type) -> Tuple[str, ...]:
+    # Instance fields declared by the annotations of cls itself, in declaration order, without ClassVar ones.
+    fields = []
+    for name, annotation in cls.__dict__.get("__annotations__", {}).items():
+        if isinstance(annotation, str):
+            if annotation.startswith(("ClassVar", "typing.ClassVar")):
+                continue
+        elif annotation is ClassVar or get_origin(annotation) is ClassVar:
+            continue
+        fields.append(name)
+    return tuple(fields)
+
+
+def _with_slots(cls: type, fields: Tuple[str, ...], weakrefs: bool = True) -> type:
+    # Rebuilds cls with __slots__ for the given fields (plus __weakref__ if weakrefs), so its instances have no
+    # __dict__. Class attributes named like a field (annotation defaults) are dropped as they would conflict with the
+    # slots. Methods using zero-argument super() are pointed to the new class.
+    inherited = set()
+    for base in cls.__mro__[1:]:
+        slots = base.__dict__.get("__slots__", ())
+        inherited.update((slots,) if isinstance(slots, str) else slots)
+    namespace = {name: value for name, value in cls.__dict__.items()
+                 if name not in fields and name not in ("__dict__", "__weakref__")}
+    slots = tuple(name for name in fields if name not in inherited)
+    if weakrefs and not any(base.__weakrefoffset__ for base in cls.__bases__):
+        slots += ("__weakref__",)
+    namespace["__slots__"] = slots
+    namespace["__qualname__"] = cls.__qualname__
+    rebuilt = type(cls)(cls.__name__, cls.__bases__, namespace)
+    for value in namespace.values():
+        if isinstance(value, (classmethod, staticmethod)):
+            functions = (value.__func__,)
+        elif isinstance(value, property):
+            functions = (value.fget, value.fset, value.fdel)
+        else:
+            functions = (value,)
+        for function in functions:
+            code = getattr(function, "__code__", None)
+            if code is None or "__class__" not in code.co_freevars:
+                continue
+            cell = function.__closure__[code.co_freevars.index("__class__")]
+            if cell.cell_contents is cls:
+                cell.cell_contents = rebuilt
+    return rebuilt
+
+
+def _close(item: Any):
+    close = getattr(item, "close", None)
+    if close is not None:
+        close()
@@ -0,0 +1,1413 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import contextvars
+import functools
+import inspect
+import operator
+import os
+import pickle
+import queue
+import sys
+import threading
+import weakref
+from time import monotonic, perf_counter_ns
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ._common import _MISSING, _base_call, _close, _qualified_name, _with_call
+from ._patterns import concurrency
+from ._timing import _Histogram
+
+
+# region Concurrency Patterns
+class PoolFullError(RuntimeError):
+    # Raised when a task is submitted to a BoundedExecutor whose queue is full (policy "raise", or "block" past its
+    # timeout).
+    pass
+
+
+def _measured_call(func: Callable, args: tuple, kwargs: dict) -> tuple:
+    # Runs a task in a worker, returning (succeeded, result or exception, started, finished). perf_counter_ns is a
+    # system-wide clock, so the times also compare with the submit time when the worker is another process.
+    started = perf_counter_ns()
+    try:
+        result = func(*args, **kwargs)
+    except Exception as exc:
+        return False, exc, started, perf_counter_ns()
+    return True, result, started, perf_counter_ns()
+
+
+class _WrappedReference:
+    # Picklable stand-in for the function under a decorator (module.qualname.__wrapped__), which pickle cannot find by
+    # name, so that decorated functions can run in a process pool.
+    __slots__ = ("module", "qualname")
+
+    def __init__(self, module: str, qualname: str):
+        self.module = module
+        self.qualname = qualname
+
+    def __reduce__(self):
+        return _WrappedReference, (self.module, self.qualname)
+
+    def __call__(self, *args, **kwargs):
+        target = sys.modules.get(self.module) or __import__(self.module, fromlist=["_"])
+        for part in self.qualname.split("."):
+            target = getattr(target, part)
+        return inspect.unwrap(target)(*args, **kwargs)
+
+
+class BoundedExecutor(concurrent.futures.Executor):
+    # Thread (kind="thread") or process (kind="process") pool accepting at most max_workers + max_queue pending tasks.
+    # When full, submit applies the policy: "block" waits for room (up to timeout seconds, then raises PoolFullError),
+    # "raise" raises PoolFullError right away and "caller_runs" runs the task in the calling thread, which slows the
+    # producer down to the speed of the pool. The workers are started on the first submit. stats() gives the task
+    # counters, the queue depth and histograms of the time tasks waited in the queue and of their run time.
+    POLICIES = ("block", "raise", "caller_runs")
+
+    def __init__(self, name: str = "default", max_workers: Optional[int] = None, max_queue: Optional[int] = 1024,
+                 policy: str = "block", kind: str = "thread", timeout: Optional[float] = None):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"unknown kind {kind!r}, use thread or process")
+        if policy not in self.POLICIES:
+            raise ValueError(f"unknown policy {policy!r}, use one of {', '.join(self.POLICIES)}")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers or (min(32, (os.cpu_count() or 1) + 4) if kind == "thread"
+                                           else os.cpu_count() or 1)
+        self.max_queue = max_queue
+        self.policy = policy
+        self.timeout = timeout
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.caller_runs = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._slots = None if max_queue is None else threading.Semaphore(self.max_workers + max_queue)
+        self._executor: Optional[concurrent.futures.Executor] = None
+        # Set by shutdown; the @future functions and event buses holding a pool of thread_pool() look it up again.
+        self.closed = False
+        self._lock = threading.Lock()
+        self._queue_wait = _Histogram()
+        self._run_time = _Histogram()
+
+    def _start(self) -> concurrent.futures.Executor:
+        with self._lock:
+            if self.closed:
+                raise RuntimeError(f"pool {self.name} is shut down")
+            if self._executor is None:
+                if self.kind == "thread":
+                    self._executor = concurrent.futures.ThreadPoolExecutor(self.max_workers, f"pool-{self.name}")
+                else:
+                    self._executor = concurrent.futures.ProcessPoolExecutor(self.max_workers)
+            return self._executor
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> concurrent.futures.Future:
+        executor = self._executor or self._start()
+        slots = self._slots
+        if slots is not None and not slots.acquire(False):
+            if self.policy == "caller_runs":
+                return self._run_here(fn, args, kwargs)
+            if self.policy == "raise" or not slots.acquire(True, self.timeout):
+                with self._lock:
+                    self.rejected += 1
+                raise PoolFullError(f"pool {self.name} has {self.in_flight} tasks pending")
+        with self._lock:
+            self.submitted += 1
+            self.in_flight += 1
+            if self.in_flight > self.peak_in_flight:
+                self.peak_in_flight = self.in_flight
+        result = concurrent.futures.Future()
+        submitted = perf_counter_ns()
+        try:
+            task = executor.submit(_measured_call, fn, args, kwargs)
+        except BaseException:
+            self._finished(True)
+            raise
+        task.add_done_callback(lambda done: self._settle(done, result, submitted))
+        result.add_done_callback(lambda done: done.cancelled() and task.cancel())
+        return result
+
+    def _run_here(self, fn: Callable, args: tuple, kwargs: dict) -> concurrent.futures.Future:
+        result = concurrent.futures.Future()
+        result.set_running_or_notify_cancel()
+        succeeded, value, started, finished = _measured_call(fn, args, kwargs)
+        with self._lock:
+            self.caller_runs += 1
+            self._run_time.record(finished - started)
+        if succeeded:
+            result.set_result(value)
+        else:
+            result.set_exception(value)
+        return result
+
+    def _finished(self, failed: bool, queue_wait: Optional[int] = None, run_time: Optional[int] = None):
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+            self.failed += failed
+            if queue_wait is not None:
+                self._queue_wait.record(max(queue_wait, 0))
+                self._run_time.record(run_time)
+        if self._slots is not None:
+            self._slots.release()
+
+    def _settle(self, task: concurrent.futures.Future, result: concurrent.futures.Future, submitted: int):
+        if task.cancelled():
+            self._finished(False)
+            result.cancel()
+            return
+        exception = task.exception()
+        if exception is not None:
+            # The task could not be run or its outcome could not be sent back (e.g. pickling errors, a dead worker).
+            self._finished(True)
+            succeeded, value = False, exception
+        else:
+            succeeded, value, started, finished = task.result()
+            self._finished(not succeeded, started - submitted, finished - started)
+        if not result.set_running_or_notify_cancel():
+            return
+        if succeeded:
+            result.set_result(value)
+        else:
+            result.set_exception(value)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        with self._lock:
+            self.closed = True
+            executor = self._executor
+        if executor is not None:
+            executor.shutdown(wait, cancel_futures=cancel_futures)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "caller_runs": self.caller_runs,
+                "in_flight": self.in_flight,
+                "queued": max(self.in_flight - self.max_workers, 0),
+                "peak_in_flight": self.peak_in_flight,
+                "queue_wait": self._queue_wait.summary(),
+                "run_time": self._run_time.summary(),
+            }
+
+
+_pools: Dict[str, BoundedExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _kernel_chunk(func: Callable, vectorized: bool, chunk: Any) -> list:
+    # Runs a kernel on a chunk of the index space (a range or a list) in a worker process.
+    return list(func(chunk)) if vectorized else [func(item) for item in chunk]
+
+
+def _attach(name: str) -> Any:
+    # Attaches to a shared memory block owned (and unlinked) by the parent process.
+    from multiprocessing import shared_memory
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    return shared_memory.SharedMemory(name)
+
+
+def _kernel_shared_chunk(func: Callable, vectorized: bool, source: tuple, target: tuple, start: int, stop: int):
+    # Runs a kernel on items[start:stop] of a NumPy array, reading the input from and writing the output to shared
+    # memory, so that only the block names and the bounds are sent to the worker. source and target are (block name,
+    # shape, dtype).
+    import numpy
+    blocks = [_attach(source[0]), _attach(target[0])]
+    try:
+        items = numpy.ndarray(source[1], source[2], blocks[0].buf)
+        results = numpy.ndarray(target[1], target[2], blocks[1].buf)
+        if vectorized:
+            results[start:stop] = func(items[start:stop])
+        else:
+            for index in range(start, stop):
+                results[index] = func(items[index])
+        # The views must be gone before the blocks are closed.
+        del items, results
+    finally:
+        for block in blocks:
+            block.close()
+
+
+def _kernel_map_shared(func: Callable, vectorized: bool, items: Any, bounds: List[Tuple[int, int]],
+                       executor: BoundedExecutor, dtype: Any) -> Any:
+    import numpy
+    from multiprocessing import shared_memory
+    items = numpy.ascontiguousarray(items)
+    if dtype is None:
+        sample = numpy.asarray(func(items[:1]))[0] if vectorized else numpy.asarray(func(items[0]))
+        shape, dtype = (len(items),) + sample.shape, sample.dtype
+    else:
+        shape = (len(items),)
+    dtype = numpy.dtype(dtype)
+    size = int(numpy.prod(shape)) * dtype.itemsize
+    source = shared_memory.SharedMemory(create=True, size=max(items.nbytes, 1))
+    target = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    try:
+        shared_items = numpy.ndarray(items.shape, items.dtype, source.buf)
+        shared_items[...] = items
+        futures = [executor.submit(_kernel_shared_chunk, func, vectorized, (source.name, items.shape, items.dtype.str),
+                                   (target.name, shape, dtype.str), start, stop) for start, stop in bounds]
+        for future in futures:
+            future.result()
+        # One copy out, so that the result outlives the shared block.
+        results = numpy.ndarray(shape, dtype, target.buf).copy()
+        del shared_items
+    finally:
+        for block in (source, target):
+            block.close()
+            block.unlink()
+    return results
+
+
+_POLL = 0.05
+
+
+def _get(inbox: Any, stop: Any) -> Optional[list]:
+    # Next packet (list of items) of a stage queue, None at the end of the stream or once the pipeline is stopped.
+    while True:
+        try:
+            return inbox.get(timeout=_POLL)
+        except queue.Empty:
+            if stop.is_set():
+                return None
+
+
+def _put(outbox: Any, packet: Optional[list], stop: Any) -> bool:
+    # Puts a packet, waiting while the queue is full (backpressure), False once the pipeline is stopped.
+    while True:
+        try:
+            outbox.put(packet, timeout=_POLL)
+            return True
+        except queue.Full:
+            if stop.is_set():
+                return False
+
+
+def _fail(errors: Any, stop: Any, name: str, exc: Exception):
+    # Reports the first error of a stage and stops the pipeline. Errors that cannot be sent from a worker process are
+    # replaced with a RuntimeError.
+    try:
+        pickle.dumps(exc)
+    except Exception:
+        exc = RuntimeError(f"{type(exc).__qualname__}: {exc}")
+    errors.put((name, exc))
+    stop.set()
+
+
+def _stage_worker(func: Callable, name: str, inbox: Any, outbox: Any, stop: Any, errors: Any, counters: Any,
+                  slot: int, batch: Optional[int], packet: int):
+    # Worker thread or process of a stage: feeds the packets of inbox to func (item by item, or as lists of up to
+    # batch items) and sends what it yields to outbox, in packets of packet items.
+    def items():
+        while True:
+            received = _get(inbox, stop)
+            if received is None:
+                return
+            counters[slot] += len(received)
+            if batch:
+                yield received
+            else:
+                yield from received
+
+    buffer = []
+    try:
+        for item in func(items()):
+            buffer.append(item)
+            if len(buffer) >= packet:
+                counters[slot + 1] += len(buffer)
+                if not _put(outbox, buffer, stop):
+                    return
+                buffer = []
+        if buffer:
+            counters[slot + 1] += len(buffer)
+            _put(outbox, buffer, stop)
+    except Exception as exc:
+        _fail(errors, stop, name, exc)
+
+
+def _process_stage_worker(*args):
+    _stage_worker(*args)
+    if args[4].is_set():
+        # Do not wait at exit for packets nobody will read.
+        args[3].cancel_join_thread()
+
+
+def _async_stage_worker(func: Callable, name: str, inbox: Any, outbox: Any, stop: Any, errors: Any, counters: Any,
+                        workers: int, batch: Optional[int], packet: int, maxsize: int):
+    # Thread of an asyncio stage: runs workers tasks feeding func (an async generator function) in an event loop of
+    # its own. A feeder thread moves the packets of inbox to the loop, at most maxsize of them at a time.
+    async def run():
+        loop = asyncio.get_running_loop()
+        inner: asyncio.Queue = asyncio.Queue()
+        room = threading.Semaphore(maxsize)
+
+        def feed():
+            try:
+                while True:
+                    received = _get(inbox, stop)
+                    if received is None:
+                        return
+                    while not room.acquire(timeout=_POLL):
+                        if stop.is_set():
+                            return
+                    loop.call_soon_threadsafe(inner.put_nowait, received)
+            finally:
+                for _ in range(workers):
+                    loop.call_soon_threadsafe(inner.put_nowait, None)
+
+        async def items(slot: int):
+            while True:
+                received = await inner.get()
+                if received is None:
+                    return
+                room.release()
+                counters[slot] += len(received)
+                if batch:
+                    yield received
+                else:
+                    for item in received:
+                        yield item
+
+        async def send(buffer: list) -> bool:
+            try:
+                outbox.put_nowait(buffer)
+                return True
+            except queue.Full:
+                return await loop.run_in_executor(None, _put, outbox, buffer, stop)
+
+        async def work(slot: int):
+            buffer = []
+            try:
+                async for item in func(items(slot)):
+                    buffer.append(item)
+                    if len(buffer) >= packet:
+                        counters[slot + 1] += len(buffer)
+                        if not await send(buffer):
+                            return
+                        buffer = []
+                if buffer:
+                    counters[slot + 1] += len(buffer)
+                    await send(buffer)
+            except Exception as exc:
+                _fail(errors, stop, name, exc)
+
+        feeder = threading.Thread(target=feed, name=f"{name}-feeder", daemon=True)
+        feeder.start()
+        await asyncio.gather(*(work(2 * worker) for worker in range(workers)))
+        await loop.run_in_executor(None, feeder.join)
+
+    asyncio.run(run())
+
+
+def _end_stage(group: list, outbox: Any, readers: int, stop: Any):
+    # Once all the workers of a stage are done, tells the readers of the next queue that the stream has ended.
+    for worker in group:
+        worker.join()
+    for _ in range(readers):
+        if not _put(outbox, None, stop):
+            return
+
+
+class Stage:
+    # Stage of a pipeline, see pipeline. Calling it calls the function.
+    def __init__(self, func: Callable, workers: int = 1, kind: Optional[str] = None, batch: Optional[int] = None,
+                 maxsize: int = 64):
+        asynchronous = inspect.isasyncgenfunction(func)
+        kind = kind or ("asyncio" if asynchronous else "thread")
+        if kind not in ("thread", "process", "asyncio"):
+            raise ValueError(f"unknown kind {kind!r}, use thread, process or asyncio")
+        if asynchronous != (kind == "asyncio"):
+            raise TypeError(f"{_qualified_name(func)}: asyncio stages take async generator functions, thread and "
+                            f"process stages generator functions")
+        functools.update_wrapper(self, func)
+        self.workers = workers
+        self.kind = kind
+        self.batch = batch
+        self.maxsize = maxsize
+
+    def __call__(self, *args, **kwargs):
+        return self.__wrapped__(*args, **kwargs)
+
+    def __or__(self, other: Any) -> "Pipeline":
+        return Pipeline(_MISSING, [self]) | other
+
+    def __ror__(self, source: Any) -> "Pipeline":
+        return Pipeline(source, [self])
+
+    def __repr__(self) -> str:
+        return f"<Stage {_qualified_name(self.__wrapped__)} {self.kind} x{self.workers}>"
+
+
+class Pipeline:
+    # Source iterable followed by stages, built with source | stage | stage. Iterating it starts the workers of all
+    # the stages and yields the items of the last stage; leaving the loop early stops them. stats() gives the counters
+    # of the last run.
+    def __init__(self, source: Any, stages: List[Stage]):
+        self.source = source
+        self.stages = stages
+        self._run: Optional[dict] = None
+
+    def __or__(self, other: Any) -> "Pipeline":
+        if isinstance(other, Stage):
+            return Pipeline(self.source, self.stages + [other])
+        if isinstance(other, Pipeline) and other.source is _MISSING:
+            return Pipeline(self.source, self.stages + other.stages)
+        return NotImplemented
+
+    def __ror__(self, source: Any) -> "Pipeline":
+        if self.source is not _MISSING:
+            return NotImplemented
+        return Pipeline(source, self.stages)
+
+    def _start(self) -> dict:
+        if self.source is _MISSING:
+            raise TypeError("the pipeline has no source, use iterable | pipeline")
+        if any(stage.kind == "process" for stage in self.stages):
+            import multiprocessing
+            context = multiprocessing.get_context()
+            make_queue, make_event = context.Queue, context.Event
+        else:
+            context = None
+            make_queue, make_event = queue.Queue, threading.Event
+        stop = make_event()
+        errors = make_queue()
+        # The queue in front of each stage, and the one the caller reads from.
+        queues = [make_queue(stage.maxsize) for stage in self.stages] + [make_queue(64)]
+        run = {"stop": stop, "errors": errors, "queues": queues, "workers": [], "counters": [],
+               "started": monotonic(), "finished": None}
+        packets = [stage.batch or 1 for stage in self.stages] + [1]
+        readers = [stage.workers if stage.kind != "asyncio" else 1 for stage in self.stages] + [1]
+
+        def feed():
+            try:
+                buffer = []
+                for item in self.source:
+                    buffer.append(item)
+                    if len(buffer) >= packets[0]:
+                        if not _put(queues[0], buffer, stop):
+                            return
+                        buffer = []
+                if buffer:
+                    _put(queues[0], buffer, stop)
+            except Exception as exc:
+                _fail(errors, stop, "source", exc)
+            finally:
+                for _ in range(readers[0]):
+                    _put(queues[0], None, stop)
+
+        workers = [threading.Thread(target=feed, name="pipeline-source", daemon=True)]
+        for index, stage in enumerate(self.stages):
+            name = _qualified_name(stage.__wrapped__)
+            # A batched stage also sends its output in batches.
+            inbox, outbox, packet = queues[index], queues[index + 1], max(packets[index + 1], stage.batch or 1)
+            slots = 2 * stage.workers
+            if stage.kind == "process":
+                counters = context.Array("q", slots, lock=False)
+                func = _WrappedReference(stage.__module__, stage.__qualname__)
+                group = [context.Process(target=_process_stage_worker, name=f"{name}-{worker}", daemon=True,
+                                         args=(func, name, inbox, outbox, stop, errors, counters, 2 * worker,
+                                               stage.batch, packet))
+                         for worker in range(stage.workers)]
+            elif stage.kind == "thread":
+                counters = [0] * slots
+                group = [threading.Thread(target=_stage_worker, name=f"{name}-{worker}", daemon=True,
+                                          args=(stage.__wrapped__, name, inbox, outbox, stop, errors, counters,
+                                                2 * worker, stage.batch, packet))
+                         for worker in range(stage.workers)]
+            else:
+                counters = [0] * slots
+                group = [threading.Thread(target=_async_stage_worker, name=name, daemon=True,
+                                          args=(stage.__wrapped__, name, inbox, outbox, stop, errors, counters,
+                                                stage.workers, stage.batch, packet, stage.maxsize))]
+            run["counters"].append(counters)
+            workers.extend(group)
+            workers.append(threading.Thread(target=_end_stage, args=(group, outbox, readers[index + 1], stop),
+                                            name=f"{name}-end", daemon=True))
+        run["workers"] = workers
+        self._run = run
+        for worker in workers:
+            worker.start()
+        return run
+
+    def _stop(self, run: dict):
+        run["stop"].set()
+        for worker in run["workers"]:
+            worker.join(5.0)
+            if worker.is_alive() and hasattr(worker, "terminate"):
+                worker.terminate()
+        if run["finished"] is None:
+            run["finished"] = monotonic()
+
+    def __iter__(self):
+        run = self._start()
+        stop, results = run["stop"], run["queues"][-1]
+        try:
+            while True:
+                packet = _get(results, stop)
+                if packet is None:
+                    break
+                yield from packet
+            run["finished"] = monotonic()
+            if stop.is_set():
+                try:
+                    name, exc = run["errors"].get(timeout=1.0)
+                except queue.Empty:
+                    return
+                raise exc
+        finally:
+            self._stop(run)
+
+    def run(self) -> int:
+        # Runs the pipeline to the end, discarding the items of the last stage, and returns their number.
+        count = 0
+        for _ in self:
+            count += 1
+        return count
+
+    def stats(self) -> List[Dict[str, Any]]:
+        run = self._run
+        if run is None:
+            return []
+        elapsed = (run["finished"] or monotonic()) - run["started"]
+        stats = []
+        for stage, counters, inbox in zip(self.stages, run["counters"], run["queues"]):
+            items_out = sum(counters[1::2])
+            try:
+                depth = inbox.qsize()
+            except NotImplementedError:
+                depth = None
+            stats.append({
+                "stage": _qualified_name(stage.__wrapped__),
+                "kind": stage.kind,
+                "workers": stage.workers,
+                "items_in": sum(counters[0::2]),
+                "items_out": items_out,
+                "items_per_sec": items_out / elapsed if elapsed > 0 else 0.0,
+                "queue_depth": depth,
+                "queue_maxsize": stage.maxsize,
+            })
+        return stats
+
+
+class _LockView:
+    # Read or write side of a ReadWriteLock, usable like a threading.Lock.
+    __slots__ = ("acquire", "release")
+
+    def __init__(self, acquire: Callable, release: Callable):
+        self.acquire = acquire
+        self.release = release
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+class ReadWriteLock:
+    # Lock held by any number of readers at once, or by a single writer. The writer may take the lock again, for
+    # reading or writing, and a reader may take the read lock again; upgrading a read lock to a write lock would
+    # deadlock and raises RuntimeError. By default readers get in whenever no writer holds the lock, so a steady flow
+    # of readers can starve writers; with writer_preference=True new readers wait while a writer is waiting.
+    # "with lock.read_lock:" / "with lock.write_lock:", or acquire_read() / release_read() and so on.
+    def __init__(self, writer_preference: bool = False):
+        self.writer_preference = writer_preference
+        self._lock = threading.Lock()
+        self._read_ok = threading.Condition(self._lock)
+        self._write_ok = threading.Condition(self._lock)
+        self._readers = 0
+        self._writer: Optional[int] = None
+        self._depth = 0
+        self._writers_waiting = 0
+        self._local = threading.local()
+        self.read_lock = _LockView(self.acquire_read, self.release_read)
+        self.write_lock = _LockView(self.acquire_write, self.release_write)
+
+    def acquire_read(self):
+        local = self._local
+        held = getattr(local, "reads", 0)
+        if held:
+            local.reads = held + 1
+            return
+        me = threading.get_ident()
+        if self._writer == me:
+            self._depth += 1
+            return
+        with self._lock:
+            while self._writer is not None or (self.writer_preference and self._writers_waiting):
+                self._read_ok.wait()
+            self._readers += 1
+        local.reads = 1
+
+    def release_read(self):
+        if self._writer == threading.get_ident():
+            # Read lock taken while holding the write lock.
+            self.release_write()
+            return
+        local = self._local
+        local.reads -= 1
+        if local.reads:
+            return
+        with self._lock:
+            self._readers -= 1
+            if not self._readers:
+                self._write_ok.notify()
+
+    def acquire_write(self):
+        me = threading.get_ident()
+        if self._writer == me:
+            self._depth += 1
+            return
+        if getattr(self._local, "reads", 0):
+            raise RuntimeError("cannot upgrade a read lock to a write lock")
+        with self._lock:
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._write_ok.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._depth = 1
+
+    def release_write(self):
+        with self._lock:
+            self._depth -= 1
+            if self._depth:
+                return
+            self._writer = None
+            if self._writers_waiting:
+                self._write_ok.notify()
+            if not (self.writer_preference and self._writers_waiting):
+                self._read_ok.notify_all()
+
+
+def _instance_lock(instance: Any, attribute: str, factory: Callable[[], Any]) -> Any:
+    # Lock stored in an instance's __dict__, created on first use; setdefault keeps the first one if two threads race.
+    state = instance.__dict__
+    lock = state.get(attribute)
+    if lock is None:
+        lock = state.setdefault(attribute, factory())
+    return lock
+
+
+def _locked_method(func: Callable, acquire: Callable, release: Callable) -> Callable:
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        lock = acquire(self, args, kwargs)
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            release(lock)
+    return wrapper
+
+
+def _read_write_lock_of(instance: Any) -> ReadWriteLock:
+    return _instance_lock(instance, "_read_write_lock",
+                          lambda: ReadWriteLock(getattr(type(instance), "__writer_preference__", False)))
+
+
+def _acquire_read(instance: Any, args: tuple, kwargs: dict) -> ReadWriteLock:
+    lock = instance.__dict__.get("_read_write_lock") or _read_write_lock_of(instance)
+    lock.acquire_read()
+    return lock
+
+
+def _acquire_write(instance: Any, args: tuple, kwargs: dict) -> ReadWriteLock:
+    lock = instance.__dict__.get("_read_write_lock") or _read_write_lock_of(instance)
+    lock.acquire_write()
+    return lock
+
+
+def reader(func: Callable) -> Callable:
+    # Marks a method of a @read_write_lock class as reading: it runs under the instance's read lock.
+    return _locked_method(func, _acquire_read, ReadWriteLock.release_read)
+
+
+def writer(func: Callable) -> Callable:
+    # Marks a method of a @read_write_lock class as writing: it runs under the instance's write lock.
+    return _locked_method(func, _acquire_write, ReadWriteLock.release_write)
+
+
+class StripedLock:
+    # Array of stripes locks (rounded up to a power of two) with a lock per hash(key) & (stripes - 1): threads working
+    # on different keys mostly take different locks. lock.all() takes every stripe, in order, for operations on the
+    # whole structure (resizing, clearing, iterating).
+    def __init__(self, stripes: int = 16, factory: Callable[[], Any] = threading.Lock):
+        size = 1 << max(stripes - 1, 0).bit_length()
+        self.locks = [factory() for _ in range(size)]
+        self._mask = size - 1
+
+    def __call__(self, key: Any) -> Any:
+        return self.locks[hash(key) & self._mask]
+
+    @contextlib.contextmanager
+    def all(self):
+        with contextlib.ExitStack() as stack:
+            for lock in self.locks:
+                stack.enter_context(lock)
+            yield self
+
+
+def _striped_lock_of(instance: Any) -> StripedLock:
+    # Reentrant stripes, as a @striped method may call another one whose key falls in the same stripe.
+    return _instance_lock(instance, "_striped_lock",
+                          lambda: StripedLock(getattr(type(instance), "__lock_stripes__", 16), threading.RLock))
+
+
+def _release_all(locks: List[Any]):
+    for lock in reversed(locks):
+        lock.release()
+
+
+def striped(func: Callable = None, *, key: Optional[Callable] = None, exclusive: bool = False) -> Callable:
+    # Marks a method of a @lock_striping class: it runs under the stripe of key(*args, **kwargs), by default its first
+    # parameter after self (given by position or by name), or with exclusive=True under all the stripes. The stripes
+    # are reentrant, so @striped methods may call each other in a thread; but a method holding a stripe and calling
+    # one for another key takes two stripes in an order that depends on the keys, which deadlocks with a thread doing
+    # the reverse: call other keys after releasing, or make the outer method exclusive.
+    if func is None:
+        return lambda function: striped(function, key=key, exclusive=exclusive)
+    if exclusive:
+        def acquire(instance: Any, args: tuple, kwargs: dict) -> List[Any]:
+            locks = _striped_lock_of(instance).locks
+            for lock in locks:
+                lock.acquire()
+            return locks
+
+        return _locked_method(func, acquire, _release_all)
+
+    parameters = list(inspect.signature(func).parameters.values())[1:2]
+    name = parameters[0].name if parameters and parameters[0].kind in (
+        inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY) else None
+
+    def acquire(instance: Any, args: tuple, kwargs: dict) -> Any:
+        stripes = instance.__dict__.get("_striped_lock") or _striped_lock_of(instance)
+        if key is not None:
+            stripe_key = key(*args, **kwargs)
+        elif args:
+            stripe_key = args[0]
+        elif name in kwargs:
+            stripe_key = kwargs[name]
+        else:
+            raise TypeError(f"{func.__qualname__} is @striped by its first argument, which was not given")
+        lock = stripes.locks[hash(stripe_key) & stripes._mask]
+        lock.acquire()
+        return lock
+
+    return _locked_method(func, acquire, operator.methodcaller("release"))
+
+
+class _ThreadInstances(dict):
+    # Instances of @thread_specific_storage classes for one thread, by class. Held by a threading.local, so it is
+    # dropped when the thread ends, disposing of them.
+    __slots__ = ("dispose",)
+
+    def __del__(self):
+        if self.dispose is None:
+            return
+        for instance in self.values():
+            try:
+                self.dispose(instance)
+            except Exception:
+                pass
+
+
+# Marks the end of the calls of an @active_object mailbox, for its scheduler to exit.
+_STOP = object()
+
+
+class _ActiveScheduler:
+    # Mailbox of an @active_object instance and the thread or asyncio task serving it. ident is the id of the thread,
+    # or the task, so that the calls made by the methods themselves are run directly instead of queued behind their
+    # own caller.
+    __slots__ = ("mailbox", "put", "ident", "runner", "loop")
+
+
+def _batch(mailbox: Any, empty: type, message: tuple, limit: int) -> Tuple[list, Any]:
+    # Takes the calls of the method of message queued right behind it, up to limit calls in all. Returns them and the
+    # next message, which belongs to another method (None if the mailbox is empty). Only adjacent calls are merged, so
+    # the calls still run in the order they were made.
+    messages = [message]
+    while len(messages) < limit:
+        try:
+            following = mailbox.get_nowait()
+        except empty:
+            return messages, None
+        if following is _STOP or following[0] is not message[0]:
+            return messages, following
+        messages.append(following)
+    return messages, None
+
+
+def _settle_batch(futures: list, ok: bool, value: Any):
+    # Completes the futures of merged calls with the result (a list with one item per call, or None) or the exception
+    # of their single run. Futures cancelled meanwhile (asyncio ones) are left alone.
+    if ok:
+        if value is None:
+            value = [None] * len(futures)
+        elif len(value) != len(futures):
+            ok, value = False, ValueError(f"batched method returned {len(value)} results for {len(futures)} calls")
+    for index, future in enumerate(futures):
+        if future.done():
+            continue
+        if ok:
+            future.set_result(value[index])
+        else:
+            future.set_exception(value)
+
+
+def _serve(mailbox: Any):
+    # Scheduler thread of an @active_object instance: runs the queued calls one at a time. The messages are (method,
+    # batch limit or None, instance, args, kwargs, future); they hold the instance, so it lives until its last call ran.
+    pending = None
+    while True:
+        message = mailbox.get() if pending is None else pending
+        pending = None
+        if message is _STOP:
+            return
+        func, limit, instance, args, kwargs, future = message
+        if limit is None:
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = func(instance, *args, **kwargs)
+                except Exception as exc:
+                    future.set_exception(exc)
+                else:
+                    future.set_result(result)
+        else:
+            messages, pending = _batch(mailbox, queue.Empty, message, limit)
+            messages = [message for message in messages if message[5].set_running_or_notify_cancel()]
+            if messages:
+                futures = [message[5] for message in messages]
+                try:
+                    result = func(instance, [message[3][0] for message in messages])
+                except Exception as exc:
+                    _settle_batch(futures, False, exc)
+                else:
+                    _settle_batch(futures, True, result)
+        # Do not keep the instance alive while waiting for the next call.
+        message = instance = args = kwargs = future = result = messages = futures = None
+
+
+async def _serve_async(mailbox: Any):
+    # Scheduler task of an @active_object(kind="asyncio") instance, same as _serve; coroutine methods are awaited.
+    pending = None
+    while True:
+        message = await mailbox.get() if pending is None else pending
+        pending = None
+        if message is _STOP:
+            return
+        func, limit, instance, args, kwargs, future = message
+        messages = [message]
+        if limit is not None:
+            messages, pending = _batch(mailbox, asyncio.QueueEmpty, message, limit)
+        messages = [message for message in messages if not message[5].cancelled()]
+        if messages:
+            if limit is not None:
+                args, kwargs = ([message[3][0] for message in messages],), {}
+            futures = [message[5] for message in messages]
+            try:
+                result = func(instance, *args, **kwargs)
+                if inspect.isawaitable(result):
+                    result = await result
+            except Exception as exc:
+                _settle_batch(futures, False, exc)
+            else:
+                _settle_batch(futures, True, [result] if limit is None else result)
+        message = instance = args = kwargs = future = result = messages = futures = None
+
+
+def _post_stop(loop: Any, mailbox: Any):
+    try:
+        loop.call_soon_threadsafe(mailbox.put_nowait, _STOP)
+    except RuntimeError:
+        # The loop is closed, and the task with it.
+        pass
+
+
+_active_lock = threading.Lock()
+
+
+def _active_scheduler(instance: Any) -> _ActiveScheduler:
+    # Scheduler of an @active_object instance, started on its first call. It ends once the instance is collected.
+    with _active_lock:
+        scheduler = instance.__dict__.get("_active_object")
+        if scheduler is not None:
+            return scheduler
+        kind, maxsize = type(instance).__active_object__
+        scheduler = _ActiveScheduler()
+        if kind == "thread":
+            scheduler.mailbox = queue.SimpleQueue() if maxsize is None else queue.Queue(maxsize)
+            scheduler.put = scheduler.mailbox.put
+            scheduler.loop = None
+            scheduler.runner = threading.Thread(target=_serve, args=(scheduler.mailbox,), daemon=True,
+                                                name=f"{type(instance).__qualname__} scheduler")
+            scheduler.runner.start()
+            scheduler.ident = scheduler.runner.ident
+            weakref.finalize(instance, scheduler.put, _STOP)
+        else:
+            scheduler.mailbox = asyncio.Queue()
+            scheduler.put = scheduler.mailbox.put_nowait
+            scheduler.loop = asyncio.get_running_loop()
+            scheduler.runner = scheduler.ident = scheduler.loop.create_task(_serve_async(scheduler.mailbox))
+            weakref.finalize(instance, _post_stop, scheduler.loop, scheduler.mailbox)
+        instance.__dict__["_active_object"] = scheduler
+        return scheduler
+
+
+def _stop_active_object(instance: Any, wait: bool = True) -> Any:
+    # Ends the scheduler of an @active_object instance once the calls already queued ran; a later call starts a new
+    # one. With wait, a scheduler thread is joined; for kind="asyncio" the task is returned, to be awaited.
+    with _active_lock:
+        scheduler = instance.__dict__.pop("_active_object", None)
+    if scheduler is None:
+        return None
+    if scheduler.loop is not None:
+        _post_stop(scheduler.loop, scheduler.mailbox)
+        return scheduler.runner
+    scheduler.put(_STOP)
+    if wait and scheduler.ident != threading.get_ident():
+        scheduler.runner.join()
+    return None
+
+
+def _single_result(results: Any) -> Any:
+    # Result of a @batched method run for a single call.
+    if results is None:
+        return None
+    if len(results) != 1:
+        raise ValueError(f"batched method returned {len(results)} results for 1 call")
+    return results[0]
+
+
+async def _single_result_async(results: Any) -> Any:
+    return _single_result(await results)
+
+
+def _active_method(func: Callable, on_complete: Optional[Callable[[Any], None]]) -> Callable:
+    # Method of an @active_object class queuing its calls in the mailbox of the instance.
+    limit = getattr(func, "__active_batch__", None)
+    is_coroutine = inspect.iscoroutinefunction(func)
+    get_ident = threading.get_ident
+    current_task = asyncio.current_task
+    new_future = concurrent.futures.Future
+
+    @functools.wraps(func)
+    def wrapper(self, *args, on_complete: Optional[Callable[[Any], None]] = on_complete, **kwargs):
+        if limit is not None and (len(args) != 1 or kwargs):
+            raise TypeError(f"{func.__qualname__} is batched, its calls take a single argument")
+        scheduler = self.__dict__.get("_active_object") or _active_scheduler(self)
+        loop = scheduler.loop
+        if (get_ident() if loop is None else current_task(loop)) == scheduler.ident:
+            if limit is None:
+                return func(self, *args, **kwargs)
+            # A batched method called by the object itself runs as a batch of this one call.
+            if is_coroutine:
+                return _single_result_async(func(self, [args[0]]))
+            return _single_result(func(self, [args[0]]))
+        future = new_future() if loop is None else loop.create_future()
+        if on_complete is not None:
+            future.add_done_callback(on_complete)
+        scheduler.put((func, limit, self, args, kwargs, future))
+        return future
+
+    wrapper.__active_method__ = func
+    return wrapper
+
+
+def _activate(cls: type, kind: str, maxsize: Optional[int], on_complete: Optional[Callable[[Any], None]]) -> type:
+    if kind not in ("thread", "asyncio"):
+        raise ValueError(f"kind must be 'thread' or 'asyncio', not {kind!r}")
+    if maxsize is not None and kind != "thread":
+        raise ValueError("only the mailboxes of kind='thread' can be bounded")
+    # The public methods of the class and of its bases, the ones of subclasses overriding those of their bases.
+    methods = {}
+    for klass in reversed(cls.__mro__[:-1]):
+        for name, value in vars(klass).items():
+            if not name.startswith("_") and inspect.isfunction(value):
+                methods[name] = getattr(value, "__active_method__", value)
+    for name, func in methods.items():
+        if kind == "thread" and (inspect.iscoroutinefunction(func) or inspect.isasyncgenfunction(func)):
+            raise TypeError(f"{_qualified_name(func)} is asynchronous, use @active_object(kind='asyncio')")
+        setattr(cls, name, _active_method(func, on_complete))
+    cls.__active_object__ = (kind, maxsize)
+    return cls
+
+
+def batched(func: Callable = None, *, max_batch: Optional[int] = None) -> Callable:
+    # Marks a method of an @active_object class whose queued calls are merged: the scheduler runs it once for the calls
+    # of it queued right behind each other (at most max_batch), with the list of their arguments, one per call. It
+    # returns a list with the result of each call, or None.
+    if func is None:
+        return lambda function: batched(function, max_batch=max_batch)
+    func.__active_batch__ = max_batch or sys.maxsize
+    return func
+
+
+@concurrency
+def active_object(cls: Any = None, *, kind: str = "thread", maxsize: Optional[int] = None,
+                  on_complete: Optional[Callable[[Any], None]] = None) -> Any:
+    # Hides the concurrency by implementing asynchronous method inside an object, which serves as a scheduler for
+    # handling requests.
+    # Every instance gets a mailbox and a scheduler, a thread (kind="thread") or a task of the running event loop
+    # (kind="asyncio", coroutine methods are then awaited), started on its first call. Calling a public method queues
+    # the call and returns a future of its result (concurrent.futures or asyncio), and the scheduler runs the calls one
+    # at a time, in order, so the state of the object needs no locks. on_complete(future), given to the decorator or
+    # to a call (obj.save(item, on_complete=callback)), runs once the call is done. The calls of a @batched method
+    # queued right behind each other are merged into a single run. Calls made by the methods themselves run directly,
+    # those of a @batched method as a batch of one call. With maxsize callers wait while the mailbox is full.
+    # active_object.stop(obj) ends the scheduler of an instance after the calls already queued. Subclasses need the
+    # decorator too. On a function it stays a documentation marker.
+    if cls is None:
+        return lambda klass: active_object(klass, kind=kind, maxsize=maxsize, on_complete=on_complete)
+    if not isinstance(cls, type):
+        return cls
+    return _activate(cls, kind, maxsize, on_complete)
+
+
+active_object.stop = _stop_active_object
+
+
+@concurrency
+def binding_properties(cls: Any) -> Any:
+    # Combines multiple observers to force synchronization on properties in different objects.
+    return cls
+
+
+@concurrency
+def blockchain(cls: Any) -> Any:
+    # A decentralized way for storing data in a linked list protected with cryptographic means.
+    return cls
+
+
+@concurrency
+def compute_kernel(cls: Any = None, *, workers: Optional[int] = None, chunksize: Optional[int] = None,
+                   vectorized: bool = False) -> Any:
+    # Executes the same calculation many times in parallel, differing only on integer input parameters. It is frequently
+    # related to GPU calculation.
+    # Adds a map(items, chunksize=None, workers=None, dtype=None) method to a function of one item (an index, or an
+    # element of items): items (a range, a sequence or a NumPy array) are split in chunks run on a shared process pool
+    # of workers processes (default the number of CPUs), and the results come back in order, as a list, or as a NumPy
+    # array for NumPy input. NumPy arrays are placed in shared memory, the workers read their chunk and write their
+    # results there, so no item or result is pickled; dtype gives the result type, by default that of the result of
+    # the first item. With vectorized=True the function is called with a whole chunk (a range, a list or an array
+    # slice) and returns its results. The function itself is returned unchanged, it must be defined at module level
+    # (to be sent to the worker processes). On a class it stays a documentation marker.
+    if cls is None:
+        return lambda function: compute_kernel(function, workers=workers, chunksize=chunksize, vectorized=vectorized)
+    if isinstance(cls, type):
+        return cls
+    func = cls
+    default_workers, default_chunksize = workers, chunksize
+
+    def map(items: Any, chunksize: Optional[int] = default_chunksize, workers: Optional[int] = default_workers,
+            dtype: Any = None) -> Any:
+        workers = workers or os.cpu_count() or 1
+        # Object arrays hold pointers, which cannot be shared between processes.
+        shared = type(items).__module__ == "numpy" and getattr(items, "ndim", 0) > 0 and not items.dtype.hasobject
+        if not shared and not isinstance(items, (range, list, tuple)) and type(items).__module__ != "numpy":
+            items = list(items)
+        count = len(items)
+        # A few chunks per worker evens out chunks of uneven cost.
+        chunksize = max(chunksize or -(-count // (workers * 4)), 1)
+        bounds = [(start, min(start + chunksize, count)) for start in range(0, count, chunksize)]
+        if workers == 1 or len(bounds) <= 1:
+            results = _kernel_chunk(func, vectorized, items)
+            if shared:
+                import numpy
+                return numpy.asarray(results, dtype)
+            return results
+        executor = thread_pool(f"compute_kernel-{workers}", max_workers=workers, max_queue=None, kind="process")
+        if shared:
+            return _kernel_map_shared(func, vectorized, items, bounds, executor, dtype)
+        futures = [executor.submit(_kernel_chunk, func, vectorized, items[start:stop]) for start, stop in bounds]
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    func.map = map
+    return func
+
+
+@concurrency
+def double_checked_locking(cls: Any) -> Any:
+    # Reduces the overhead of acquiring a lock in a safe manner.
+    return cls
+
+
+@concurrency
+def event_based_asynchronous(cls: Any = None, *, on_complete: Optional[Callable[[Any], None]] = None,
+                             kind: str = "thread", maxsize: Optional[int] = None) -> Any:
+    # Defines a way of executing parallel operations where a caller is notified when a worker finishes the execution.
+    # The class becomes an @active_object whose callers are notified through on_complete(future), given here for every
+    # call or to a single call, instead of waiting on the futures. On a function it stays a documentation marker.
+    if cls is None:
+        return lambda klass: event_based_asynchronous(klass, on_complete=on_complete, kind=kind, maxsize=maxsize)
+    if not isinstance(cls, type):
+        return cls
+    return _activate(cls, kind, maxsize, on_complete)
+
+
+event_based_asynchronous.stop = _stop_active_object
+
+
+@concurrency
+def future(cls: Any = None, *, pool: Any = "default", kind: Optional[str] = None) -> Any:
+    # Pushes a calculation into a background and replaces it with a promise that a result will be available in the
+    # future.
+    # Calling a @future function submits it to a shared BoundedExecutor, the thread_pool(pool, kind=kind) one (or the
+    # one given) resolved on the first call, and returns a concurrent.futures.Future; called from a running event loop
+    # it returns an awaitable asyncio future instead (mind that the "block" policy blocks the loop while the pool is
+    # full). Functions sent to a process pool must be defined at module level.
+    # The wrapper has a pool attribute (None until the first call; a named pool is resolved again after
+    # thread_pool.shutdown()). On a class it stays a documentation marker.
+    if cls is None:
+        return lambda function: future(function, pool=pool, kind=kind)
+    if isinstance(cls, type):
+        return cls
+    func = cls
+    if inspect.iscoroutinefunction(func) or inspect.isasyncgenfunction(func):
+        raise TypeError(f"{_qualified_name(func)} is already asynchronous, await it or run it as a task")
+    target = None
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        nonlocal target
+        if wrapper.pool is None or wrapper.pool.closed and not isinstance(pool, BoundedExecutor):
+            executor = pool if isinstance(pool, BoundedExecutor) else thread_pool(pool, kind=kind)
+            target = func if executor.kind == "thread" else _WrappedReference(func.__module__, wrapper.__qualname__)
+            wrapper.pool = executor
+        result = wrapper.pool.submit(target, *args, **kwargs)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return result
+        return asyncio.wrap_future(result)
+
+    wrapper.pool = None
+    return wrapper
+
+
+@concurrency
+def guarded_suspension(cls: Any) -> Any:
+    # Manages operations that depend on a two-part condition: a precondition that must be satisfied and a lock that must
+    # be acquired.
+    return cls
+
+
+@concurrency
+def join(cls: Any) -> Any:
+    # Provides a way to write distributed and parallel systems, by message passing.
+    return cls
+
+
+@concurrency
+def lock(cls: Any) -> Any:
+    # Protects shared resources by implementing a locking mechanism.
+    return cls
+
+
+@concurrency
+def lock_striping(cls: Any = None, stripes: int = 16) -> Any:
+    # Optimizes locking, by replacing a single global lock with a set of specialized locks.
+    # @lock_striping(n) gives every instance of the class a StripedLock of n stripes, created on first use, under
+    # which its @striped methods run: e.g. a shared cache whose get(key) and set(key, value) only lock the stripe of
+    # key, with an @striped(exclusive=True) clear(). lock_striping.lock_of(obj) returns the StripedLock of an
+    # instance. On a function it stays a documentation marker.
+    if not isinstance(cls, type):
+        if callable(cls):
+            return cls
+        if cls is not None:
+            stripes = cls
+        return lambda klass: lock_striping(klass, stripes)
+    cls.__lock_stripes__ = stripes
+    return cls
+
+
+lock_striping.lock_of = _striped_lock_of
+
+
+@concurrency
+def messaging_design(cls: Any) -> Any:
+    # Based on the interchange of information between components in the system.
+    return cls
+
+
+mdp = messaging_design
+
+
+@concurrency
+def monitor(cls: Any) -> Any:
+    # Combines locking with a mechanism for signalling other threads that their condition was met.
+    return cls
+
+
+@concurrency
+def optimistic_initialization(cls: Any) -> Any:
+    # Reduces the cost of locking by replacing it with the small probability of extraneous objects being created and
+    # thrown away.
+    return cls
+
+
+@concurrency
+def pipeline(cls: Any = None, *, workers: int = 1, kind: Optional[str] = None, batch: Optional[int] = None,
+             maxsize: int = 64) -> Any:
+    # Specifies a way of decoupling thread dependencies by passing small subsets of data from one worker thread to
+    # another through a message-passing pipeline.
+    # Turns a generator function taking an iterable of items into a Stage, which composes with iterables and other
+    # stages: "for row in lines | parse | enrich: ..." (or (lines | parse | enrich).run()). Each stage runs on workers
+    # threads (kind="thread", the default), processes (kind="process", the function must be defined at module level)
+    # or asyncio tasks (the default for async generator functions, which take an async iterable). Stages are linked
+    # by queues of maxsize packets, so a slow stage blocks the ones before it and memory stays bounded whatever the
+    # input size. With batch=n the function receives lists of up to n items. The first error raised in a stage stops
+    # the pipeline and is raised to the caller. Items keep their order only through single worker stages.
+    # Pipeline.stats() gives the items in and out, the throughput and the queue depth of every stage. On a class it
+    # stays a documentation marker.
+    if cls is None:
+        return lambda function: pipeline(function, workers=workers, kind=kind, batch=batch, maxsize=maxsize)
+    if isinstance(cls, type):
+        return cls
+    return Stage(cls, workers, kind, batch, maxsize)
+
+
+@concurrency
+def reactor(cls: Any) -> Any:
+    # Reactor object that provides an asynchronous interface to resources that must be handled synchronously.
+    return cls
+
+
+@concurrency
+def read_write_lock(cls: Any = None, *, writer_preference: bool = False) -> Any:
+    # Allows multiple objects to simultaneously read a shared resource, but forces exclusive access for write
+    # operations.
+    # Methods of the class marked @reader run concurrently with each other, methods marked @writer run alone, under a
+    # ReadWriteLock per instance created on first use. With writer_preference=True readers arriving while a writer
+    # waits are held back, so writers are not starved by a steady flow of readers. read_write_lock.lock_of(obj)
+    # returns the lock of an instance. On a function it stays a documentation marker.
+    if cls is None:
+        return lambda klass: read_write_lock(klass, writer_preference=writer_preference)
+    if isinstance(cls, type):
+        cls.__writer_preference__ = writer_preference
+    return cls
+
+
+read_write_lock.lock_of = _read_write_lock_of
+
+
+@concurrency
+def scheduler(cls: Any) -> Any:
+    # Controls when threads may execute single-threaded code.
+    return cls
+
+
+@concurrency
+def thread_pool(cls: Any = "default", *, max_workers: Optional[int] = None, max_queue: Any = _MISSING,
+                policy: Optional[str] = None, kind: Optional[str] = None, timeout: Optional[float] = None) -> Any:
+    # A parallel version of an object pool creational pattern that provides a pool of worker threads that execute
+    # numerous tasks.
+    # thread_pool(name) returns the BoundedExecutor shared under name, created with the given options on first use
+    # (kind "thread" unless given), so that all the code doing I/O fan-out uses a few well-sized pools instead of one
+    # executor each. Options given for an existing pool must match its settings. thread_pool.shutdown() stops all the
+    # pools. On a class it stays a documentation marker; on a function it works as @future on the default pool.
+    if isinstance(cls, type):
+        return cls
+    if callable(cls):
+        if any(value is not None for value in (max_workers, policy, timeout)) or max_queue is not _MISSING:
+            raise TypeError("@thread_pool on a function takes no pool options, configure thread_pool(name) instead")
+        return future(cls, kind=kind)
+    name = cls
+    options = {"max_workers": max_workers, "policy": policy, "kind": kind, "timeout": timeout}
+    options = {option: value for option, value in options.items() if value is not None}
+    if max_queue is not _MISSING:
+        options["max_queue"] = max_queue
+    with _pools_lock:
+        executor = _pools.get(name)
+        if executor is None:
+            return _pools.setdefault(name, BoundedExecutor(name, **options))
+    for option, value in options.items():
+        if getattr(executor, option) != value:
+            raise ValueError(f"pool {name} has {option}={getattr(executor, option)!r}, not {value!r}")
+    return executor
+
+
+def _shutdown_pools(wait: bool = True):
+    with _pools_lock:
+        executors = list(_pools.values())
+        _pools.clear()
+    for executor in executors:
+        executor.shutdown(wait)
+
+
+thread_pool.shutdown = _shutdown_pools
+
+
+@concurrency
+def thread_specific_storage(cls: Any = None, *, per_task: bool = True,
+                            dispose: Optional[Callable[[Any], None]] = _close) -> Any:
+    # Allows us to use global memory that is local to a thread.
+    # In Delphi for example, we implement this by declaring a variable with the threadvar directive.
+    # Calling the class returns the instance of the current thread, or with per_task of the current asyncio task,
+    # constructed on first use with the arguments of that call (later arguments are ignored). Objects which are
+    # expensive to build but not thread-safe, such as parsers, compressors or database cursors, can then be reused
+    # without locks. Once the thread or the task ends its instance is disposed of, by default with its close method.
+    # Subclasses get instances of their own.
+    if cls is None:
+        return lambda klass: thread_specific_storage(klass, per_task=per_task, dispose=dispose)
+    base_call = _base_call(cls)
+    local = threading.local()
+    # The contexts of the tasks inherit the value of their parent, so each entry records the task owning it.
+    tasks: contextvars.ContextVar = contextvars.ContextVar(f"{cls.__qualname__} instances")
+    get_running_loop = asyncio._get_running_loop
+    current_task = asyncio.current_task
+
+    def for_thread(klass, *args, **kwargs):
+        try:
+            return local.instances[klass]
+        except AttributeError:
+            local.instances = _ThreadInstances()
+            local.instances.dispose = dispose
+        except KeyError:
+            pass
+        instance = local.instances[klass] = base_call(klass, *args, **kwargs)
+        return instance
+
+    def __call__(klass, *args, **kwargs):
+        loop = get_running_loop()
+        if loop is None:
+            try:
+                return local.instances[klass]
+            except (AttributeError, KeyError):
+                return for_thread(klass, *args, **kwargs)
+        task = current_task(loop)
+        if task is None:
+            return for_thread(klass, *args, **kwargs)
+        instances = tasks.get(None)
+        if instances is not None:
+            entry = instances.get(klass)
+            if entry is not None and entry[0] is task:
+                return entry[1]
+            instances = {key: entry for key, entry in instances.items() if entry[0] is task}
+        else:
+            instances = {}
+        instance = base_call(klass, *args, **kwargs)
+        instances[klass] = (task, instance)
+        tasks.set(instances)
+        if dispose is not None:
+            task.add_done_callback(lambda _: dispose(instance))
+        return instance
+
+    return _with_call(cls, __call__ if per_task else for_thread)
+# endregion
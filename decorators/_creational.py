@@ -0,0 +1,738 @@
+import functools
+import inspect
+import threading
+import weakref
+from collections import OrderedDict, deque
+from time import monotonic, perf_counter_ns
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ._common import _KWARGS_MARK, _MISSING, _base_call, _close, _default_key, _with_call
+from ._patterns import creational, gof_pattern
+from ._timing import _Histogram
+
+
+# region Creational Patterns
+@creational
+@gof_pattern
+def factory(cls: Any) -> Any:
+    # Defines an interface for creating a single object. Subclasses can then decide which class to instantiate.
+    return cls
+
+
+@creational
+@gof_pattern
+def abstract_factory(cls: Any) -> Any:
+    # Create entire families of related objects but without the need to specify their classes.
+    return cls
+
+
+@creational
+@gof_pattern
+def builder(cls: Any) -> Any:
+    # Abstracts the construction of a complex object, and allows the same process to create different representations.
+    return cls
+
+
+@creational
+@gof_pattern
+def prototype(cls: Any) -> Any:
+    # Specifies how to create objects based on a template object that is cloned to produce new objects.
+    return cls
+
+
+@creational
+@gof_pattern
+def singleton(cls: Any) -> Any:
+    # Ensures that a class has only one instance. It also provides a common point of access to that instance.
+    # The first call constructs the instance under a lock (double-checked locking), later calls return it with a single
+    # dict lookup and no locking; arguments of later calls are ignored. Subclasses of a singleton class get an instance
+    # of their own. Use singleton.reset() in tests to drop the instances.
+    base_call = _base_call(cls)
+
+    def __call__(klass, *args, **kwargs):
+        try:
+            return _singletons[klass]
+        except KeyError:
+            pass
+        with _singletons_lock:
+            if klass not in _singletons:
+                _singletons[klass] = base_call(klass, *args, **kwargs)
+            return _singletons[klass]
+
+    return _with_call(cls, __call__)
+
+
+_singletons: Dict[type, Any] = {}
+# Reentrant, as constructing a singleton may construct another one.
+_singletons_lock = threading.RLock()
+
+
+def _singleton_reset(cls: Optional[type] = None):
+    # Forgets the instance of a singleton class (and of its subclasses), or of all of them, so the next call constructs
+    # a new one.
+    with _singletons_lock:
+        for klass in list(_singletons):
+            if cls is None or issubclass(klass, cls):
+                del _singletons[klass]
+
+
+singleton.reset = _singleton_reset
+
+
+class _KeyedInstances:
+    # Instance registry of a @multiton class. Lookups are a dict access (plus an O(1) move_to_end for LRU). Instances
+    # are constructed under a per-key lock, so different keys are constructed in parallel and a key is never
+    # constructed twice. Hit/miss counters are updated without a lock and may be slightly off under contention.
+    def __init__(self, maxsize: Optional[int], weak: bool):
+        self.maxsize = maxsize
+        self.weak = weak
+        self.instances: "OrderedDict[Any, Any]" = OrderedDict()
+        # Most recently used instances kept alive in weak mode when maxsize is given.
+        self.strong: "OrderedDict[Any, Any]" = OrderedDict()
+        # Reentrant: an instance dropped while the lock is held (evicted from strong, or collected meanwhile) calls
+        # _collected right away, in the same thread.
+        self.lock = threading.RLock()
+        self.key_locks: Dict[Any, List] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Any) -> Any:
+        entry = self.instances.get(key)
+        if entry is None:
+            return _MISSING
+        if self.weak:
+            entry = entry()
+            if entry is None:
+                return _MISSING
+            if self.maxsize is not None:
+                self._touch(self.strong, key)
+        elif self.maxsize is not None:
+            self._touch(self.instances, key)
+        return entry
+
+    @staticmethod
+    def _touch(instances: OrderedDict, key: Any):
+        try:
+            instances.move_to_end(key)
+        except KeyError:
+            # Evicted by another thread in the meantime.
+            pass
+
+    def construct(self, key: Any, factory: Callable[[], Any]) -> Any:
+        with self.lock:
+            key_lock = self.key_locks.get(key)
+            if key_lock is None:
+                key_lock = self.key_locks[key] = [threading.Lock(), 0]
+            key_lock[1] += 1
+        try:
+            with key_lock[0]:
+                instance = self.get(key)
+                if instance is not _MISSING:
+                    self.hits += 1
+                    return instance
+                self.misses += 1
+                instance = factory()
+                self._store(key, instance)
+                return instance
+        finally:
+            with self.lock:
+                key_lock[1] -= 1
+                if not key_lock[1]:
+                    del self.key_locks[key]
+
+    def _store(self, key: Any, instance: Any):
+        with self.lock:
+            if self.weak:
+                self.instances[key] = weakref.ref(instance, functools.partial(self._collected, key))
+                if self.maxsize is None:
+                    return
+                self.strong[key] = instance
+                instances = self.strong
+            else:
+                self.instances[key] = instance
+                if self.maxsize is None:
+                    return
+                instances = self.instances
+            while len(instances) > self.maxsize:
+                instances.popitem(last=False)
+                if not self.weak:
+                    self.evictions += 1
+
+    def _collected(self, key: Any, ref: weakref.ref):
+        with self.lock:
+            if self.instances.get(key) is ref:
+                del self.instances[key]
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self.instances), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def clear(self):
+        with self.lock:
+            self.instances.clear()
+            self.strong.clear()
+
+
+@creational
+def multiton(cls: Any = None, *, key: Optional[Callable] = None, maxsize: Optional[int] = None,
+             weak: bool = False) -> Any:
+    # Similar to singleton. It allows multiple named instances, while serving as the only way of accessing them.
+    # Calling the class returns the instance cached for key(*args, **kwargs), by default the arguments themselves.
+    # With maxsize only the most recently used instances are kept (LRU); with weak=True instances are held by weak
+    # references and dropped once nothing else uses them (combined with maxsize, the maxsize most recently used ones are
+    # also kept alive). multiton.stats(cls) gives size, hit, miss and eviction counters, multiton.reset() drops
+    # instances.
+    if cls is None:
+        return lambda klass: multiton(klass, key=key, maxsize=maxsize, weak=weak)
+    registry = _KeyedInstances(maxsize, weak)
+    # Without LRU or weak references a hit is a plain dict lookup, done inline.
+    plain = registry.instances if maxsize is None and not weak else None
+    lookup = registry.get
+    base_call = _base_call(cls)
+
+    def __call__(klass, *args, **kwargs):
+        if key is not None:
+            instance_key = key(*args, **kwargs)
+        else:
+            instance_key = _default_key(*args, **kwargs) if kwargs else args
+        if klass is not decorated:
+            # Subclasses share the registry, with keys no call of the decorated class can produce.
+            instance_key = (_KWARGS_MARK, klass, instance_key)
+        instance = plain.get(instance_key, _MISSING) if plain is not None else lookup(instance_key)
+        if instance is not _MISSING:
+            registry.hits += 1
+            return instance
+        return registry.construct(instance_key, lambda: base_call(klass, *args, **kwargs))
+
+    decorated = _with_call(cls, __call__)
+    decorated.__multiton__ = registry
+    _multitons.append(weakref.ref(decorated))
+    return decorated
+
+
+_multitons: List[weakref.ref] = []
+
+
+def _multiton_stats(cls: type) -> Dict[str, int]:
+    return cls.__multiton__.stats()
+
+
+def _multiton_reset(cls: Optional[type] = None):
+    # Drops the instances of a multiton class, or of all of them.
+    if cls is not None:
+        cls.__multiton__.clear()
+        return
+    for ref in list(_multitons):
+        klass = ref()
+        if klass is not None:
+            klass.__multiton__.clear()
+
+
+multiton.stats = _multiton_stats
+multiton.reset = _multiton_reset
+
+
+@creational
+def dependency_injection(cls: Any) -> Any:
+    # Used to send specific instances of depended objects into a class (injecting them), instead of the class creating
+    # them directly.
+    return cls
+
+
+class _LazyProxy:
+    # Stands in for an instance of a @lazy_initialization class and constructs it on first use. Attribute access,
+    # assignment and the usual operators are forwarded to the instance; __class__ reports the proxied class, so
+    # isinstance works without constructing it.
+    __slots__ = ("_lazy_class", "_lazy_factory", "_lazy_instance", "_lazy_lock", "__weakref__")
+
+    def __init__(self, cls: type, factory: Callable[[], Any]):
+        object.__setattr__(self, "_lazy_class", cls)
+        object.__setattr__(self, "_lazy_factory", factory)
+        object.__setattr__(self, "_lazy_instance", _MISSING)
+        object.__setattr__(self, "_lazy_lock", threading.Lock())
+
+    def _lazy_get(self) -> Any:
+        instance = object.__getattribute__(self, "_lazy_instance")
+        if instance is _MISSING:
+            with object.__getattribute__(self, "_lazy_lock"):
+                instance = object.__getattribute__(self, "_lazy_instance")
+                if instance is _MISSING:
+                    instance = object.__getattribute__(self, "_lazy_factory")()
+                    object.__setattr__(self, "_lazy_instance", instance)
+                    object.__setattr__(self, "_lazy_factory", None)
+        return instance
+
+    @property
+    def __class__(self) -> type:
+        return object.__getattribute__(self, "_lazy_class")
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._lazy_get(), name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._lazy_get(), name, value)
+
+    def __delattr__(self, name: str):
+        delattr(self._lazy_get(), name)
+
+    def __dir__(self):
+        return dir(self._lazy_get())
+
+    def __repr__(self) -> str:
+        return repr(self._lazy_get())
+
+    def __str__(self) -> str:
+        return str(self._lazy_get())
+
+    def __bool__(self) -> bool:
+        return bool(self._lazy_get())
+
+    def __hash__(self) -> int:
+        return hash(self._lazy_get())
+
+    def __eq__(self, other: Any) -> bool:
+        return self._lazy_get() == other
+
+    def __ne__(self, other: Any) -> bool:
+        return self._lazy_get() != other
+
+    def __lt__(self, other: Any) -> bool:
+        return self._lazy_get() < other
+
+    def __le__(self, other: Any) -> bool:
+        return self._lazy_get() <= other
+
+    def __gt__(self, other: Any) -> bool:
+        return self._lazy_get() > other
+
+    def __ge__(self, other: Any) -> bool:
+        return self._lazy_get() >= other
+
+    def __len__(self) -> int:
+        return len(self._lazy_get())
+
+    def __iter__(self):
+        return iter(self._lazy_get())
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self._lazy_get()
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._lazy_get()[key]
+
+    def __setitem__(self, key: Any, value: Any):
+        self._lazy_get()[key] = value
+
+    def __delitem__(self, key: Any):
+        del self._lazy_get()[key]
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self._lazy_get()(*args, **kwargs)
+
+    def __enter__(self) -> Any:
+        return self._lazy_get().__enter__()
+
+    def __exit__(self, *exc_info) -> Any:
+        return self._lazy_get().__exit__(*exc_info)
+
+
+class _LazyAttribute:
+    # Cached property of @lazy_initialization: the value is computed on first access, under a per-instance lock so it
+    # is computed once, and stored in the instance __dict__ under the same name. Being a non-data descriptor, later
+    # reads find the stored value directly, without calling the descriptor or taking a lock.
+    def __init__(self, func: Callable):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.name = func.__name__
+        self._lock = threading.Lock()
+        self._instance_locks: Dict[int, List] = {}
+
+    def __set_name__(self, owner: type, name: str):
+        self.name = name
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+        try:
+            values = instance.__dict__
+        except AttributeError:
+            raise TypeError(f"lazy attribute {self.name} needs a __dict__ on {type(instance).__name__} instances") \
+                from None
+        key = id(instance)
+        with self._lock:
+            instance_lock = self._instance_locks.get(key)
+            if instance_lock is None:
+                # Reentrant, so a failing recursive access raises instead of deadlocking.
+                instance_lock = self._instance_locks[key] = [threading.RLock(), 0]
+            instance_lock[1] += 1
+        try:
+            with instance_lock[0]:
+                value = values.get(self.name, _MISSING)
+                if value is _MISSING:
+                    value = values[self.name] = self.func(instance)
+                return value
+        finally:
+            with self._lock:
+                instance_lock[1] -= 1
+                if not instance_lock[1]:
+                    del self._instance_locks[key]
+
+
+def _lazy_value(func: Callable) -> Callable:
+    # @lazy_initialization on a function outside a class: the value is computed by the first call, under a lock so it
+    # is computed once, and returned by the later calls without locking.
+    try:
+        inspect.signature(func).bind()
+    except TypeError:
+        raise TypeError(f"lazy_initialization on {func.__qualname__} outside a class needs a function without "
+                        f"arguments") from None
+    except ValueError:
+        pass
+    lock = threading.RLock()
+    value = _MISSING
+
+    @functools.wraps(func)
+    def wrapper():
+        nonlocal value
+        if value is _MISSING:
+            with lock:
+                if value is _MISSING:
+                    value = func()
+        return value
+    return wrapper
+
+
+@creational
+def lazy_initialization(cls: Any) -> Any:
+    # Delays the creation of an object or the calculation of a value until it is actually needed. In the GoF book, it
+    # appeared as a virtual proxy.
+    # On a class, calling it returns a proxy that constructs the real instance (with the same arguments) the first
+    # time it is used. On a method or property, it becomes a thread-safe cached property computed once per instance.
+    # On a function without arguments defined outside a class, it computes the value on the first call only.
+    if isinstance(cls, property):
+        cls = cls.fget
+    if not isinstance(cls, type):
+        owner = getattr(cls, "__qualname__", "").rpartition(".")[0]
+        if inspect.isfunction(cls) and (not owner or owner.endswith("<locals>")):
+            return _lazy_value(cls)
+        return _LazyAttribute(cls)
+    base_call = _base_call(cls)
+
+    def __call__(klass, *args, **kwargs):
+        return _LazyProxy(klass, lambda: base_call(klass, *args, **kwargs))
+
+    return _with_call(cls, __call__)
+
+
+virtual_proxy = lazy_initialization
+
+
+# Handed to a waiter of an object pool instead of an object: the pool has room, the waiter creates the object itself.
+_CREATE = object()
+
+
+class _ThreadWaiter:
+    __slots__ = ("_lock", "item")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._lock.acquire()
+        self.item = None
+
+    def deliver(self, pool: "_ObjectPool", item: Any):
+        self.item = item
+        self._lock.release()
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        return self._lock.acquire(timeout=-1 if timeout is None else max(timeout, 0))
+
+
+class _AsyncWaiter:
+    __slots__ = ("loop", "future")
+
+    def __init__(self):
+        # asyncio is imported by the asynchronous paths only, so that importing the creational patterns stays cheap.
+        import asyncio
+        self.loop = asyncio.get_running_loop()
+        self.future = self.loop.create_future()
+
+    def deliver(self, pool: "_ObjectPool", item: Any):
+        # Called with the pool lock held, possibly from another thread.
+        self.loop.call_soon_threadsafe(self._set, pool, item)
+
+    def _set(self, pool: "_ObjectPool", item: Any):
+        if self.future.done():
+            # The waiter timed out or was cancelled meanwhile, pass the item on.
+            with pool.lock:
+                pool.hand_over(item)
+        else:
+            self.future.set_result(item)
+
+
+class _Lease:
+    # Context manager returned by pool.borrow(), for use with either "with" or "async with".
+    __slots__ = ("_pool", "_timeout", "_item")
+
+    def __init__(self, pool: "_ObjectPool", timeout: Optional[float]):
+        self._pool = pool
+        self._timeout = timeout
+
+    def __enter__(self) -> Any:
+        self._item = self._pool.acquire(self._timeout)
+        return self._item
+
+    def __exit__(self, *exc_info):
+        self._pool.release(self._item)
+
+    async def __aenter__(self) -> Any:
+        self._item = await self._pool.acquire_async(self._timeout)
+        return self._item
+
+    async def __aexit__(self, *exc_info):
+        self._pool.release(self._item)
+
+
+class _ObjectPool:
+    # Bounded pool of reusable objects. Idle objects are reused most recently released first, so the surplus ones age
+    # and are dropped after idle_timeout (keeping min_size objects). When the pool is exhausted callers wait in a single
+    # FIFO queue shared by threads and asyncio tasks, and released objects are handed directly to the longest waiting
+    # one.
+    def __init__(self, factory: Callable[[], Any], min_size: int, max_size: int, idle_timeout: Optional[float],
+                 health_check: Optional[Callable[[Any], bool]], dispose: Optional[Callable[[Any], None]],
+                 timeout: Optional[float]):
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError("object pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check = health_check
+        self.dispose = dispose
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self._idle: deque = deque()
+        self._waiters: deque = deque()
+        # Objects alive or being created, idle or not.
+        self._size = 0
+        self._created = 0
+        self._discarded = 0
+        self._filled = False
+        self._wait_times = _Histogram()
+
+    def _checkout(self, waiter_type: type) -> Tuple[Any, Any, int]:
+        # Returns (object or _CREATE, None, prefill) when the call can proceed at once, (None, waiter, 0) otherwise.
+        # prefill is the number of extra objects to create for the pool on its first use.
+        with self.lock:
+            if not self._filled:
+                self._filled = True
+                missing = self.min_size - self._size
+                if missing > 0:
+                    # Room for the caller's object; the prefill objects reserve theirs one at a time.
+                    self._size += 1
+                    return _CREATE, None, missing - 1
+            if self._idle and not self._waiters:
+                return self._idle.pop()[0], None, 0
+            if self._size < self.max_size and not self._waiters:
+                self._size += 1
+                return _CREATE, None, 0
+            waiter = waiter_type()
+            self._waiters.append(waiter)
+            return None, waiter, 0
+
+    def _ready(self, item: Any, prefill: int = 0) -> Any:
+        # Turns a checked out item into a usable object, or None when the object failed its health check.
+        if item is _CREATE:
+            try:
+                for _ in range(prefill):
+                    self._add_idle()
+                item = self.factory()
+            except BaseException:
+                with self.lock:
+                    self.hand_over(_CREATE)
+                raise
+            with self.lock:
+                self._created += 1
+            return item
+        if self.health_check is not None and not self.health_check(item):
+            self.discard(item)
+            return None
+        return item
+
+    def _add_idle(self):
+        with self.lock:
+            if self._size >= self.max_size:
+                return
+            self._size += 1
+        try:
+            item = self.factory()
+        except BaseException:
+            with self.lock:
+                self.hand_over(_CREATE)
+            raise
+        with self.lock:
+            self._created += 1
+            self.hand_over(item)
+
+    def hand_over(self, item: Any):
+        # Gives an object (or room for one, _CREATE) to the first waiter or back to the pool. Needs the lock.
+        if self._waiters:
+            self._waiters.popleft().deliver(self, item)
+        elif item is _CREATE:
+            self._size -= 1
+        else:
+            self._idle.append((item, monotonic()))
+
+    def _expired(self) -> List[Any]:
+        # Removes the objects idle for longer than idle_timeout, beyond min_size. Needs the lock.
+        expired = []
+        if self.idle_timeout is not None:
+            limit = monotonic() - self.idle_timeout
+            while self._idle and self._idle[0][1] < limit and self._size > self.min_size:
+                expired.append(self._idle.popleft()[0])
+                self._size -= 1
+                self._discarded += 1
+        return expired
+
+    def _dispose(self, items: List[Any]):
+        if self.dispose is not None:
+            for item in items:
+                self.dispose(item)
+
+    def _record_wait(self, start: int):
+        elapsed = perf_counter_ns() - start
+        with self.lock:
+            self._wait_times.record(elapsed)
+            expired = self._expired()
+        self._dispose(expired)
+
+    def _abandon(self, waiter: Any) -> bool:
+        # Removes a timed out waiter from the queue, False when an item was delivered to it meanwhile.
+        with self.lock:
+            try:
+                self._waiters.remove(waiter)
+                return True
+            except ValueError:
+                return False
+
+    def acquire(self, timeout: Optional[float] = _MISSING) -> Any:
+        # Takes an object from the pool, creating one if the pool is not full, otherwise waits for one to be released
+        # for up to timeout seconds (None waits forever) and raises TimeoutError.
+        timeout = self.timeout if timeout is _MISSING else timeout
+        start = perf_counter_ns()
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            item, waiter, prefill = self._checkout(_ThreadWaiter)
+            if waiter is not None:
+                remaining = None if deadline is None else deadline - monotonic()
+                if not waiter.wait(remaining) and self._abandon(waiter):
+                    raise TimeoutError(f"no object available in the pool within {timeout} seconds")
+                item = waiter.item
+            item = self._ready(item, prefill)
+            if item is not None:
+                self._record_wait(start)
+                return item
+
+    async def acquire_async(self, timeout: Optional[float] = _MISSING) -> Any:
+        # Same as acquire, waiting without blocking the event loop. Objects are created and health checked on the loop.
+        import asyncio
+        timeout = self.timeout if timeout is _MISSING else timeout
+        start = perf_counter_ns()
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            item, waiter, prefill = self._checkout(_AsyncWaiter)
+            if waiter is not None:
+                remaining = None if deadline is None else max(deadline - monotonic(), 0)
+                try:
+                    item = await asyncio.wait_for(asyncio.shield(waiter.future), remaining)
+                except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+                    if not waiter.future.cancel():
+                        # Delivered just in time: keep the item, unless the task itself is being cancelled.
+                        item = waiter.future.result()
+                        if isinstance(exc, asyncio.CancelledError):
+                            with self.lock:
+                                self.hand_over(item)
+                            raise
+                    else:
+                        self._abandon(waiter)
+                        if isinstance(exc, asyncio.CancelledError):
+                            raise
+                        raise TimeoutError(f"no object available in the pool within {timeout} seconds") from None
+            item = self._ready(item, prefill)
+            if item is not None:
+                self._record_wait(start)
+                return item
+
+    def release(self, item: Any):
+        # Returns an object taken with acquire to the pool.
+        with self.lock:
+            self.hand_over(item)
+            expired = self._expired()
+        self._dispose(expired)
+
+    def discard(self, item: Any):
+        # Drops a broken object taken with acquire instead of returning it, making room for a new one.
+        with self.lock:
+            self._discarded += 1
+            self.hand_over(_CREATE)
+        self._dispose([item])
+
+    def borrow(self, timeout: Optional[float] = _MISSING) -> _Lease:
+        return _Lease(self, timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "waiting": len(self._waiters),
+                "created": self._created,
+                "discarded": self._discarded,
+                "wait": self._wait_times.summary(),
+            }
+
+    def clear(self):
+        # Drops the idle objects.
+        with self.lock:
+            items = [item for item, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(items)
+            self._discarded += len(items)
+        self._dispose(items)
+
+
+@creational
+def object_pool(cls: Any = None, *, min_size: int = 0, max_size: int = 10, idle_timeout: Optional[float] = None,
+                timeout: Optional[float] = None, factory: Optional[Callable[[], Any]] = None,
+                health_check: Optional[Callable[[Any], bool]] = None,
+                dispose: Optional[Callable[[Any], None]] = _close) -> Any:
+    # Recycles objects to avoid the expensive acquisition and creation of resources. A special case, connection pool,
+    # is well-known to all database programmers.
+    # Adds a pool attribute to the class: Connection.pool.acquire() / release(obj), or "with Connection.pool.borrow() as
+    # connection" ("async with" and acquire_async for asyncio). Objects are created with factory(), by default the class
+    # called without arguments; min_size of them are created on first use. health_check(obj) is called on every reuse,
+    # objects failing it are disposed of (by default with their close method) and replaced. pool.stats() gives the
+    # pool occupancy and a histogram of the acquisition wait times.
+    if cls is None:
+        return lambda klass: object_pool(klass, min_size=min_size, max_size=max_size, idle_timeout=idle_timeout,
+                                         timeout=timeout, factory=factory, health_check=health_check,
+                                         dispose=dispose)
+    cls.pool = _ObjectPool(factory or cls, min_size, max_size, idle_timeout, health_check, dispose, timeout)
+    return cls
+
+
+@creational
+def prototype(cls: Any) -> Any:
+    # Specifies how to create objects based on a template object that is cloned to produce new objects.
+    return cls
+
+
+@creational
+def resource_aquisition_is_initialization(cls: Any) -> Any:
+    # RAII- Pattern ensures that resources are properly released by tying them to the lifespan of an object.
+    return cls
+
+
+raii = resource_aquisition_is_initialization
+# endregion
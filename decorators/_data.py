@@ -0,0 +1,150 @@
+import json
+import operator
+from array import array
+from typing import Any, Dict, Iterable, Optional
+
+from ._common import _MISSING, _fields, _with_slots
+from ._patterns import data_pattern
+
+
+# region Data Patterns
+_ARRAY_TYPECODES = {int: "q", float: "d", bool: "b", "int": "q", "float": "d", "bool": "b"}
+
+
+def _generate(source: str, namespace: Dict[str, Any]) -> Dict[str, Any]:
+    exec(source, namespace)
+    return namespace
+
+
+def _dto_to_json(cls: type, items: Iterable[Any], **kwargs) -> str:
+    # JSON array of the objects as JSON objects, keyword arguments are passed to json.dumps.
+    return json.dumps(cls.__dto_to_dicts__(items), **kwargs)
+
+
+def _dto_to_columns(cls: type, items: Iterable[Any], fields: Optional[Iterable[str]] = None) -> Dict[str, array]:
+    # Column per numeric (int, float or bool) field, as a typed array.array: a compact buffer that can be written out
+    # or handed to NumPy without copying.
+    items = items if isinstance(items, (list, tuple)) else list(items)
+    numeric = cls.__dto_numeric__
+    columns = {}
+    for name in fields if fields is not None else numeric:
+        if name not in numeric:
+            raise TypeError(f"{cls.__qualname__}.{name} is not an int, float or bool field")
+        columns[name] = array(numeric[name], map(operator.attrgetter(name), items))
+    return columns
+
+
+@data_pattern
+def data_transfer_object(cls: Any = None, *, frozen: bool = False) -> Any:
+    # Pattern used when simple objects usually stored within struct or union or record are passed between various parts
+    # of the program. Typically those objects do have methods and just data field members such as fields and properties.
+    # Turns an annotated class into a compact record, like a slotted dataclass: the class is rebuilt with __slots__ for
+    # its fields, and __init__, __eq__, __repr__, to_tuple() and to_dict() are generated as straight-line code. With
+    # frozen=True fields cannot be assigned after __init__ and instances are hashable. Batch helpers work on any
+    # iterable of instances: Cls.to_json(items) and Cls.to_columns(items), the latter giving an array.array per numeric
+    # field.
+    if cls is None:
+        return lambda klass: data_transfer_object(klass, frozen=frozen)
+    inherited = getattr(cls, "__dto_fields__", ())
+    if inherited and getattr(cls, "__dto_frozen__") != frozen:
+        raise TypeError("a data transfer object and its data transfer object bases must be all frozen or all not")
+    own = tuple(name for name in _fields(cls) if name not in inherited)
+    fields = inherited + own
+    defaults = dict(getattr(cls, "__dto_defaults__", {}))
+    defaults.update((name, cls.__dict__[name]) for name in own if name in cls.__dict__)
+    for name in fields:
+        if isinstance(defaults.get(name), (list, dict, set)):
+            raise ValueError(f"mutable default for field {name} is shared by all instances, use None instead")
+    annotations = {}
+    for klass in reversed(cls.__mro__):
+        annotations.update(klass.__dict__.get("__annotations__", {}))
+    cls = _with_slots(cls, own, weakrefs=False)
+
+    names = {"cls": cls, "_MISSING": _MISSING}
+    parameters = []
+    for name in fields:
+        if name in defaults:
+            names[f"_default_{name}"] = defaults[name]
+            parameters.append(f"{name}=_default_{name}")
+        elif parameters and "=" in parameters[-1]:
+            raise TypeError(f"non-default field {name} follows a field with a default")
+        else:
+            parameters.append(name)
+    # Slot descriptors set the value without going through the __setattr__ blocked by frozen records.
+    for name in fields:
+        names[f"_set_{name}"] = getattr(cls, name).__set__
+    # The instance is not named self in __init__, as a field may be (the way dataclasses do it).
+    if frozen:
+        body = [f"    _set_{name}(__dto_self__, {name})" for name in fields]
+    else:
+        body = [f"    __dto_self__.{name} = {name}" for name in fields]
+    values = ", ".join(f"self.{name}" for name in fields)
+    other_values = ", ".join(f"other.{name}" for name in fields)
+    values_tuple = f"({values},)" if fields else "()"
+    source = "\n".join([
+        f"def __init__(__dto_self__, {', '.join(parameters)}):",
+        *(body or ["    pass"]),
+        "def __eq__(self, other):",
+        "    if other.__class__ is self.__class__:",
+        f"        return {values_tuple} == ({other_values}{',' if fields else ''})",
+        "    return NotImplemented",
+        "def __hash__(self):",
+        f"    return hash({values_tuple})",
+        "def __repr__(self):",
+        "    return f'{type(self).__qualname__}(" + ", ".join(f"{name}={{self.{name}!r}}" for name in fields) + ")'",
+        "def to_tuple(self):",
+        f"    return {values_tuple}",
+        "def to_dict(self):",
+        "    return {" + ", ".join(f"'{name}': self.{name}" for name in fields) + "}",
+        "def __dto_to_dicts__(items):",
+        "    return [{" + ", ".join(f"'{name}': item.{name}" for name in fields) + "} for item in items]",
+        "def __getstate__(self):",
+        f"    return {values_tuple}",
+        "def __setstate__(self, state):",
+        *(f"    _set_{name}(self, state[{index}])" for index, name in enumerate(fields)),
+        "    pass",
+    ])
+    generated = _generate(source, names)
+    # Methods written in the class body win over the generated ones, as with dataclasses. An __eq__ without __hash__
+    # sets __hash__ to None in the class body, which does not count as an explicit __hash__.
+    explicit_hash = "__hash__" in cls.__dict__ and not (cls.__hash__ is None and "__eq__" in cls.__dict__)
+    generated_methods = ["__init__", "__eq__", "__repr__", "to_tuple", "to_dict"]
+    if frozen:
+        # The default pickle and copy support restores the slots with setattr, which frozen records block.
+        generated_methods += ["__getstate__", "__setstate__"]
+    for name in generated_methods:
+        if name.startswith("__") and name in cls.__dict__:
+            continue
+        generated[name].__qualname__ = f"{cls.__qualname__}.{name}"
+        setattr(cls, name, generated[name])
+    if not explicit_hash:
+        # Like dataclasses, mutable records compare by value but are not hashable.
+        cls.__hash__ = generated["__hash__"] if frozen else None
+    if frozen:
+        def __setattr__(self, name, value):
+            raise AttributeError(f"cannot assign to field {name!r} of frozen {type(self).__qualname__}")
+
+        def __delattr__(self, name):
+            raise AttributeError(f"cannot delete field {name!r} of frozen {type(self).__qualname__}")
+        cls.__setattr__ = __setattr__
+        cls.__delattr__ = __delattr__
+    cls.__dto_fields__ = fields
+    cls.__dto_frozen__ = frozen
+    cls.__dto_defaults__ = defaults
+    cls.__dto_numeric__ = {name: _ARRAY_TYPECODES[annotations[name]] for name in fields
+                           if annotations.get(name) in _ARRAY_TYPECODES}
+    cls.__dto_to_dicts__ = staticmethod(generated["__dto_to_dicts__"])
+    cls.__match_args__ = fields
+    cls.to_json = classmethod(_dto_to_json)
+    cls.to_columns = classmethod(_dto_to_columns)
+    return cls
+
+
+dto = data_transfer_object
+
+
+@data_pattern
+def data_access_layer(cls: Any) -> Any:
+    # Classes that wrap the access to do databases.
+    return cls
+# endregion
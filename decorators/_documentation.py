@@ -0,0 +1,188 @@
+import functools
+import inspect
+import os
+import sys
+import warnings
+from typing import Any, Callable, Dict, Tuple
+
+from ._common import _qualified_name
+
+
+# region Decorators
+class ExperimentalWarning(UserWarning):
+    # Category of the warnings of @experimental code, to filter them (e.g. turn them into errors in tests).
+    pass
+
+
+# A call site is (id(code), offset of the call instruction) of the calling frame, which is cheaper to get than its line
+# number; registries of call sites keep the code object as the value, so that its id is not reused.
+# Call sites of the @experimental(count=True) functions and classes, by qualified name, and their calls.
+_experimental_sites: Dict[str, Dict[Tuple[int, int], Any]] = {}
+_experimental_counts: Dict[str, Dict[Tuple[int, int], int]] = {}
+# Frames in this directory are skipped when looking for the code using an @experimental function or class.
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+
+
+def _warn_experimental(name: str, warned: dict, site: Tuple[int, int], code: Any, stacklevel: int):
+    warned[site] = code
+    warnings.warn(f"Experimental function/class {name} used.", ExperimentalWarning, stacklevel + 1)
+
+
+def _site_location(code: Any, offset: int) -> str:
+    line = next((line for start, end, line in code.co_lines() if start <= offset < end), None)
+    return f"{code.co_filename}:{line if line is not None else code.co_firstlineno}"
+
+
+def experimental(func: Callable = None, *, per_call_site: bool = False, count: bool = False) -> Callable:
+    # Decorator for classes or functions that are used for experimental purposes only.
+    # Nothing happens at decoration time. The first call of the function, or instantiation of the class, emits an
+    # ExperimentalWarning through warnings.warn pointing at the calling line (so log capture and warning filters
+    # apply), then the original is put back in place of the wrapper (module global, class attribute or class
+    # __init__), so later calls run at full speed. With per_call_site=True it warns once per call site instead, the
+    # sites already warned about being kept in a registry, at the cost of a frame lookup per call. With count=True
+    # calls are also counted by call site, see experimental.counts().
+    if func is None:
+        return lambda target: experimental(target, per_call_site=per_call_site, count=count)
+    name = _qualified_name(func)
+    # Call sites this wrapper has warned at: a function defined again under the same name warns again.
+    warned: Dict[Tuple[int, int], Any] = {}
+    sites = _experimental_sites.setdefault(name, {}) if count else None
+    counts = _experimental_counts.setdefault(name, {}) if count else None
+    getframe = sys._getframe
+    package_dir = _PACKAGE_DIR
+    if isinstance(func, type):
+        target = func.__init__
+        own_init = func.__dict__.get("__init__")
+        plain = target is object.__init__
+
+        def call(self, *args, **kwargs):
+            return target(self) if plain else target(self, *args, **kwargs)
+    else:
+        call = target = func
+
+    def restore():
+        # Puts the original back where the wrapper was installed, once it has warned.
+        if isinstance(func, type):
+            if own_init is None:
+                del func.__init__
+            else:
+                func.__init__ = own_init
+            return
+        # The module, or the class of a method, found from the qualified name (not for functions defined in functions).
+        owner = sys.modules.get(func.__module__)
+        for part in func.__qualname__.split(".")[:-1]:
+            owner = getattr(owner, part, None)
+        if owner is not None and vars(owner).get(func.__name__) is wrapper:
+            setattr(owner, func.__name__, func)
+
+    watch = count or per_call_site
+
+    def guard():
+        # Called by the wrapper while it has to look at its callers: on every call when watching call sites, else until
+        # it has warned once. Shared by the plain and coroutine wrappers.
+        # The caller of the wrapper, or for code wrapped again by another decorator of this package (such as @singleton
+        # on a class) the first frame outside the package, at depth frames from the wrapper.
+        frame = getframe(2)
+        depth = 1
+        while frame.f_code.co_filename.startswith(package_dir) and frame.f_back is not None:
+            frame = frame.f_back
+            depth += 1
+        site = (id(frame.f_code), frame.f_lasti)
+        if counts is not None:
+            calls = counts.get(site, 0)
+            if not calls:
+                sites[site] = frame.f_code
+            counts[site] = calls + 1
+        if site not in warned if watch else not warned:
+            _warn_experimental(name, warned, site, frame.f_code, depth + 2)
+            if not watch:
+                restore()
+
+    if inspect.iscoroutinefunction(call):
+        @functools.wraps(target)
+        async def wrapper(*args, **kwargs):
+            if watch or not warned:
+                guard()
+            return await call(*args, **kwargs)
+    else:
+        @functools.wraps(target)
+        def wrapper(*args, **kwargs):
+            if watch or not warned:
+                guard()
+            return call(*args, **kwargs)
+
+    if isinstance(func, type):
+        func.__init__ = wrapper
+        return func
+    return wrapper
+
+
+def _experimental_counts_report() -> Dict[str, Dict[str, int]]:
+    # Calls of the @experimental(count=True) functions and classes by call site ("file:line").
+    report = {}
+    for name, counts in list(_experimental_counts.items()):
+        sites = _experimental_sites.get(name, {})
+        report[name] = {}
+        for site, calls in list(counts.items()):
+            location = _site_location(sites[site], site[1])
+            report[name][location] = report[name].get(location, 0) + calls
+    return report
+
+
+experimental.counts = _experimental_counts_report
+
+
+_doc_urls: Dict[str, Tuple[str, ...]] = {}
+
+
+def url(_url: str, debug: bool = False) -> Callable:
+    # Used for documenting a function with external URL.
+    # The URL is only recorded as metadata: it is appended to the __doc_urls__ tuple of the target and to the module
+    # registry (see doc_urls) and the target itself is returned, so documented code runs at full speed.
+    # Pass debug=True to get the old behaviour of printing the URL on every call.
+    def _decorator(function):
+        # Stacked decorators are applied bottom-up, so prepend in order to keep the URLs in source order.
+        urls = (_url,) + tuple(getattr(function, "__dict__", {}).get("__doc_urls__", ()))
+        target = function
+        if debug:
+            # The wrapper is of the same kind as the function, so coroutine functions and generators stay recognizable.
+            if inspect.iscoroutinefunction(function):
+                @functools.wraps(function)
+                async def wrapper(*args, **kwargs):
+                    print(f"Doc: {_url}")
+                    return await function(*args, **kwargs)
+            elif inspect.isasyncgenfunction(function):
+                @functools.wraps(function)
+                async def wrapper(*args, **kwargs):
+                    print(f"Doc: {_url}")
+                    async for item in function(*args, **kwargs):
+                        yield item
+            elif inspect.isgeneratorfunction(function):
+                @functools.wraps(function)
+                def wrapper(*args, **kwargs):
+                    print(f"Doc: {_url}")
+                    return (yield from function(*args, **kwargs))
+            else:
+                @functools.wraps(function)
+                def wrapper(*args, **kwargs):
+                    print(f"Doc: {_url}")
+                    result = function(*args, **kwargs)
+                    return result
+            target = wrapper
+        try:
+            target.__doc_urls__ = urls
+        except (AttributeError, TypeError):
+            # Builtins and objects with __slots__ only get the registry entry.
+            pass
+        _doc_urls[_qualified_name(function)] = urls
+        return target
+    return _decorator
+
+
+def doc_urls(obj: Any) -> Tuple[str, ...]:
+    # Returns the URLs attached to a function or class with @url, or an empty tuple.
+    urls = getattr(obj, "__dict__", {}).get("__doc_urls__")
+    if urls is None:
+        urls = _doc_urls.get(obj if isinstance(obj, str) else _qualified_name(obj), ())
+    return urls
+# endregion
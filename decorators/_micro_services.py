@@ -0,0 +1,613 @@
+import functools
+import inspect
+import itertools
+import random
+import threading
+import time
+from collections import deque
+from time import monotonic
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ._common import _MISSING, _qualified_name
+from ._documentation import url
+from ._patterns import micro_service, pattern
+from ._timing import _Histogram
+
+
+# region Micro-services Patterns
+class RetryBudget:
+    # Token bucket limiting retries to a fraction of the calls, shared by the @retry functions calling one dependency so
+    # that a failing dependency does not get its load multiplied by retries. Every call deposits ratio tokens and every
+    # retry takes a whole one; min_per_second tokens are also added over time so that rarely called functions can
+    # still retry. The bucket holds at most max_tokens.
+    def __init__(self, ratio: float = 0.1, min_per_second: float = 10.0, max_tokens: float = 100.0,
+                 clock: Callable[[], float] = monotonic):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self.clock = clock
+        self.tokens = max_tokens
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self.tokens = min(self.tokens + self.ratio, self.max_tokens)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.tokens + (now - self._updated) * self.min_per_second, self.max_tokens)
+            self._updated = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class _RetryPolicy:
+    def __init__(self, attempts: int, backoff: Any, base_delay: float, max_delay: float, jitter: Optional[str],
+                 retry_on: Any, deadline: Optional[float], budget: Optional[RetryBudget], clock: Callable[[], float]):
+        if attempts < 1:
+            raise ValueError("attempts must be at least 1")
+        if not callable(backoff) and backoff not in ("exponential", "linear", "constant"):
+            raise ValueError(f"unknown backoff {backoff!r}, use exponential, linear, constant or a function")
+        if jitter not in (None, "full", "equal"):
+            raise ValueError(f"unknown jitter {jitter!r}, use full, equal or None")
+        self.attempts = attempts
+        self.backoff = backoff
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.retry_on = retry_on
+        self.deadline = deadline
+        self.budget = budget
+        self.clock = clock
+        self.calls = 0
+        self.attempts_made = 0
+        self.retries = 0
+        self.giveups = 0
+        self.budget_exhausted = 0
+        self.added_latency = _Histogram()
+
+    def delay(self, attempt: int) -> float:
+        # Wait before the given retry (1 for the first one).
+        if callable(self.backoff):
+            delay = self.backoff(attempt)
+        elif self.backoff == "exponential":
+            delay = self.base_delay * 2 ** (attempt - 1)
+        elif self.backoff == "linear":
+            delay = self.base_delay * attempt
+        else:
+            delay = self.base_delay
+        delay = min(delay, self.max_delay)
+        if self.jitter == "full":
+            delay = random.uniform(0, delay)
+        elif self.jitter == "equal":
+            delay = delay / 2 + random.uniform(0, delay / 2)
+        return delay
+
+    def next_delay(self, exc: BaseException, attempt: int, start: float) -> Optional[float]:
+        # Delay before retrying after the given failed attempt, None to give up and raise exc.
+        retry_on = self.retry_on
+        if isinstance(retry_on, (type, tuple)):
+            retryable = isinstance(exc, retry_on)
+        else:
+            retryable = retry_on(exc)
+        if not retryable:
+            return None
+        if attempt >= self.attempts:
+            self.giveups += 1
+            return None
+        delay = self.delay(attempt)
+        if self.deadline is not None and self.clock() + delay - start >= self.deadline:
+            self.giveups += 1
+            return None
+        if self.budget is not None and not self.budget.withdraw():
+            self.budget_exhausted += 1
+            self.giveups += 1
+            return None
+        self.retries += 1
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "attempts": self.attempts_made,
+            "retries": self.retries,
+            "giveups": self.giveups,
+            "budget_exhausted": self.budget_exhausted,
+            # Time spent in failed attempts and waits, for the calls that retried.
+            "added_latency": self.added_latency.summary(),
+        }
+
+
+@micro_service
+def retry(func: Any = None, *, attempts: int = 3, backoff: Any = "exponential", base_delay: float = 0.1,
+          max_delay: float = 10.0, jitter: Optional[str] = "full", retry_on: Any = Exception,
+          deadline: Optional[float] = None, budget: Optional[RetryBudget] = _MISSING,
+          clock: Callable[[], float] = monotonic, sleep: Optional[Callable[[float], Any]] = None) -> Any:
+    # Implement retry logic for web service calls, so that we pass through the issue, by calling the service again,
+    # maybe immediately or after some wait time (such as a few seconds).
+    # Calls a function (or coroutine function) up to attempts times while it raises an exception matching retry_on
+    # (exception types or a predicate). Waits grow with backoff ("exponential", "linear", "constant" or a function of
+    # the retry number) from base_delay up to max_delay, randomized by jitter ("full", "equal" or None). No retry
+    # starts that would end after deadline seconds from the first attempt, and every retry needs a token from budget,
+    # a RetryBudget by default private to the function: share one between the functions calling the same dependency.
+    # clock and sleep can be replaced, e.g. in tests. The wrapper has stats(). On a class it stays a documentation
+    # marker.
+    if func is None:
+        return lambda function: retry(function, attempts=attempts, backoff=backoff, base_delay=base_delay,
+                                      max_delay=max_delay, jitter=jitter, retry_on=retry_on, deadline=deadline,
+                                      budget=budget, clock=clock, sleep=sleep)
+    if isinstance(func, type):
+        return func
+    policy = _RetryPolicy(attempts, backoff, base_delay, max_delay, jitter, retry_on, deadline,
+                          RetryBudget(clock=clock) if budget is _MISSING else budget, clock)
+
+    def finished(start: float, first_attempt: Optional[float]):
+        if first_attempt is not None:
+            policy.added_latency.record(int((clock() - start - first_attempt) * 10 ** 9))
+
+    if inspect.iscoroutinefunction(func):
+        # asyncio is imported for coroutine functions only, so that importing the micro-services patterns stays cheap.
+        import asyncio
+        wait = sleep or asyncio.sleep
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            policy.calls += 1
+            if policy.budget is not None:
+                policy.budget.deposit()
+            start = clock()
+            first_attempt = None
+            attempt = 0
+            try:
+                while True:
+                    attempt += 1
+                    policy.attempts_made += 1
+                    try:
+                        return await func(*args, **kwargs)
+                    except Exception as exc:
+                        if first_attempt is None:
+                            first_attempt = clock() - start
+                        delay = policy.next_delay(exc, attempt, start)
+                        if delay is None:
+                            raise
+                    result = wait(delay)
+                    if inspect.isawaitable(result):
+                        await result
+            finally:
+                finished(start, first_attempt)
+    else:
+        wait = sleep or time.sleep
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            policy.calls += 1
+            if policy.budget is not None:
+                policy.budget.deposit()
+            start = clock()
+            first_attempt = None
+            attempt = 0
+            try:
+                while True:
+                    attempt += 1
+                    policy.attempts_made += 1
+                    try:
+                        return func(*args, **kwargs)
+                    except Exception as exc:
+                        if first_attempt is None:
+                            first_attempt = clock() - start
+                        delay = policy.next_delay(exc, attempt, start)
+                        if delay is None:
+                            raise
+                    wait(delay)
+            finally:
+                finished(start, first_attempt)
+
+    wrapper.stats = policy.stats
+    return wrapper
+
+
+class CircuitOpenError(RuntimeError):
+    # Raised instead of calling a function protected by an open circuit breaker.
+    pass
+
+
+class CircuitBreaker:
+    # State of a circuit breaker, shared by all the functions decorated with it (or with its name). Calls are counted
+    # in a rolling window of window seconds split in buckets; once it has minimum_calls calls and the rate of failures
+    # (exceptions matching failure_on) reaches failure_rate, or the rate of calls slower than slow_call_duration
+    # reaches slow_call_rate, the breaker opens for open_duration seconds. Then half_open_calls trial calls are let
+    # through: if they all succeed it closes, otherwise it opens again.
+    # While open, calls fail fast: one read of an attribute and of the clock, no lock.
+    # Every opening starts a new period; a call records its outcome with the period it was admitted in, and outcomes
+    # of calls admitted before the last opening are ignored.
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: Optional[str] = None, failure_rate: float = 0.5, slow_call_rate: float = 1.0,
+                 slow_call_duration: Optional[float] = None, window: float = 10.0, buckets: int = 10,
+                 minimum_calls: int = 10, open_duration: float = 30.0, half_open_calls: int = 1,
+                 failure_on: Any = Exception, clock: Callable[[], float] = monotonic):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.slow_call_rate = slow_call_rate
+        self.slow_call_duration = slow_call_duration
+        self.minimum_calls = minimum_calls
+        self.open_duration = open_duration
+        self.half_open_calls = half_open_calls
+        self.failure_on = failure_on
+        self.clock = clock
+        self.state = self.CLOSED
+        # Non-zero unless closed, read without lock by the fast path.
+        self.open_until = 0.0
+        self.rejected = 0
+        self.opened = 0
+        self.period = 0
+        self._width = window / buckets
+        # Per bucket: [bucket number, calls, failures, slow calls].
+        self._buckets = [[-1, 0, 0, 0] for _ in range(buckets)]
+        # Trial slots left and trials which succeeded in the half open state.
+        self._trials = 0
+        self._successes = 0
+        self._lock = threading.Lock()
+
+    def admit(self, now: float) -> Optional[int]:
+        # Whether a call may go through once open_until has passed: the breaker turns half open and lets the trial
+        # calls through. Returns the period of the call, None means fail fast.
+        with self._lock:
+            if self.state == self.OPEN and now >= self.open_until:
+                self.state = self.HALF_OPEN
+                self._trials = self.half_open_calls
+                self._successes = 0
+            if self.state == self.HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+                return self.period
+            return self.period if self.state == self.CLOSED else None
+
+    def record(self, failed: bool, start: Optional[float], period: Optional[int] = None):
+        # Records the outcome of a call started at start (clock value, None when slow calls are not tracked) and
+        # admitted in period (the current one when None).
+        now = self.clock()
+        slow = start is not None and now - start >= self.slow_call_duration
+        number = int(now / self._width)
+        with self._lock:
+            if period is not None and period != self.period:
+                return
+            if self.state == self.HALF_OPEN:
+                # A trial: the breaker closes once every trial slot has been used by a call which succeeded, so no
+                # trial is left running when it does.
+                if failed or slow:
+                    self._open(now)
+                else:
+                    self._successes += 1
+                    if self._successes >= self.half_open_calls:
+                        self._close()
+                return
+            if self.state == self.OPEN:
+                return
+            bucket = self._buckets[number % len(self._buckets)]
+            if bucket[0] != number:
+                bucket[:] = [number, 0, 0, 0]
+            bucket[1] += 1
+            if failed:
+                bucket[2] += 1
+            if slow:
+                bucket[3] += 1
+            if (failed or slow) and self.state == self.CLOSED:
+                calls, failures, slow_calls = self._totals(number)
+                if calls >= self.minimum_calls and (failures >= self.failure_rate * calls or
+                                                     slow_calls >= self.slow_call_rate * calls):
+                    self._open(now)
+
+    def release(self, period: Optional[int] = None):
+        # Gives back the slot of an admitted call which ended without an outcome (cancelled), so that a half open
+        # breaker lets another trial call through instead of waiting forever for this one.
+        with self._lock:
+            if period is not None and period != self.period:
+                return
+            if self.state == self.HALF_OPEN and self._trials + self._successes < self.half_open_calls:
+                self._trials += 1
+
+    def _totals(self, number: int) -> Tuple[int, int, int]:
+        calls = failures = slow_calls = 0
+        first = number - len(self._buckets)
+        for bucket in self._buckets:
+            if bucket[0] > first:
+                calls += bucket[1]
+                failures += bucket[2]
+                slow_calls += bucket[3]
+        return calls, failures, slow_calls
+
+    def _open(self, now: float):
+        self.state = self.OPEN
+        self.open_until = now + self.open_duration
+        self.opened += 1
+        self.period += 1
+
+    def _close(self):
+        self.state = self.CLOSED
+        self.open_until = 0.0
+        for bucket in self._buckets:
+            bucket[:] = [-1, 0, 0, 0]
+
+    def reset(self):
+        with self._lock:
+            self._close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            calls, failures, slow_calls = self._totals(int(self.clock() / self._width))
+            return {
+                "state": self.state,
+                "calls": calls,
+                "failures": failures,
+                "slow_calls": slow_calls,
+                "failure_rate": failures / calls if calls else 0.0,
+                "rejected": self.rejected,
+                "opened": self.opened,
+            }
+
+    def __call__(self, func: Callable) -> Callable:
+        return circuit_breaker(func, breaker=self)
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+@micro_service
+def circuit_breaker(cls: Any = None, *, name: Optional[str] = None, breaker: Optional[CircuitBreaker] = None,
+                    **options) -> Any:
+    # Wrap a fragile function call (or an integration point with an external service) in a special (circuit breaker)
+    # object, which monitors for failures. Once the failures reach a certain threshold, the circuit breaker trips, and
+    # all further calls to the circuit breaker return with an error, without the protected call being made at all.
+    # Protects a function or coroutine function with a CircuitBreaker: the given one, the one registered under name
+    # (created with the options, see CircuitBreaker, on first use) so that all the call sites of a dependency share it,
+    # or else a new one. Calls made while it is open raise CircuitOpenError. The wrapper has a breaker attribute. On a
+    # class it stays a documentation marker.
+    if cls is None:
+        return lambda function: circuit_breaker(function, name=name, breaker=breaker, **options)
+    if isinstance(cls, type):
+        return cls
+    func = cls
+    if breaker is None:
+        if name is None:
+            breaker = CircuitBreaker(_qualified_name(func), **options)
+        else:
+            with _breakers_lock:
+                breaker = _breakers.get(name)
+                if breaker is None:
+                    breaker = _breakers[name] = CircuitBreaker(name, **options)
+    failure_on = breaker.failure_on
+    clock = breaker.clock
+    message = f"circuit breaker {breaker.name} is open"
+    timed_calls = breaker.slow_call_duration is not None
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            period = breaker.period
+            if breaker.open_until:
+                now = clock()
+                period = None if now < breaker.open_until else breaker.admit(now)
+                if period is None:
+                    breaker.rejected += 1
+                    raise CircuitOpenError(message)
+            start = clock() if timed_calls else None
+            try:
+                result = await func(*args, **kwargs)
+            except failure_on:
+                breaker.record(True, start, period)
+                raise
+            except Exception:
+                # Not a failure of the dependency (e.g. a validation error): the call went through.
+                breaker.record(False, start, period)
+                raise
+            except BaseException:
+                # Cancelled or interrupted: no outcome, but a trial call gives its slot back.
+                breaker.release(period)
+                raise
+            breaker.record(False, start, period)
+            return result
+    else:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            period = breaker.period
+            if breaker.open_until:
+                now = clock()
+                period = None if now < breaker.open_until else breaker.admit(now)
+                if period is None:
+                    breaker.rejected += 1
+                    raise CircuitOpenError(message)
+            start = clock() if timed_calls else None
+            try:
+                result = func(*args, **kwargs)
+            except failure_on:
+                breaker.record(True, start, period)
+                raise
+            except Exception:
+                # Not a failure of the dependency (e.g. a validation error): the call went through.
+                breaker.record(False, start, period)
+                raise
+            except BaseException:
+                # Cancelled or interrupted: no outcome, but a trial call gives its slot back.
+                breaker.release(period)
+                raise
+            breaker.record(False, start, period)
+            return result
+
+    wrapper.breaker = breaker
+    return wrapper
+
+
+class ThrottledError(RuntimeError):
+    # Raised by a @throttling function called over its limit. retry_after is the number of seconds until a call would
+    # be allowed.
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    # Per-key rate limits, rate calls per `per` seconds.
+    # "token_bucket" allows bursts of up to burst calls (default rate). It is implemented as GCRA: the only state of a
+    # key is the time at which its bucket will be full again (one float), and keys past that time are idle.
+    # "sliding_window" allows at most burst calls in any window of burst * per / rate seconds (rate calls in any `per`
+    # seconds by default), keeping the times of the calls of the window.
+    # At most max_keys keys are tracked: when there are more, idle keys are dropped first (which loses nothing, a new
+    # key starts idle), then the least recently added ones.
+    def __init__(self, rate: float, burst: Optional[int] = None, per: float = 1.0, algorithm: str = "token_bucket",
+                 max_keys: int = 100_000, clock: Callable[[], float] = monotonic):
+        if algorithm not in ("token_bucket", "sliding_window"):
+            raise ValueError(f"unknown algorithm {algorithm!r}, use token_bucket or sliding_window")
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.per = per
+        self.burst = burst if burst is not None else max(int(rate), 1)
+        self.algorithm = algorithm
+        self.max_keys = max_keys
+        self.clock = clock
+        self.allowed = 0
+        self.limited = 0
+        self._interval = per / rate
+        self._window = self.burst * self._interval
+        self._keys: Dict[Any, Any] = {}
+        self._lock = threading.Lock()
+        self.try_acquire = self._token_bucket if algorithm == "token_bucket" else self._sliding_window
+
+    def _token_bucket(self, key: Any = None, reserve: bool = False) -> float:
+        # Takes a call slot for key and returns 0.0, or returns the seconds to wait for one. With reserve the slot is
+        # taken in any case and the caller has to wait the returned time before using it.
+        now = self.clock()
+        interval = self._interval
+        with self._lock:
+            keys = self._keys
+            full_at = keys.get(key, now)
+            if full_at < now:
+                full_at = now
+            full_at += interval
+            wait = full_at - now - self.burst * interval
+            if wait > 0 and not reserve:
+                self.limited += 1
+                return wait
+            keys[key] = full_at
+            if len(keys) > self.max_keys:
+                self._evict(now)
+            self.allowed += 1
+            return wait if wait > 0 else 0.0
+
+    def _sliding_window(self, key: Any = None, reserve: bool = False) -> float:
+        # Same as _token_bucket, reserve is ignored: the caller retries after the returned time.
+        now = self.clock()
+        with self._lock:
+            calls = self._keys.get(key)
+            if calls is None:
+                # Room is made before adding the key, so that it cannot be dropped itself as idle.
+                if len(self._keys) >= self.max_keys:
+                    self._evict(now, 1)
+                calls = self._keys[key] = deque()
+            start = now - self._window
+            while calls and calls[0] <= start:
+                calls.popleft()
+            if len(calls) >= self.burst:
+                self.limited += 1
+                return calls[0] - start
+            calls.append(now)
+            self.allowed += 1
+            return 0.0
+
+    def _evict(self, now: float, room: int = 0):
+        # Needs the lock. Leaves room for that many more keys.
+        keys = self._keys
+        if self.algorithm == "token_bucket":
+            idle = [key for key, full_at in keys.items() if full_at <= now]
+        else:
+            idle = [key for key, calls in keys.items() if not calls or calls[-1] <= now - self._window]
+        for key in idle:
+            del keys[key]
+        # Drop a tenth more than needed, so that the next sweep is far away.
+        excess = len(keys) + room - self.max_keys + self.max_keys // 10
+        if excess > 0:
+            for key in list(itertools.islice(keys, excess)):
+                del keys[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {"keys": len(self._keys), "allowed": self.allowed, "limited": self.limited}
+
+
+@micro_service
+@url("https://docs.microsoft.com/en-/azure/architecture/patterns/throttling")
+def throttling(cls: Any = None, rate: Optional[float] = None, burst: Optional[int] = None, *, per: float = 1.0,
+               key: Optional[Callable] = None, algorithm: str = "token_bucket", on_limit: str = "raise",
+               max_keys: int = 100_000, limiter: Optional[RateLimiter] = None,
+               clock: Callable[[], float] = monotonic) -> Any:
+    # Based on limiting the number of requests a user can send to a given web service in a given amount of time, in
+    # order to protect the resources of the service from being overused by some users.
+    # @throttling(rate, burst) limits a function (or coroutine function) to rate calls per `per` seconds, per
+    # key(*args, **kwargs) if key is given (e.g. per user or tenant), see RateLimiter for the algorithms. A call over
+    # the limit raises ThrottledError with on_limit="raise", or waits for its turn with on_limit="wait" (sleeping, or
+    # awaiting for coroutine functions). Pass the same limiter to share one limit between functions. The wrapper has
+    # a limiter attribute. On a class it stays a documentation marker.
+    if cls is None or not callable(cls):
+        if cls is not None:
+            rate, burst = cls, rate
+        return lambda function: throttling(function, rate, burst, per=per, key=key, algorithm=algorithm,
+                                           on_limit=on_limit, max_keys=max_keys, limiter=limiter, clock=clock)
+    if isinstance(cls, type):
+        return cls
+    if on_limit not in ("raise", "wait"):
+        raise ValueError(f"unknown on_limit {on_limit!r}, use raise or wait")
+    if limiter is None:
+        if rate is None:
+            raise TypeError("throttling needs a rate or a limiter")
+        limiter = RateLimiter(rate, burst, per, algorithm, max_keys, clock)
+    func = cls
+    try_acquire = limiter.try_acquire
+    reserve = on_limit == "wait" and limiter.algorithm == "token_bucket"
+    name = _qualified_name(func)
+
+    def limited(wait: float):
+        raise ThrottledError(f"{name} is over its rate limit, retry in {wait:.3f} seconds", wait)
+
+    if inspect.iscoroutinefunction(func):
+        import asyncio
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            limit_key = key(*args, **kwargs) if key is not None else None
+            wait = try_acquire(limit_key, reserve)
+            while wait:
+                if on_limit == "raise":
+                    limited(wait)
+                await asyncio.sleep(wait)
+                wait = 0.0 if reserve else try_acquire(limit_key)
+            return await func(*args, **kwargs)
+    else:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            limit_key = key(*args, **kwargs) if key is not None else None
+            wait = try_acquire(limit_key, reserve)
+            while wait:
+                if on_limit == "raise":
+                    limited(wait)
+                time.sleep(wait)
+                wait = 0.0 if reserve else try_acquire(limit_key)
+            return func(*args, **kwargs)
+
+    wrapper.limiter = limiter
+    return wrapper
+
+
+@pattern
+@url("https://www.ics.uci.edu/~fielding/pubs/dissertation/top.htm")
+def rest(cls: Any) -> Any:
+    # Representational State Transfer (REST) is a Web service design pattern. It is different from SOAP based web
+    # services. REST services do not require XML, SOAP or WSDL service-API definitions. The concept originally comes
+    # from a PhD's dissertation
+    return cls
+# endregion
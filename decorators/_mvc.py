@@ -0,0 +1,69 @@
+from typing import Any
+
+from ._documentation import url
+from ._patterns import pattern
+
+
+# region MVC/MVVM Patterns
+@pattern
+def mvc_pattern(cls: Any) -> Any:
+    return cls
+
+
+@pattern
+def mvvm_pattern(cls: Any) -> Any:
+    return cls
+
+
+@mvc_pattern
+@mvvm_pattern
+def model(cls: Any) -> Any:
+    # Internal representation of the data.
+    return cls
+
+
+@mvc_pattern
+@mvvm_pattern
+def view(cls: Any) -> Any:
+    # View is the screen presentation of GUI, web page
+    return cls
+
+
+@mvc_pattern
+def controller(cls: Any) -> Any:
+    # Coordinates changes between the Model and View.
+    return cls
+
+
+@mvvm_pattern
+def model_view(cls: Any) -> Any:
+    return cls
+
+
+# region View Patterns
+@view
+@url("URL : http://www.delphifeeds.com/go/f/123041")
+def alert_view(cls: Any) -> Any:
+    # Read only notification to the user. Such as MessageDlg or ShowMessage.
+    return cls
+
+
+@view
+def selection_view(cls: Any) -> Any:
+    # Form to find some kind of reference key for locating data for the user, often through a database lookup
+    # operation.
+    return cls
+
+
+@view
+def data_entry_view(cls: Any) -> Any:
+    # CRUD form for data amendments.
+    return cls
+
+
+@view
+def domain_management_view(cls: Any) -> Any:
+    # Usually this is your main form.
+    return cls
+# endregion
+# endregion
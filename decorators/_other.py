@@ -0,0 +1,39 @@
+from typing import Any
+
+from ._patterns import pattern
+
+
+# region Other Patterns
+@pattern
+def type_safe_enum(cls: Any) -> Any:
+    # Define a class representing a single element of the enumerated type and provide no public constructor.
+    return cls
+
+
+smart_enum = type_safe_enum
+
+
+@pattern
+def smart_pointer(cls: Any) -> Any:
+    return cls
+
+
+@pattern
+def business_delegate(cls: Any) -> Any:
+    # An intermediate class decouples between presentation-tier clients and business services.
+    return cls
+
+
+@pattern
+def intercepting_filter(cls: Any) -> Any:
+    # A pluggable component design to intercept incomming requests and outgoing responses, provide common services in a
+    # standard manner (independently) without changing core processing code.
+    return cls
+
+
+@pattern
+def service_locator(cls: Any) -> Any:
+    # Centralizing distributed service object lookups, providing a centralized point of control, acting as a cache that
+    # eliminates redundant lookups.
+    return cls
+# endregion
@@ -0,0 +1,236 @@
+import functools
+import threading
+import weakref
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import _MODULES
+
+
+# region Design Patterns
+# The families of patterns, which are categories of the patterns decorated with them.
+_CATEGORIES = ("gof_pattern", "creational", "structural", "behavioural", "concurrency", "data_pattern", "micro_service",
+               "mvc_pattern", "mvvm_pattern")
+# Index of the objects decorated with patterns, by pattern name, category and module. The inner dicts are used as
+# insertion ordered sets (all values are None), so that adding and finding objects is O(1). Objects are held by weak
+# references, one per object, so classes and closures made at run time leave the index once collected.
+_by_pattern: Dict[str, Dict[weakref.ref, None]] = {}
+_by_category: Dict[str, Dict[weakref.ref, None]] = {}
+_by_module: Dict[str, Dict[weakref.ref, None]] = {}
+# Reference (the one used as key in the index), module and (pattern, categories) tags of every decorated object.
+_pattern_tags: Dict[weakref.ref, Tuple[weakref.ref, str, List[Tuple[str, Tuple[str, ...]]]]] = {}
+# References to collected objects, dropped from the index on its next use.
+_collected: List[weakref.ref] = []
+_patterns_lock = threading.Lock()
+
+
+def _pattern_collected(reference: weakref.ref):
+    # Runs whenever the collector frees an indexed object, possibly in a thread holding _patterns_lock, so it only
+    # queues the reference.
+    _collected.append(reference)
+
+
+def _tag_keys(module: str, tags: List[Tuple[str, Tuple[str, ...]]]
+              ) -> Iterable[Tuple[Dict[str, Dict[weakref.ref, None]], str]]:
+    yield _by_module, module
+    for name, categories in tags:
+        yield _by_pattern, name
+        for category in categories:
+            yield _by_category, category
+
+
+def _unindex(reference: weakref.ref) -> Optional[List[Tuple[str, Tuple[str, ...]]]]:
+    # Removes an object from the index and returns its tags. Called with _patterns_lock held.
+    entry = _pattern_tags.pop(reference, None)
+    if entry is None:
+        return None
+    reference, module, tags = entry
+    for index, key in _tag_keys(module, tags):
+        index[key].pop(reference, None)
+    return tags
+
+
+def _drop_collected():
+    # Called with _patterns_lock held.
+    while _collected:
+        _unindex(_collected.pop())
+
+
+class _PatternNames:
+    # The __patterns__ of a decorated class: the names of its patterns for the class and its instances, but not for
+    # its subclasses, which only have patterns once decorated themselves.
+    __slots__ = ("names",)
+
+    def __init__(self, names: Tuple[str, ...]):
+        self.names = names
+
+    def __get__(self, instance: Any, owner: type) -> Tuple[str, ...]:
+        return self.names if owner.__dict__.get("__patterns__") is self else ()
+
+
+def _index_pattern(target: Any, source: Any, name: str, categories: Tuple[str, ...]):
+    # Records that the pattern name, of categories, was applied to source and gave target: source itself, or a subclass
+    # or wrapper which then takes over the tags of source. Sets target.__patterns__ to the names of its patterns.
+    tag = (name, categories)
+    try:
+        reference = weakref.ref(target, _pattern_collected)
+        source_reference = weakref.ref(source) if source is not target else None
+        with _patterns_lock:
+            _drop_collected()
+            entry = _pattern_tags.get(reference)
+            moved = _unindex(source_reference) if source_reference is not None else None
+            if entry is not None:
+                reference, module, tags = entry
+            else:
+                module, tags = getattr(target, "__module__", None), []
+                _pattern_tags[reference] = (reference, module, tags)
+                _by_module.setdefault(module, {})[reference] = None
+            for added in (*(moved or ()), tag):
+                if added not in tags:
+                    tags.append(added)
+                    _by_pattern.setdefault(added[0], {})[reference] = None
+                    for category in added[1]:
+                        _by_category.setdefault(category, {})[reference] = None
+            names = tuple(dict.fromkeys(name for name, _ in tags)) if len(tags) > 1 else (name,)
+    except TypeError:
+        # Unhashable objects, and objects without weak references, are not indexed.
+        return
+    try:
+        target.__patterns__ = _PatternNames(names) if isinstance(target, type) else names
+    except (AttributeError, TypeError):
+        pass
+
+
+_FunctionType = type(_tag_keys)
+# The modules of the package, where the patterns are defined.
+_DEFINITION_MODULES = frozenset(f"{__package__}.{module}" for module in _MODULES)
+
+
+def _is_definition(target: Any) -> bool:
+    # Whether a pattern decorator is applied to another pattern of this package (or to a decorator made from one).
+    return type(target) is _FunctionType and target.__module__ in _DEFINITION_MODULES
+
+
+def _define_pattern(func: Callable, categories: List[str]) -> Callable:
+    existing = getattr(func, "__pattern_categories__", None)
+    if existing is None:
+        return _pattern_decorator(func, categories)
+    existing.extend(category for category in categories if category not in existing)
+    return func
+
+
+def _pattern_decorator(func: Callable, categories: List[str], category: bool = False) -> Callable:
+    # Wraps a pattern of this package so that what it decorates is indexed under its name and categories (a family of
+    # patterns, category=True, is a category of its own). Applied to another pattern of this package, it makes it a
+    # pattern of its family: @creational on singleton, or @view on alert_view. Calls made with something else than a
+    # class or a function (the options of a parametrized decorator, or the arguments of a factory like
+    # thread_pool("io")) are not recorded.
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        target = args[0] if args else kwargs.get("cls")
+        if type(target) is _FunctionType and target.__module__ in _DEFINITION_MODULES and len(args) == 1 and not kwargs:
+            return _define_pattern(target, categories + [name])
+        result = func(*args, **kwargs)
+        if callable(target) and callable(result):
+            _index_pattern(result, target, name, (*categories, name) if category else tuple(categories))
+        return result
+
+    wrapper.__pattern_categories__ = categories
+    return wrapper
+
+
+def pattern(cls: Any) -> Any:
+    # Makes a decorator of a pattern (or of a family of patterns) of this package, which records the classes and
+    # functions it decorates in an index queried with pattern.by_pattern(name), pattern.by_category(name),
+    # pattern.by_module(name) and pattern.of(obj); decorated objects also get a __patterns__ tuple with the names of
+    # their patterns. Applied to anything else, it tags it as "pattern".
+    if not _is_definition(cls):
+        _index_pattern(cls, cls, "pattern", ())
+        return cls
+    return _pattern_decorator(cls, [], cls.__name__ in _CATEGORIES)
+
+
+def _pattern_lookup(index: Dict[str, Dict[weakref.ref, None]], key: str) -> Tuple[Any, ...]:
+    # Not cached, as a tuple of the objects would keep them alive.
+    with _patterns_lock:
+        _drop_collected()
+        objects = [reference() for reference in index.get(key, ())]
+    if None in objects:
+        objects = [obj for obj in objects if obj is not None]
+    return tuple(objects)
+
+
+def _patterns_of(obj: Any) -> Dict[str, Tuple[str, ...]]:
+    # The patterns applied to obj, with their categories.
+    try:
+        reference = weakref.ref(obj)
+        with _patterns_lock:
+            entry = _pattern_tags.get(reference)
+    except TypeError:
+        return {}
+    return dict(entry[2]) if entry else {}
+
+
+pattern.by_pattern = functools.partial(_pattern_lookup, _by_pattern)
+pattern.by_category = functools.partial(_pattern_lookup, _by_category)
+pattern.by_module = functools.partial(_pattern_lookup, _by_module)
+pattern.of = _patterns_of
+
+
+@pattern
+def gof_pattern(cls: Any) -> Any:
+    # Patterns described in Design Patterns: Elements of Reusable Object-Oriented Software book by
+    # Erich Gamma, John Vlissides, Ralph Johnson, and Richard Helm (aka Gang of Four pattern or GoF)
+    return cls
+
+
+@pattern
+def creational(cls: Any) -> Any:
+    # A creational pattern abstracts the instantiation process of simple and composite objects.
+    # Creational patterns deal with delegation. They are focused on creating new objects and groups of related objects.
+    # These patterns will create objects for you, meaning that you don't have to create them directly.
+    return cls
+
+
+@pattern
+def structural(cls: Any) -> Any:
+    # A structural pattern groups objects into larger structures. Handle the way objects are composed into new objects.
+    # The focus of structural patterns is aggregation. They define ways to compose objects in a way that creates new
+    # functionality from the constituent parts. They help us create software components.
+    return cls
+
+
+@pattern
+def behavioural(cls: Any) -> Any:
+    # A behavioral pattern defines communication between objects and with distribution of responsibilities.
+    # Behavioral patterns are big on consultation they talk about responsibilities between objects. Unlike structural
+    # patterns, which only specify a structure, behavioral patterns define communication paths and messages
+    return cls
+
+
+@pattern
+def concurrency(cls: Any) -> Any:
+    # Patterns needed in the world of parallel programming.
+    # Concurrency patterns deal with cooperation. They make a system composed of multiple components, running in
+    # parallel, work together. The main concerns of concurrency patterns are resource protection and messaging.
+    # Pattern-Oriented Software Architecture: Patterns for Concurrent and Networked Objects, Volume 2, by
+    # Douglas C Schmidt, Michael Stal, Hans Rohnert, and Frank Buschmann
+    return cls
+
+
+@pattern
+def data_pattern(cls: Any) -> Any:
+    # Patterns that relate to how data is processed and transfered
+    return cls
+
+
+@pattern
+def micro_service(cls: Any) -> Any:
+    # Microservice Architecture pattern or Microservices. The idea is that we can build an application as a set of
+    # loosely coupled, collaborating services. In this architectural style.
+    # Services can be developed and deployed independently of one another.
+    # Described in Mastering Python Design Patterns - Second Edition book by Kamon Ayeva, Sakis Kasampalis
+    return cls
+
+# endregion
@@ -0,0 +1,134 @@
+import functools
+import threading
+import weakref
+from typing import Any, Callable, Optional
+
+from ._common import _KWARGS_MARK, _base_call, _default_key, _fields, _with_call, _with_slots
+from ._patterns import gof_pattern, structural
+
+
+# region Structural Patterns
+@structural
+@gof_pattern
+def adapter(cls: Any) -> Any:
+    # Converts the interface of a class into another interface expected by a client.
+    return cls
+
+
+wrapper = adapter
+
+
+translator = adapter
+
+
+@structural
+@gof_pattern
+def bridge(cls: Any) -> Any:
+    # Decouples an abstraction from its implementation, which allows the two to vary independently.
+    return cls
+
+
+@structural
+@gof_pattern
+def composite(cls: Any) -> Any:
+    #  This composes from the hierarchies of more basic objects.
+    return cls
+
+
+@structural
+@gof_pattern
+def decorator(cls: Any) -> Any:
+    # Allows an object to take additional responsibilities, in addition to its original interface. Decorators are an
+    # alternative to subclassing for an extending functionality.
+    return cls
+
+
+@structural
+@gof_pattern
+def facade(cls: Any) -> Any:
+    # Combines a set of interfaces exposed by subsystems into a simpler interface that is easier to use.
+    return cls
+
+
+@structural
+@gof_pattern
+def flyweight(cls: Any = None, *, slots: bool = False, key: Optional[Callable] = None) -> Any:
+    # Uses data-sharing to efficiently support large numbers of similar objects.
+    # Calling the class returns the existing instance built with the same arguments (key(*args, **kwargs), by default
+    # the arguments themselves) as long as it is in use: instances are interned in a weak value table, so they must not
+    # be modified after construction. With slots=True the class is also rebuilt with __slots__ generated from its
+    # annotations, dropping the per-instance __dict__; annotation defaults are assigned before __init__ runs.
+    if cls is None:
+        return lambda klass: flyweight(klass, slots=slots, key=key)
+    if slots:
+        fields = _fields(cls)
+        defaults = {name: cls.__dict__[name] for name in fields if name in cls.__dict__}
+        cls = _with_slots(cls, fields)
+        if defaults:
+            init = cls.__init__
+
+            @functools.wraps(init)
+            def __init__(self, *args, **kwargs):
+                for name, value in defaults.items():
+                    setattr(self, name, value)
+                init(self, *args, **kwargs)
+            cls.__init__ = __init__
+    instances = weakref.WeakValueDictionary()
+    lock = threading.Lock()
+    base_call = _base_call(cls)
+
+    def __call__(klass, *args, **kwargs):
+        if key is not None:
+            instance_key = key(*args, **kwargs)
+        else:
+            instance_key = _default_key(*args, **kwargs) if kwargs else args
+        if klass is not decorated:
+            instance_key = (_KWARGS_MARK, klass, instance_key)
+        instance = instances.get(instance_key)
+        if instance is None:
+            with lock:
+                instance = instances.get(instance_key)
+                if instance is None:
+                    instance = instances[instance_key] = base_call(klass, *args, **kwargs)
+        return instance
+
+    decorated = _with_call(cls, __call__)
+    return decorated
+
+
+@structural
+@gof_pattern
+def proxy(cls: Any) -> Any:
+    # Provides a replacement for another object so it can control access to.
+    return cls
+
+
+@structural
+def extension_object(cls: Any) -> Any:
+    # Allows adding of a functionality to a hierarchy without changing that hierarchy.
+    return cls
+
+
+@structural
+def front_controller(cls: Any) -> Any:
+    # Used when designing web applications and provides a centralized entry point for request handling.
+    return cls
+
+
+@structural
+def marker(cls: Any) -> Any:
+    # This allows us to associate metadata with a class.
+    return cls
+
+
+@structural
+def module(cls: Any) -> Any:
+    # Groups several related elements into one conceptual entity.
+    return cls
+
+
+@structural
+def twin(cls: Any) -> Any:
+    # Helps simulating multiple inheritance in programming languages that don't support this feature.
+    return cls
+# endregion
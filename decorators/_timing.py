@@ -0,0 +1,406 @@
+import functools
+import inspect
+import random
+import sys
+import threading
+import weakref
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+from ._common import _qualified_name
+from ._documentation import url
+
+
+# region Decorators
+_SUB_BITS = 5
+_NO_MIN = 1 << 64
+
+
+def _bucket_index(value: int) -> int:
+    # Log-linear (HDR style) bucketing: values below 2 ** (_SUB_BITS + 1) get their own bucket, above that every power
+    # of two is split in 2 ** _SUB_BITS linear buckets, which bounds the relative error to about 3%.
+    shift = value.bit_length() - _SUB_BITS - 1
+    if shift <= 0:
+        return value
+    return (shift << _SUB_BITS) + (value >> shift)
+
+
+def _bucket_value(index: int) -> int:
+    # Midpoint of the values that fall in the bucket with the given index.
+    shift = (index >> _SUB_BITS) - 1
+    if shift <= 0:
+        return index
+    low = (index - (shift << _SUB_BITS)) << shift
+    return low + ((1 << shift) >> 1)
+
+
+class _Histogram:
+    # Sparse log-bucketed histogram used to compute percentiles of recorded latencies (or any non-negative integers).
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = _NO_MIN
+        self.max = 0
+
+    def record(self, value: int):
+        # Same as counts[_bucket_index(value)] += 1, inlined as this runs on every timed call.
+        shift = value.bit_length() - _SUB_BITS - 1
+        index = value if shift <= 0 else (shift << _SUB_BITS) + (value >> shift)
+        counts = self.counts
+        try:
+            counts[index] += 1
+        except KeyError:
+            counts[index] = 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if value < self.min:
+            self.min = value
+
+    def merge(self, other: "_Histogram"):
+        if not other.count:
+            return
+        counts = self.counts
+        for index, count in list(other.counts.items()):
+            counts[index] = counts.get(index, 0) + count
+        if other.min < self.min:
+            self.min = other.min
+        if other.max > self.max:
+            self.max = other.max
+        self.count += other.count
+        self.total += other.total
+
+    def percentile(self, q: float) -> int:
+        if not self.count:
+            return 0
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(max(_bucket_value(index), self.min), self.max)
+        return self.max
+
+    def summary(self, unit: str = "ns") -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            f"total_{unit}": self.total,
+            f"min_{unit}": self.min if self.count else 0,
+            f"max_{unit}": self.max,
+            f"mean_{unit}": self.total / self.count if self.count else 0.0,
+            f"p50_{unit}": self.percentile(0.5),
+            f"p99_{unit}": self.percentile(0.99),
+            f"p999_{unit}": self.percentile(0.999),
+        }
+
+
+class _TimingShard(_Histogram):
+    # Per-thread part of the timings of a function. calls counts every call, including the ones skipped by sampling.
+    __slots__ = ("calls",)
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+
+class _TimingStats:
+    # Aggregated timings of one @timed function. Every thread records into its own histogram (shard), so the hot path
+    # takes no lock; shards are merged only when a snapshot is taken.
+    def __init__(self, name: str, sampled: bool = False):
+        self.name = name
+        self.local = threading.local()
+        self.sampled = sampled
+        self.started = perf_counter_ns()
+        self._shards: List[_TimingShard] = []
+        self._lock = threading.Lock()
+
+    def new_shard(self) -> _TimingShard:
+        shard = _TimingShard()
+        with self._lock:
+            self._shards.append(shard)
+        self.local.shard = shard
+        return shard
+
+    def snapshot(self) -> Dict[str, Any]:
+        # When sampling, the totals are extrapolated from the timed calls to all calls, percentiles and mean are those
+        # of the sample.
+        histogram = _Histogram()
+        calls = 0
+        with self._lock:
+            shards = list(self._shards)
+        for shard in shards:
+            histogram.merge(shard)
+            calls += shard.calls
+        summary = histogram.summary()
+        samples = summary.pop("count")
+        if not self.sampled:
+            calls = samples
+        if samples:
+            summary["total_ns"] = round(summary["total_ns"] * calls / samples)
+        elapsed = (perf_counter_ns() - self.started) / 10 ** 9
+        summary.update(calls=calls, samples=samples, calls_per_sec=calls / elapsed if elapsed else 0.0)
+        return summary
+
+    def reset(self):
+        # Shards stay registered with their threads, so they are cleared in place.
+        with self._lock:
+            for shard in self._shards:
+                shard.__init__()
+            self.started = perf_counter_ns()
+
+
+# The stats are held by their wrappers only, and leave the registry with them (closures made per request, ...).
+_timings: "weakref.WeakValueDictionary[str, _TimingStats]" = weakref.WeakValueDictionary()
+_timing_names: Dict[str, int] = {}
+_timings_lock = threading.Lock()
+
+
+def _timing_stats(name: str, sampled: bool = False) -> _TimingStats:
+    # Registers the timings of one @timed wrapper. Wrappers of functions sharing a qualified name (closures made by the
+    # same code, or a function decorated twice) are kept apart, as "<name> #2", "<name> #3", ... numbered by a counter
+    # per name.
+    with _timings_lock:
+        number = _timing_names[name] = _timing_names.get(name, 0) + 1
+        unique = name if number == 1 else f"{name} #{number}"
+        stats = _timings[unique] = _TimingStats(unique, sampled)
+    return stats
+
+
+def _timed_sampler(stats: _TimingStats, sample_rate: Optional[float],
+                   every_n: Optional[int]) -> Callable[[], Optional[_TimingShard]]:
+    # Returns a function giving the shard to record the current call into, or None when sampling skips the call.
+    local = stats.local
+    rand = random.random
+    sampled = sample_rate is not None or every_n is not None
+
+    def take() -> Optional[_TimingShard]:
+        try:
+            shard = local.shard
+        except AttributeError:
+            shard = stats.new_shard()
+        if sampled:
+            shard.calls += 1
+            if (shard.calls - 1) % every_n if every_n else rand() >= sample_rate:
+                return None
+        return shard
+    return take
+
+
+def _no_clock() -> int:
+    return 0
+
+
+def _timed_suspendable(func: Callable, stats: _TimingStats, take: Callable[[], Optional[_TimingShard]],
+                       verbose: bool) -> Callable:
+    # Timing wrappers for coroutine functions, generators and async generators. The wrapper is of the same kind as func,
+    # so inspect and asyncio still recognize it. Coroutines are timed over the full await. Generators are timed while
+    # they produce their items, each step (next, send, throw, __anext__, ...) is timed on its own and a call records
+    # their sum, leaving out the time the consumer holds an item; the first step is also recorded, as
+    # "<name> (first item)".
+    def finish(shard: _TimingShard, elapsed: int):
+        shard.record(elapsed)
+        if verbose:
+            print(f"Elapsed Time = {elapsed / 10 ** 9}")
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def new_function(*args, **kwargs):
+            shard = take()
+            if shard is None:
+                return await func(*args, **kwargs)
+            start = perf_counter_ns()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                finish(shard, perf_counter_ns() - start)
+        return new_function
+
+    first_item = _timing_stats(f"{stats.name} (first item)")
+    first_local = first_item.local
+
+    def first_shard() -> _TimingShard:
+        try:
+            return first_local.shard
+        except AttributeError:
+            return first_item.new_shard()
+
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def new_function(*args, **kwargs):
+            shard = take()
+            if shard is None:
+                return (yield from func(*args, **kwargs))
+            start = perf_counter_ns()
+            elapsed = 0
+            try:
+                generator = func(*args, **kwargs)
+                item = next(generator)
+                elapsed = perf_counter_ns() - start
+                start = None
+                first_shard().record(elapsed)
+                while True:
+                    try:
+                        sent = yield item
+                    except GeneratorExit:
+                        start = perf_counter_ns()
+                        generator.close()
+                        raise
+                    except BaseException as exc:
+                        start = perf_counter_ns()
+                        item = generator.throw(exc)
+                    else:
+                        start = perf_counter_ns()
+                        item = generator.send(sent)
+                    elapsed += perf_counter_ns() - start
+                    start = None
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                # The step that ended the generator, by returning, raising or closing it.
+                if start is not None:
+                    elapsed += perf_counter_ns() - start
+                finish(shard, elapsed)
+        return new_function
+
+    @functools.wraps(func)
+    async def new_function(*args, **kwargs):
+        shard = take()
+        generator = func(*args, **kwargs)
+        # Calls skipped by sampling do not read the clock.
+        clock = _no_clock if shard is None else perf_counter_ns
+        start = clock()
+        elapsed = 0
+        try:
+            item = await generator.__anext__()
+            elapsed = clock() - start
+            start = None
+            if shard is not None:
+                first_shard().record(elapsed)
+            while True:
+                try:
+                    sent = yield item
+                except GeneratorExit:
+                    start = clock()
+                    await generator.aclose()
+                    raise
+                except BaseException as exc:
+                    start = clock()
+                    item = await generator.athrow(exc)
+                else:
+                    start = clock()
+                    item = await generator.asend(sent)
+                elapsed += clock() - start
+                start = None
+        except StopAsyncIteration:
+            return
+        finally:
+            if shard is not None:
+                if start is not None:
+                    elapsed += clock() - start
+                finish(shard, elapsed)
+    return new_function
+
+
+@url("https://www.codementor.io/sheena/advanced-use-python-decorators-class-function-du107nxsv")
+@url("https://stackoverflow.com/questions/1938048/high-precision-clock-in-python")
+def timed(func: Callable = None, *, sample_rate: Optional[float] = None, every_n: Optional[int] = None,
+          verbose: bool = False) -> Callable:
+    # Measures the execution time of a function with perf_counter_ns. Timings are aggregated per function (count, sum,
+    # min, max and a log-bucketed histogram for percentiles) and read with timed.snapshot() or timed.report(), nothing
+    # is printed on the hot path unless verbose=True is passed.
+    # To bound the cost on hot paths only a subset of the calls can be timed: a random fraction of them with
+    # sample_rate=0.01, or every n-th call (per thread, starting with the first one) with every_n=1000. Calls that are
+    # not timed do not read the clock.
+    if func is None:
+        return lambda function: timed(function, sample_rate=sample_rate, every_n=every_n, verbose=verbose)
+    if sample_rate is not None and every_n is not None:
+        raise ValueError("sample_rate and every_n are mutually exclusive")
+    if sample_rate is not None and not 0 < sample_rate <= 1:
+        raise ValueError("sample_rate must be in (0, 1]")
+    if every_n is not None and every_n < 1:
+        raise ValueError("every_n must be a positive integer")
+
+    stats = _timing_stats(_qualified_name(func), sample_rate is not None or every_n is not None)
+    local = stats.local
+
+    if inspect.iscoroutinefunction(func) or inspect.isgeneratorfunction(func) or inspect.isasyncgenfunction(func):
+        new_function = _timed_suspendable(func, stats, _timed_sampler(stats, sample_rate, every_n), verbose)
+    elif sample_rate is None and every_n is None:
+        @functools.wraps(func)
+        def new_function(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = perf_counter_ns() - start
+                try:
+                    shard = local.shard
+                except AttributeError:
+                    shard = stats.new_shard()
+                shard.record(elapsed)
+                if verbose:
+                    print(f"Elapsed Time = {elapsed / 10 ** 9}")
+    else:
+        rand = random.random
+
+        @functools.wraps(func)
+        def new_function(*args, **kwargs):
+            try:
+                shard = local.shard
+            except AttributeError:
+                shard = stats.new_shard()
+            shard.calls += 1
+            if (shard.calls - 1) % every_n if every_n else rand() >= sample_rate:
+                return func(*args, **kwargs)
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = perf_counter_ns() - start
+                shard.record(elapsed)
+                if verbose:
+                    print(f"Elapsed Time = {elapsed / 10 ** 9}")
+
+    new_function.__timed__ = stats
+    return new_function
+
+
+def _timed_snapshot(func: Optional[Callable] = None) -> Dict[str, Any]:
+    # Statistics of one @timed function, or of all of them keyed by qualified name (numbered when several functions
+    # share it). Times are in nanoseconds.
+    if func is not None:
+        return func.__timed__.snapshot()
+    with _timings_lock:
+        stats = list(_timings.values())
+    return {item.name: item.snapshot() for item in stats}
+
+
+def _timed_report(file: Optional[TextIO] = None):
+    # Prints a one line summary per @timed function that was called at least once.
+    file = file or sys.stdout
+    for name, item in sorted(_timed_snapshot().items()):
+        if not item["samples"]:
+            continue
+        print(f"{name}: calls={item['calls']} samples={item['samples']} mean={item['mean_ns'] / 1000:.3f}us "
+              f"p50={item['p50_ns'] / 1000:.3f}us p99={item['p99_ns'] / 1000:.3f}us "
+              f"p999={item['p999_ns'] / 1000:.3f}us max={item['max_ns'] / 1000:.3f}us", file=file)
+
+
+def _timed_reset(func: Optional[Callable] = None):
+    if func is not None:
+        func.__timed__.reset()
+        return
+    with _timings_lock:
+        stats = list(_timings.values())
+    for item in stats:
+        item.reset()
+
+
+timed.snapshot = _timed_snapshot
+timed.report = _timed_report
+timed.reset = _timed_reset
+# endregion
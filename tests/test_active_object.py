@@ -0,0 +1,126 @@
+import asyncio
+import threading
+
+import pytest
+
+from decorators import active_object, batched
+
+
+@active_object
+class Ledger:
+    def __init__(self):
+        self.entries = []
+        self.runs = 0
+        self.threads = set()
+
+    @batched
+    def record(self, entries):
+        self.runs += 1
+        self.threads.add(threading.get_ident())
+        self.entries.extend(entries)
+        return [len(self.entries) - len(entries) + index for index in range(len(entries))]
+
+    def record_twice(self, entry):
+        # Calls made by the object itself run directly, a batched one as a batch of one call.
+        return [self.record(entry), self.record(entry)]
+
+    def size(self):
+        return len(self.entries)
+
+
+def test_calls_return_futures_and_run_on_the_scheduler():
+    ledger = Ledger()
+    futures = [ledger.record(entry) for entry in range(10)]
+    assert [future.result(5) for future in futures] == list(range(10))
+    assert ledger.size().result(5) == 10
+    assert threading.get_ident() not in ledger.threads
+    active_object.stop(ledger)
+
+
+def test_batched_method_called_by_the_object_itself():
+    ledger = Ledger()
+    assert ledger.record_twice("a").result(5) == [0, 1]
+    assert ledger.size().result(5) == 2
+    active_object.stop(ledger)
+
+
+def test_batched_calls_take_a_single_argument():
+    ledger = Ledger()
+    with pytest.raises(TypeError):
+        ledger.record(1, 2)
+    active_object.stop(ledger)
+
+
+def test_errors_reach_the_future():
+    @active_object
+    class Failing:
+        def fail(self):
+            raise KeyError("missing")
+
+    with pytest.raises(KeyError):
+        Failing().fail().result(5)
+
+
+def test_asyncio_batched_method_called_by_the_object_itself():
+    @active_object(kind="asyncio")
+    class Counter:
+        def __init__(self):
+            self.values = []
+
+        @batched
+        async def add(self, values):
+            await asyncio.sleep(0)
+            self.values.extend(values)
+            return [value * 10 for value in values]
+
+        async def add_twice(self, value):
+            return [await self.add(value), await self.add(value + 1)]
+
+    async def main():
+        counter = Counter()
+        first = await counter.add_twice(1)
+        queued = await asyncio.gather(counter.add(5), counter.add(6))
+        return first, queued, counter.values
+
+    assert asyncio.run(main()) == ([10, 20], [50, 60], [1, 2, 5, 6])
+
+
+def test_queued_batched_calls_are_merged():
+    @active_object
+    class Journal:
+        def __init__(self):
+            self.batches = []
+
+        def wait(self, event):
+            event.wait(5)
+
+        @batched(max_batch=4)
+        def write(self, lines):
+            self.batches.append(list(lines))
+            return [line.upper() for line in lines]
+
+    journal = Journal()
+    event = threading.Event()
+    journal.wait(event)
+    futures = [journal.write(line) for line in "abcdef"]
+    event.set()
+    assert [future.result(5) for future in futures] == list("ABCDEF")
+    assert journal.batches == [list("abcd"), list("ef")]
+    active_object.stop(journal)
+
+
+def test_on_complete():
+    done = []
+
+    @active_object(on_complete=done.append)
+    class Worker:
+        def work(self, value):
+            return value * 2
+
+    worker = Worker()
+    other = []
+    assert worker.work(2).result(5) == 4
+    worker.work(3, on_complete=other.append).result(5)
+    active_object.stop(worker)
+    assert [future.result() for future in done] == [4]
+    assert [future.result() for future in other] == [6]
@@ -0,0 +1,130 @@
+import asyncio
+import threading
+
+import pytest
+
+from decorators import MemoryBackend, cache_aside
+
+
+def test_hits_after_the_first_call():
+    calls = []
+
+    @cache_aside(maxsize=8)
+    def square(value):
+        calls.append(value)
+        return value * value
+
+    assert [square(3), square(3), square(4)] == [9, 9, 16]
+    assert calls == [3, 4]
+    square.invalidate(3)
+    assert square(3) == 9
+    assert calls == [3, 4, 3]
+    stats = square.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 3)
+
+
+def test_concurrent_misses_load_once():
+    release = threading.Event()
+    calls = []
+
+    @cache_aside
+    def slow(value):
+        calls.append(value)
+        release.wait(5)
+        return value
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(slow(1))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while slow.stats()["coalesced"] < 3:
+        threading.Event().wait(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == [1, 1, 1, 1]
+    assert calls == [1]
+
+
+def test_async_concurrent_misses_load_once():
+    calls = []
+
+    @cache_aside
+    async def fetch(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value * 2
+
+    async def main():
+        return await asyncio.gather(*(fetch(5) for _ in range(5)))
+
+    assert asyncio.run(main()) == [10] * 5
+    assert calls == [5]
+    assert fetch.stats()["coalesced"] == 4
+
+
+def test_cancelled_leader_does_not_cancel_the_followers():
+    calls = []
+    release = None
+
+    @cache_aside
+    async def fetch(value):
+        calls.append(value)
+        await release.wait()
+        return value * 2
+
+    async def main():
+        nonlocal release
+        release = asyncio.Event()
+        leader = asyncio.create_task(fetch(1))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(fetch(1))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower, await fetch(1)
+
+    assert asyncio.run(main()) == (2, 2)
+    assert calls == [1]
+
+
+def test_async_errors_reach_every_caller_and_are_not_cached():
+    calls = []
+
+    @cache_aside
+    async def fetch(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        raise LookupError(value)
+
+    async def main():
+        return await asyncio.gather(fetch(1), fetch(1), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, LookupError) for result in results)
+    with pytest.raises(LookupError):
+        asyncio.run(fetch(1))
+    assert calls == [1, 1]
+    assert fetch.stats()["errors"] == 2
+
+
+def test_clear_only_drops_the_entries_of_its_function():
+    backend = MemoryBackend()
+
+    @cache_aside(backend=backend)
+    def users(user_id):
+        return f"user {user_id}"
+
+    @cache_aside(backend=backend)
+    def orders(order_id):
+        return f"order {order_id}"
+
+    users(1)
+    orders(1)
+    users.clear()
+    assert len(backend) == 1
+    orders(1)
+    assert orders.stats()["hits"] == 1
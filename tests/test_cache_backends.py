@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from decorators import DiskBackend, MemoryBackend, SharedMemoryBackend
+
+
+@pytest.fixture(params=["memory", "shared", "disk"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryBackend()
+    elif request.param == "shared":
+        backend = SharedMemoryBackend(str(tmp_path / "cache"), slots=64, slot_size=256)
+        yield backend
+        backend.close()
+    else:
+        yield DiskBackend(str(tmp_path / "cache.db"))
+
+
+def test_get_set_delete(backend):
+    assert backend.get("missing", 0) == 0
+    backend.set("a", [1, 2])
+    backend.set(("b", 1), "b1")
+    assert backend.get("a") == [1, 2]
+    assert backend.get(("b", 1)) == "b1"
+    backend.delete("a")
+    assert backend.get("a") is None
+    backend.clear()
+    assert backend.get(("b", 1)) is None
+
+
+def test_expired_entries_are_missing(backend):
+    backend.set("a", 1, ttl=-1)
+    assert backend.get("a", "expired") == "expired"
+
+
+def test_shared_memory_refuses_a_file_open_to_other_users(tmp_path):
+    path = tmp_path / "cache"
+    path.write_bytes(b"")
+    os.chmod(path, 0o666)
+    with pytest.raises(PermissionError):
+        SharedMemoryBackend(str(path))
+
+
+def test_shared_memory_does_not_follow_symbolic_links(tmp_path):
+    target = tmp_path / "target"
+    target.write_bytes(b"")
+    os.chmod(target, 0o600)
+    os.symlink(target, tmp_path / "cache")
+    with pytest.raises(OSError):
+        SharedMemoryBackend(str(tmp_path / "cache"))
+
+
+def test_shared_memory_is_shared_between_instances(tmp_path):
+    first = SharedMemoryBackend(str(tmp_path / "cache"), slots=64, slot_size=256)
+    second = SharedMemoryBackend(str(tmp_path / "cache"), slots=64, slot_size=256)
+    try:
+        assert os.stat(tmp_path / "cache").st_mode & 0o777 == 0o600
+        first.set("key", {"value": 1})
+        assert second.get("key") == {"value": 1}
+    finally:
+        first.close()
+        second.close()
+
+
+def test_clear_with_a_prefix_keeps_the_other_keys(backend):
+    backend.set(("app.users", (1,)), "user 1")
+    backend.set(("app.users", (2,)), "user 2")
+    backend.set(("app.orders", (1,)), "order 1")
+    backend.set("plain", "value")
+    backend.clear("app.users")
+    assert backend.get(("app.users", (1,))) is None
+    assert backend.get(("app.users", (2,))) is None
+    assert backend.get(("app.orders", (1,))) == "order 1"
+    assert backend.get("plain") == "value"
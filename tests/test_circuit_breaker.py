@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from decorators import CircuitBreaker, CircuitOpenError, circuit_breaker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def half_open_breaker(clock: Clock) -> CircuitBreaker:
+    breaker = CircuitBreaker(minimum_calls=1, open_duration=5.0, failure_on=ConnectionError, clock=clock)
+    breaker.record(True, None)
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 10
+    return breaker
+
+
+def test_opens_and_fails_fast():
+    clock = Clock()
+    breaker = CircuitBreaker(minimum_calls=2, failure_rate=0.5, failure_on=ConnectionError, clock=clock)
+
+    @circuit_breaker(breaker=breaker)
+    def call():
+        raise ConnectionError()
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            call()
+    with pytest.raises(CircuitOpenError):
+        call()
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_successful_trial_closes():
+    clock = Clock()
+    breaker = half_open_breaker(clock)
+    assert circuit_breaker(lambda: 1, breaker=breaker)() == 1
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_trial_raising_other_exception_releases_half_open():
+    clock = Clock()
+    breaker = half_open_breaker(clock)
+
+    @circuit_breaker(breaker=breaker)
+    def call(value):
+        if value is None:
+            raise ValueError("bad argument")
+        return value
+
+    with pytest.raises(ValueError):
+        call(None)
+    # Not a failure of the dependency: the trial went through and the breaker closed.
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert call(2) == 2
+
+
+def test_cancelled_trial_gives_its_slot_back():
+    clock = Clock()
+    breaker = half_open_breaker(clock)
+
+    @circuit_breaker(breaker=breaker)
+    async def call(delay):
+        await asyncio.sleep(delay)
+        return delay
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(call(10), 0.01)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        return await call(0)
+
+    assert asyncio.run(main()) == 0
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_every_trial_must_succeed():
+    clock = Clock()
+    breaker = CircuitBreaker(minimum_calls=1, open_duration=5.0, half_open_calls=2, failure_on=ConnectionError,
+                             clock=clock)
+    breaker.record(True, None)
+    clock.now += 10
+    first, second = breaker.admit(clock()), breaker.admit(clock())
+    assert first is not None and second is not None
+    assert breaker.admit(clock()) is None
+    breaker.record(False, None, first)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.record(True, None, second)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.stats()["opened"] == 2
+
+
+def test_trials_close_once_all_succeeded():
+    clock = Clock()
+    breaker = CircuitBreaker(minimum_calls=1, open_duration=5.0, half_open_calls=2, failure_on=ConnectionError,
+                             clock=clock)
+    breaker.record(True, None)
+    clock.now += 10
+    first, second = breaker.admit(clock()), breaker.admit(clock())
+    breaker.record(False, None, second)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.record(False, None, first)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_outcome_of_call_admitted_before_opening_is_ignored():
+    clock = Clock()
+    breaker = CircuitBreaker(minimum_calls=1, open_duration=5.0, failure_on=ConnectionError, clock=clock)
+    stale = breaker.period
+    breaker.record(True, None)
+    clock.now += 10
+    trial = breaker.admit(clock())
+    # A slow call admitted while closed succeeds during the half open period: it is not the trial.
+    breaker.record(False, None, stale)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.release(stale)
+    assert breaker.admit(clock()) is None
+    breaker.record(False, None, trial)
+    assert breaker.state == CircuitBreaker.CLOSED
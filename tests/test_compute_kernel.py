@@ -0,0 +1,54 @@
+import pytest
+
+from decorators import compute_kernel
+
+
+@compute_kernel
+def square(index):
+    return index * index
+
+
+@compute_kernel(vectorized=True, workers=2)
+def doubled(chunk):
+    return [item * 2 for item in chunk]
+
+
+def test_function_is_returned_unchanged():
+    assert square(3) == 9
+    assert callable(square.map)
+
+
+def test_map_keeps_the_order():
+    assert square.map(range(100), workers=2) == [index * index for index in range(100)]
+
+
+def test_map_of_a_sequence_and_an_iterator():
+    assert square.map([3, 1, 2], workers=2, chunksize=1) == [9, 1, 4]
+    assert square.map(iter(range(5)), workers=2, chunksize=2) == [0, 1, 4, 9, 16]
+
+
+def test_single_worker_runs_in_process():
+    assert square.map(range(4), workers=1) == [0, 1, 4, 9]
+
+
+def test_vectorized():
+    assert doubled.map(range(10), chunksize=3) == [item * 2 for item in range(10)]
+
+
+def test_numpy_arrays_are_shared():
+    numpy = pytest.importorskip("numpy")
+    items = numpy.arange(1000, dtype=numpy.int64)
+    results = square.map(items, workers=2)
+    assert isinstance(results, numpy.ndarray)
+    assert (results == items * items).all()
+    halves = doubled.map(items, dtype=numpy.float64)
+    assert halves.dtype == numpy.float64
+    assert (halves == items * 2).all()
+
+
+def test_class_stays_a_marker():
+    @compute_kernel
+    class Kernel:
+        pass
+
+    assert isinstance(Kernel(), Kernel)
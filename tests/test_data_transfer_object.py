@@ -0,0 +1,97 @@
+import copy
+import pickle
+
+import pytest
+
+from decorators import dto
+
+
+@dto(frozen=True)
+class Point:
+    x: int
+    y: float = 0.0
+
+
+@dto(frozen=True)
+class Point3(Point):
+    z: float = 0.0
+
+
+@dto
+class Order:
+    id: int
+    lines: list = None
+
+
+def test_frozen_records_block_assignment():
+    point = Point(1, 2.0)
+    with pytest.raises(AttributeError):
+        point.x = 2
+    with pytest.raises(AttributeError):
+        del point.y
+    assert hash(point) == hash(Point(1, 2.0))
+
+
+@pytest.mark.parametrize("record", [Point(1, 2.0), Point3(1, 2.0, 3.0), Order(1, [2])])
+def test_pickle_and_copy_round_trip(record):
+    for clone in (pickle.loads(pickle.dumps(record)), copy.copy(record), copy.deepcopy(record)):
+        assert type(clone) is type(record)
+        assert clone == record
+        assert clone.to_tuple() == record.to_tuple()
+
+
+def test_methods_written_in_the_class_are_kept():
+    @dto(frozen=True)
+    class Money:
+        amount: int
+        currency: str = "EUR"
+
+        def __repr__(self):
+            return f"{self.amount} {self.currency}"
+
+        def __eq__(self, other):
+            return isinstance(other, Money) and self.amount == other.amount
+
+        def __hash__(self):
+            return hash(self.amount)
+
+    assert repr(Money(5)) == "5 EUR"
+    assert Money(5, "EUR") == Money(5, "USD")
+    assert hash(Money(5, "EUR")) == hash(5)
+    assert Money(5).to_dict() == {"amount": 5, "currency": "EUR"}
+
+
+def test_eq_without_hash_is_not_hashable():
+    @dto
+    class Tag:
+        name: str
+
+        def __eq__(self, other):
+            return isinstance(other, Tag) and self.name.lower() == other.name.lower()
+
+    assert Tag("a") == Tag("A")
+    assert Tag.__hash__ is None
+
+
+class Outer:
+    @dto(frozen=True)
+    class Inner:
+        value: int
+
+
+def test_nested_record_keeps_its_qualified_name():
+    inner = Outer.Inner(1)
+    assert Outer.Inner.__qualname__ == "Outer.Inner"
+    assert repr(inner) == "Outer.Inner(value=1)"
+    assert pickle.loads(pickle.dumps(inner)) == inner
+
+
+def test_field_named_self():
+    @dto
+    class Node:
+        self: str
+        parent: str = None
+
+    node = Node("a", parent="b")
+    assert (node.self, node.parent) == ("a", "b")
+    assert Node(self="c").to_dict() == {"self": "c", "parent": None}
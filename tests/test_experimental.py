@@ -0,0 +1,89 @@
+import asyncio
+import warnings
+
+import pytest
+
+from decorators import ExperimentalWarning, experimental, singleton
+
+
+@experimental
+def preview():
+    return "preview"
+
+
+@experimental(count=True)
+async def preview_async():
+    return "preview"
+
+
+def test_warns_once_at_the_calling_line_then_restores_the_function():
+    with pytest.warns(ExperimentalWarning) as caught:
+        assert preview() == "preview"
+    assert caught[0].filename == __file__
+    assert not hasattr(globals()["preview"], "__wrapped__")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert preview() == "preview"
+
+
+def test_class_wrapped_by_another_decorator_points_at_the_caller():
+    @singleton
+    @experimental
+    class Tray:
+        pass
+
+    with pytest.warns(ExperimentalWarning) as caught:
+        Tray()
+    assert caught[0].filename == __file__
+    assert "Tray" in str(caught[0].message)
+
+
+def test_per_call_site():
+    @experimental(per_call_site=True)
+    def feature():
+        pass
+
+    with pytest.warns(ExperimentalWarning) as caught:
+        for _ in range(3):
+            feature()
+        feature()
+    assert len(caught) == 2
+
+
+def test_coroutine_warns_once():
+    @experimental
+    async def feature():
+        return 1
+
+    async def main():
+        return [await feature() for _ in range(3)]
+
+    with pytest.warns(ExperimentalWarning) as caught:
+        assert asyncio.run(main()) == [1, 1, 1]
+    assert len(caught) == 1
+    assert caught[0].filename == __file__
+
+
+def test_coroutine_calls_are_counted():
+    async def main():
+        for _ in range(3):
+            await preview_async()
+
+    with pytest.warns(ExperimentalWarning):
+        asyncio.run(main())
+    counts = experimental.counts()[f"{__name__}.preview_async"]
+    assert sum(counts.values()) == 3
+    assert all(site.startswith(__file__) for site in counts)
+
+
+def test_function_defined_again_warns_again():
+    def define():
+        @experimental
+        def feature():
+            pass
+        return feature
+
+    for _ in range(2):
+        feature = define()
+        with pytest.warns(ExperimentalWarning):
+            feature()
@@ -0,0 +1,94 @@
+import gc
+import weakref
+
+import pytest
+
+from decorators import flyweight
+
+
+@flyweight(slots=True)
+class Glyph:
+    char: str
+    font: str = "serif"
+
+    def __init__(self, char, font=None):
+        self.char = char
+        if font is not None:
+            self.font = font
+
+
+class Base:
+    def describe(self):
+        return "base"
+
+
+@flyweight(slots=True)
+class Styled(Base):
+    style: str
+
+    def __init__(self, style):
+        self.style = style
+
+    def describe(self):
+        return f"{super().describe()} {self.style}"
+
+
+def test_instances_built_with_the_same_arguments_are_shared():
+    @flyweight
+    class Color:
+        def __init__(self, name):
+            self.name = name
+
+    red = Color("red")
+    assert Color("red") is red
+    assert Color("blue") is not red
+
+
+def test_unused_instances_are_dropped():
+    @flyweight
+    class Color:
+        def __init__(self, name):
+            self.name = name
+
+    red = weakref.ref(Color("red"))
+    gc.collect()
+    assert red() is None
+    assert Color("red").name == "red"
+
+
+def test_custom_key():
+    @flyweight(key=lambda name: name.lower())
+    class Color:
+        def __init__(self, name):
+            self.name = name
+
+    assert Color("Red") is Color("RED")
+
+
+def test_slots_drop_the_instance_dict():
+    glyph = Glyph("a")
+    assert Glyph("a") is glyph
+    assert not hasattr(glyph, "__dict__")
+    assert glyph.font == "serif"
+    assert Glyph("b", "mono").font == "mono"
+    with pytest.raises(AttributeError):
+        glyph.color = "red"
+
+
+def test_slotted_class_keeps_its_name_and_super():
+    assert Glyph.__qualname__ == "Glyph"
+    assert Styled("bold").describe() == "base bold"
+    assert isinstance(Styled("bold"), Base)
+
+
+def test_subclass_has_its_own_instances():
+    @flyweight
+    class Color:
+        def __init__(self, name):
+            self.name = name
+
+    class Paint(Color):
+        pass
+
+    assert Paint("red") is Paint("red")
+    assert Paint("red") is not Color("red")
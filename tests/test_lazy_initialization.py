@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+
+from decorators import lazy_initialization
+
+
+def test_class_is_constructed_on_first_use():
+    created = []
+
+    @lazy_initialization
+    class Connection:
+        def __init__(self, host):
+            created.append(host)
+            self.host = host
+
+    connection = Connection("db")
+    assert isinstance(connection, Connection)
+    assert created == []
+    assert connection.host == "db"
+    assert connection.host == "db"
+    assert created == ["db"]
+
+
+def test_attribute_is_computed_once_per_instance():
+    class Report:
+        calls = 0
+
+        def __init__(self, rows):
+            self.rows = rows
+
+        @lazy_initialization
+        def total(self):
+            Report.calls += 1
+            return sum(self.rows)
+
+    first, second = Report([1, 2]), Report([3])
+    assert (first.total, first.total, second.total) == (3, 3, 3)
+    assert Report.calls == 2
+    assert first.__dict__["total"] == 3
+
+
+def test_property_is_accepted():
+    class Report:
+        @lazy_initialization
+        @property
+        def total(self):
+            return 42
+
+    assert Report().total == 42
+
+
+def test_first_access_is_thread_safe():
+    calls = []
+
+    class Slow:
+        @lazy_initialization
+        def value(self):
+            calls.append(None)
+            time.sleep(0.01)
+            return object()
+
+    slow = Slow()
+    values = []
+    threads = [threading.Thread(target=lambda: values.append(slow.value)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert all(value is values[0] for value in values)
+
+
+def test_function_outside_a_class_is_computed_on_first_call():
+    calls = []
+
+    @lazy_initialization
+    def settings():
+        calls.append(None)
+        return {"debug": False}
+
+    assert callable(settings)
+    assert settings() is settings()
+    assert len(calls) == 1
+
+
+def test_function_outside_a_class_takes_no_arguments():
+    with pytest.raises(TypeError):
+        @lazy_initialization
+        def scaled(factor):
+            return factor
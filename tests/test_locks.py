@@ -0,0 +1,150 @@
+import threading
+import time
+
+import pytest
+
+from decorators import ReadWriteLock, StripedLock, lock_striping, read_write_lock, reader, striped, writer
+
+
+@read_write_lock
+class Document:
+    def __init__(self):
+        self.text = ""
+        self.readers = 0
+        self.max_readers = 0
+        self.guard = threading.Lock()
+
+    @reader
+    def read(self, delay=0.0):
+        with self.guard:
+            self.readers += 1
+            self.max_readers = max(self.max_readers, self.readers)
+        time.sleep(delay)
+        with self.guard:
+            self.readers -= 1
+        return self.text
+
+    @writer
+    def write(self, text):
+        assert self.readers == 0
+        self.text = text
+        # Writers may read under their write lock.
+        return self.read()
+
+
+def run(*targets):
+    threads = [threading.Thread(target=target) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+
+def test_readers_run_together():
+    document = Document()
+    run(*[lambda: document.read(0.05)] * 4)
+    assert document.max_readers > 1
+
+
+def test_writers_run_alone():
+    document = Document()
+    run(*[lambda: document.read(0.01)] * 3, *[lambda index=index: document.write(str(index)) for index in range(3)])
+    assert document.text in ("0", "1", "2")
+    assert document.write("x") == "x"
+
+
+def test_read_lock_cannot_be_upgraded():
+    lock = ReadWriteLock()
+    with lock.read_lock:
+        with lock.read_lock:
+            with pytest.raises(RuntimeError):
+                lock.acquire_write()
+
+
+def test_writer_preference_holds_new_readers_back():
+    lock = ReadWriteLock(writer_preference=True)
+    events = []
+    lock.acquire_read()
+    writer_thread = threading.Thread(target=lambda: (lock.acquire_write(), events.append("write"),
+                                                     lock.release_write()))
+    writer_thread.start()
+    while not lock._writers_waiting:
+        time.sleep(0.001)
+    reader_thread = threading.Thread(target=lambda: (lock.acquire_read(), events.append("read"), lock.release_read()))
+    reader_thread.start()
+    time.sleep(0.02)
+    assert events == []
+    lock.release_read()
+    writer_thread.join(5)
+    reader_thread.join(5)
+    assert events == ["write", "read"]
+
+
+def test_lock_of():
+    document = Document()
+    assert isinstance(read_write_lock.lock_of(document), ReadWriteLock)
+    assert read_write_lock.lock_of(document) is read_write_lock.lock_of(document)
+
+
+@lock_striping(4)
+class Cache:
+    def __init__(self):
+        self.items = {}
+
+    @striped
+    def put(self, key, value):
+        self.items[key] = value
+
+    @striped
+    def get(self, key, default=None):
+        return self.items.get(key, default)
+
+    @striped
+    def increment(self, key):
+        # Nested call on the same stripe.
+        self.put(key, self.get(key, 0) + 1)
+
+    @striped(key=lambda first, second: min(first, second))
+    def pair(self, first, second):
+        return lock_striping.lock_of(self)(min(first, second))
+
+    @striped(exclusive=True)
+    def clear(self):
+        self.items.clear()
+
+
+def test_key_by_position_or_by_name():
+    cache = Cache()
+    cache.put("a", 1)
+    cache.put(key="b", value=2)
+    assert cache.get(key="a") == 1
+    assert cache.get("b") == 2
+
+
+def test_missing_key_argument():
+    with pytest.raises(TypeError):
+        Cache().put()
+
+
+def test_nested_calls_on_the_same_stripe():
+    cache = Cache()
+    run(*[lambda: [cache.increment("n") for _ in range(100)]] * 4)
+    assert cache.get("n") == 400
+
+
+def test_custom_key_and_exclusive_methods():
+    cache = Cache()
+    stripe = cache.pair(3, 1)
+    assert stripe is lock_striping.lock_of(cache)(1)
+    cache.put("a", 1)
+    cache.clear()
+    assert cache.get("a") is None
+    assert len(lock_striping.lock_of(cache).locks) == 4
+
+
+def test_striped_lock_rounds_up_to_a_power_of_two():
+    locks = StripedLock(5)
+    assert len(locks.locks) == 8
+    assert locks("key") is locks("key")
+    with locks.all():
+        assert all(lock.locked() for lock in locks.locks)
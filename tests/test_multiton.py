@@ -0,0 +1,120 @@
+import gc
+import threading
+
+from decorators import multiton
+
+
+def test_one_instance_per_key():
+    @multiton
+    class Connection:
+        def __init__(self, host, port=5432):
+            self.host = host
+            self.port = port
+
+    assert Connection("a") is Connection("a")
+    assert Connection("a") is not Connection("b")
+    assert Connection("a", port=1) is Connection("a", port=1)
+    assert Connection("a", port=1) is not Connection("a")
+    assert multiton.stats(Connection) == {"size": 3, "hits": 5, "misses": 3, "evictions": 0}
+
+
+def test_custom_key():
+    @multiton(key=lambda host, **options: host.lower())
+    class Connection:
+        def __init__(self, host, **options):
+            self.host = host
+
+    assert Connection("DB", timeout=1) is Connection("db")
+    assert Connection("db").host == "DB"
+
+
+def test_lru_eviction():
+    @multiton(maxsize=2)
+    class Connection:
+        def __init__(self, host):
+            self.host = host
+
+    first = Connection("a")
+    Connection("b")
+    assert Connection("a") is first
+    Connection("c")
+    assert Connection("a") is first
+    assert multiton.stats(Connection)["evictions"] == 1
+    assert multiton.stats(Connection)["size"] == 2
+
+
+def test_weak_instances_are_dropped():
+    @multiton(weak=True)
+    class Connection:
+        def __init__(self, host):
+            self.host = host
+
+    first = Connection("a")
+    assert Connection("a") is first
+    del first
+    gc.collect()
+    assert multiton.stats(Connection)["size"] == 0
+
+
+def test_weak_with_maxsize_keeps_the_most_recent_alive():
+    @multiton(weak=True, maxsize=1)
+    class Connection:
+        def __init__(self, host):
+            self.host = host
+
+    Connection("a")
+    Connection("b")
+    gc.collect()
+    assert multiton.stats(Connection)["size"] == 1
+    assert multiton.stats(Connection)["evictions"] == 1
+
+
+def test_key_is_constructed_once_under_contention():
+    created = []
+    barrier = threading.Barrier(8)
+
+    @multiton
+    class Connection:
+        def __init__(self, host):
+            created.append(host)
+
+    def connect():
+        barrier.wait()
+        return Connection("a")
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(connect())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert created == ["a"]
+    assert all(result is results[0] for result in results)
+
+
+def test_subclass_has_its_own_instances():
+    @multiton
+    class Connection:
+        def __init__(self, host):
+            self.host = host
+
+    class Replica(Connection):
+        pass
+
+    assert Replica("a") is Replica("a")
+    assert Replica("a") is not Connection("a")
+    assert type(Replica("a")) is Replica
+
+
+def test_reset():
+    @multiton
+    class Connection:
+        def __init__(self, host):
+            self.host = host
+
+    first = Connection("a")
+    multiton.reset(Connection)
+    assert Connection("a") is not first
+    second = Connection("a")
+    multiton.reset()
+    assert Connection("a") is not second
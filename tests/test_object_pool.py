@@ -0,0 +1,117 @@
+import asyncio
+import threading
+
+import pytest
+
+from decorators import object_pool
+
+
+class Resource:
+    created = 0
+
+    def __init__(self):
+        Resource.created += 1
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def failing_factory(failures: set):
+    calls = []
+
+    def factory():
+        calls.append(None)
+        if len(calls) in failures:
+            raise ConnectionError(f"call {len(calls)} failed")
+        return Resource()
+
+    return factory
+
+
+def test_acquire_release_reuses_objects():
+    @object_pool(max_size=2)
+    class Connection(Resource):
+        pass
+
+    first = Connection.pool.acquire()
+    Connection.pool.release(first)
+    with Connection.pool.borrow() as second:
+        assert second is first
+    assert Connection.pool.stats()["created"] == 1
+
+
+def test_prefill_creates_min_size_objects():
+    @object_pool(min_size=3, max_size=3)
+    class Connection(Resource):
+        pass
+
+    Connection.pool.acquire()
+    stats = Connection.pool.stats()
+    assert (stats["size"], stats["idle"], stats["created"]) == (3, 2, 3)
+
+
+def test_factory_failure_during_prefill_returns_every_reservation():
+    @object_pool(min_size=3, max_size=3, factory=failing_factory({2}))
+    class Connection(Resource):
+        pass
+
+    with pytest.raises(ConnectionError):
+        Connection.pool.acquire()
+    stats = Connection.pool.stats()
+    assert stats["size"] == stats["idle"] == 1
+    # The pool is not stuck: all three objects can be taken.
+    items = [Connection.pool.acquire(timeout=0.5) for _ in range(3)]
+    assert len({id(item) for item in items}) == 3
+
+
+def test_factory_failure_hands_the_slot_to_a_waiter():
+    @object_pool(max_size=1, factory=failing_factory({2}))
+    class Connection(Resource):
+        pass
+
+    Connection.pool.discard(Connection.pool.acquire())
+    with pytest.raises(ConnectionError):
+        Connection.pool.acquire()
+    assert Connection.pool.acquire(timeout=0.5) is not None
+
+
+def test_acquire_timeout():
+    @object_pool(max_size=1)
+    class Connection(Resource):
+        pass
+
+    item = Connection.pool.acquire()
+    with pytest.raises(TimeoutError):
+        Connection.pool.acquire(timeout=0.05)
+    assert Connection.pool.stats()["waiting"] == 0
+    threading.Timer(0.05, Connection.pool.release, (item,)).start()
+    assert Connection.pool.acquire(timeout=5) is item
+
+
+def test_acquire_async_timeout():
+    @object_pool(max_size=1)
+    class Connection(Resource):
+        pass
+
+    async def main():
+        item = await Connection.pool.acquire_async()
+        with pytest.raises(TimeoutError):
+            await Connection.pool.acquire_async(timeout=0.05)
+        Connection.pool.release(item)
+        async with Connection.pool.borrow() as again:
+            return again is item
+
+    assert asyncio.run(main())
+
+
+def test_failed_health_check_replaces_the_object():
+    @object_pool(max_size=1, health_check=lambda item: not item.closed)
+    class Connection(Resource):
+        pass
+
+    item = Connection.pool.acquire()
+    item.close()
+    Connection.pool.release(item)
+    assert Connection.pool.acquire() is not item
+    assert Connection.pool.stats()["discarded"] == 1
@@ -0,0 +1,153 @@
+import asyncio
+import gc
+import threading
+from dataclasses import dataclass
+
+import pytest
+
+from decorators import EventBus, observer, thread_pool
+
+
+@dataclass
+class UserCreated:
+    name: str
+
+
+def test_function_subscribed_to_a_string_topic():
+    bus = EventBus()
+    received = []
+
+    @observer("user.created", bus=bus)
+    def on_created(event):
+        received.append(event)
+
+    assert bus.publish("user.created", "ada") == 1
+    assert received == ["ada"]
+
+
+def test_class_typed_event_topic():
+    bus = EventBus()
+    received = []
+
+    @observer(topic=UserCreated, bus=bus)
+    def on_created(event):
+        received.append(event.name)
+
+    assert callable(on_created) and on_created is not UserCreated
+    assert bus.publish(UserCreated, UserCreated("ada")) == 1
+    assert received == ["ada"]
+
+
+def test_shared_bus_publish():
+    received = []
+
+    @observer(topic=UserCreated)
+    def on_created(event):
+        received.append(event)
+
+    event = UserCreated("grace")
+    observer.publish(UserCreated, event)
+    assert received == [event]
+
+
+def test_class_given_positionally_is_a_marker():
+    @observer
+    class Listener:
+        pass
+
+    assert isinstance(Listener(), Listener)
+    assert "observer" in Listener.__patterns__
+
+
+def test_topic_given_twice_is_an_error():
+    with pytest.raises(TypeError):
+        observer("a", topic="b")
+
+
+def test_batched_thread_subscriber_gets_lists():
+    bus = EventBus("thread")
+    received = []
+
+    @observer("tick", bus=bus, batch=10)
+    def on_ticks(events):
+        received.extend(events)
+
+    for tick in range(25):
+        bus.publish("tick", tick)
+    assert bus.drain(timeout=5)
+    assert sorted(received) == list(range(25))
+
+
+def test_thread_bus_survives_a_pool_shutdown():
+    bus = EventBus("thread", pool="test-observer")
+    received = []
+
+    @observer("tick", bus=bus)
+    def on_tick(event):
+        received.append(event)
+
+    bus.publish("tick", 1)
+    assert bus.drain(timeout=5)
+    thread_pool.shutdown()
+    bus.publish("tick", 2)
+    assert bus.drain(timeout=5)
+    assert received == [1, 2]
+
+
+def test_observer_forwards_weak():
+    bus = EventBus()
+    received = []
+
+    def subscribe(weak):
+        @observer("tick", bus=bus, weak=weak)
+        def on_tick(event):
+            received.append((weak, event))
+
+    subscribe(True)
+    subscribe(False)
+    gc.collect()
+    assert bus.publish("tick", 1) == 1
+    assert received == [(False, 1)]
+
+
+def test_collected_subscriber_while_the_bus_lock_is_held():
+    bus = EventBus()
+
+    class Listener:
+        def on_tick(self, event):
+            pass
+
+    listener = Listener()
+    bus.subscribe("tick", listener.on_tick)
+
+    def collect():
+        nonlocal listener
+        with bus._lock:
+            del listener
+            gc.collect()
+
+    thread = threading.Thread(target=collect, daemon=True)
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert bus.publish("tick", 1) == 0
+    assert bus.subscribers("tick") == ()
+
+
+def test_asyncio_subscriber():
+    bus = EventBus("asyncio")
+    received = []
+
+    async def on_tick(event):
+        received.append(event)
+
+    async def main():
+        # asyncio subscriptions belong to the running loop.
+        observer("tick", bus=bus)(on_tick)
+        for tick in range(3):
+            bus.publish("tick", tick)
+        while len(received) < 3:
+            await asyncio.sleep(0.001)
+
+    asyncio.run(asyncio.wait_for(main(), 5))
+    assert received == [0, 1, 2]
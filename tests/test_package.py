@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import decorators
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_after(statement: str) -> set:
+    code = f"import sys\n{statement}\nprint(' '.join(name for name in sys.modules if name.startswith('decorators.')))"
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True, text=True).stdout
+    return set(output.split())
+
+
+def test_import_loads_no_submodule():
+    assert loaded_after("import decorators") == set()
+
+
+def test_name_loads_its_module_only():
+    assert loaded_after("from decorators import url") == {"decorators._common", "decorators._documentation"}
+    loaded = loaded_after("from decorators import timed")
+    assert "decorators._timing" in loaded
+    assert not loaded & {"decorators._concurrency", "decorators._caching", "decorators._micro_services"}
+
+
+def test_every_name_resolves():
+    for name in decorators.__all__:
+        assert getattr(decorators, name) is not None, name
+        assert name in vars(decorators)
+
+
+def test_unknown_name():
+    with pytest.raises(AttributeError):
+        decorators.missing
+    with pytest.raises(ImportError):
+        from decorators import missing  # noqa: F401
+
+
+def test_dir_lists_the_lazy_names():
+    assert set(decorators.__all__) <= set(dir(decorators))
@@ -0,0 +1,100 @@
+import gc
+
+from decorators import adapter, alert_view, behavioural, model, pattern, singleton
+
+
+def test_lookups_by_pattern_category_and_module():
+    @adapter
+    class Plug:
+        pass
+
+    assert Plug in pattern.by_pattern("adapter")
+    assert Plug in pattern.by_category("structural")
+    assert Plug in pattern.by_category("gof_pattern")
+    assert Plug in pattern.by_module(__name__)
+    assert set(pattern.of(Plug)["adapter"]) == {"structural", "gof_pattern"}
+    assert Plug.__patterns__ == ("adapter",)
+
+
+def test_patterns_are_combined():
+    @behavioural
+    @adapter
+    class Plug:
+        pass
+
+    assert set(pattern.of(Plug)) == {"adapter", "behavioural"}
+    assert Plug.__patterns__ == ("adapter", "behavioural")
+
+
+def test_class_replaced_by_its_decorator_keeps_its_tags():
+    @singleton
+    @adapter
+    class Service:
+        pass
+
+    assert set(Service.__patterns__) == {"adapter", "singleton"}
+    assert Service in pattern.by_pattern("adapter")
+    assert all(cls.__name__ != "Service" or cls is Service for cls in pattern.by_pattern("adapter"))
+
+
+def test_patterns_are_not_inherited():
+    @adapter
+    class Plug:
+        pass
+
+    class Socket(Plug):
+        pass
+
+    assert Plug().__patterns__ == ("adapter",)
+    assert Socket.__patterns__ == ()
+    assert Socket().__patterns__ == ()
+    assert pattern.of(Socket) == {}
+    assert Socket not in pattern.by_pattern("adapter")
+
+
+def test_collected_objects_leave_the_index():
+    @adapter
+    class Plug:
+        pass
+
+    @adapter
+    def plug():
+        pass
+
+    names = {"Plug", "plug"}
+    assert names <= {obj.__name__ for obj in pattern.by_module(__name__)}
+    del Plug, plug
+    gc.collect()
+    assert not names & {obj.__name__ for obj in pattern.by_pattern("adapter")}
+
+
+def test_objects_without_weak_references_are_not_indexed():
+    @pattern
+    class Callable:
+        __slots__ = ()
+
+        def __call__(self):
+            pass
+
+    instance = pattern(Callable())
+    assert pattern.of(instance) == {}
+    assert pattern.of(42) == {}
+
+
+def test_marker_patterns_return_the_class_itself():
+    class Plain:
+        pass
+
+    assert model(Plain) is Plain
+    assert set(pattern.of(Plain)["model"]) == {"mvc_pattern", "mvvm_pattern"}
+    assert Plain in pattern.by_category("mvvm_pattern")
+
+
+def test_patterns_of_a_family_pattern_are_in_its_categories():
+    @alert_view
+    class Dialog:
+        pass
+
+    assert set(pattern.of(Dialog)["alert_view"]) >= {"view"}
+    assert Dialog in pattern.by_category("view")
+    assert Dialog in pattern.by_pattern("alert_view")
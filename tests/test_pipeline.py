@@ -0,0 +1,107 @@
+import itertools
+
+import pytest
+
+from decorators import Pipeline, Stage, pipeline
+
+
+@pipeline
+def double(items):
+    for item in items:
+        yield item * 2
+
+
+@pipeline
+def increment(items):
+    for item in items:
+        yield item + 1
+
+
+@pipeline(workers=4)
+def square(items):
+    for item in items:
+        yield item * item
+
+
+@pipeline(batch=10)
+def sums(batches):
+    for batch in batches:
+        yield sum(batch)
+
+
+@pipeline(kind="process", workers=2)
+def negate(items):
+    for item in items:
+        yield -item
+
+
+@pipeline
+async def halve(items):
+    async for item in items:
+        yield item / 2
+
+
+@pipeline
+def fail_on_three(items):
+    for item in items:
+        if item == 3:
+            raise ValueError("three")
+        yield item
+
+
+def test_stages_compose_and_keep_the_order():
+    assert isinstance(double, Stage)
+    assert list(double([1, 2])) == [2, 4]
+    flow = range(100) | double | increment
+    assert isinstance(flow, Pipeline)
+    assert list(flow) == [item * 2 + 1 for item in range(100)]
+
+
+def test_stages_compose_before_the_source():
+    flow = double | increment
+    assert list(range(3) | flow) == [1, 3, 5]
+    with pytest.raises(TypeError):
+        list(flow)
+
+
+def test_several_workers():
+    assert sorted(range(100) | square) == [item * item for item in range(100)]
+
+
+def test_batches():
+    assert sum(range(95) | sums) == sum(range(95))
+    assert len(list(range(95) | sums)) == 10
+
+
+def test_asyncio_stage():
+    assert list(range(4) | halve) == [0, 0.5, 1, 1.5]
+
+
+def test_process_stage():
+    assert sorted(range(20) | negate) == sorted(-item for item in range(20))
+
+
+def test_error_of_a_stage_is_raised():
+    with pytest.raises(ValueError, match="three"):
+        list(range(10) | fail_on_three | double)
+
+
+def test_leaving_early_stops_the_pipeline():
+    flow = itertools.count() | double
+    assert list(itertools.islice(flow, 5)) == [0, 2, 4, 6, 8]
+
+
+def test_stats():
+    flow = range(50) | double | increment
+    assert flow.run() == 50
+    stats = flow.stats()
+    assert [stage["stage"].rsplit(".", 1)[-1] for stage in stats] == ["double", "increment"]
+    assert all(stage["items_in"] == stage["items_out"] == 50 for stage in stats)
+
+
+def test_class_stays_a_marker():
+    @pipeline
+    class Workers:
+        pass
+
+    assert isinstance(Workers(), Workers)
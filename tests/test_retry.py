@@ -0,0 +1,188 @@
+import asyncio
+
+import pytest
+
+from decorators import RetryBudget, retry
+
+
+class Clock:
+    # Fake monotonic clock, advanced by the fake sleep.
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+    async def sleep_async(self, delay):
+        self.sleep(delay)
+
+
+class FlakyService:
+    # Raises the given errors one per call, then returns "ok".
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self, *args):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def retrying(clock, service, **options):
+    options.setdefault("jitter", None)
+    return retry(service, clock=clock, sleep=clock.sleep, **options)
+
+
+def test_first_attempt_succeeds(clock):
+    service = FlakyService()
+    call = retrying(clock, service)
+    assert call() == "ok"
+    assert clock.sleeps == []
+    stats = call.stats()
+    assert (stats["calls"], stats["attempts"], stats["retries"], stats["giveups"]) == (1, 1, 0, 0)
+    assert stats["added_latency"]["count"] == 0
+
+
+def test_retries_with_exponential_backoff(clock):
+    service = FlakyService(ConnectionError(), ConnectionError())
+    call = retrying(clock, service, attempts=3, base_delay=0.1)
+    assert call() == "ok"
+    assert service.calls == 3
+    assert clock.sleeps == pytest.approx([0.1, 0.2])
+    stats = call.stats()
+    assert (stats["attempts"], stats["retries"]) == (3, 2)
+    assert stats["added_latency"]["count"] == 1
+
+
+@pytest.mark.parametrize("backoff, expected", [
+    ("linear", [1.0, 2.0, 3.0, 3.0]),
+    ("constant", [1.0, 1.0, 1.0, 1.0]),
+    ("exponential", [1.0, 2.0, 3.0, 3.0]),
+    (lambda retry_number: retry_number / 10, [0.1, 0.2, 0.3, 0.4]),
+])
+def test_backoff_is_capped_by_max_delay(clock, backoff, expected):
+    service = FlakyService(*[TimeoutError()] * 4)
+    call = retrying(clock, service, attempts=5, backoff=backoff, base_delay=1.0, max_delay=3.0)
+    assert call() == "ok"
+    assert clock.sleeps == pytest.approx(expected)
+
+
+def test_jitter_stays_within_the_backoff(clock):
+    service = FlakyService(*[ConnectionError()] * 20)
+    call = retrying(clock, service, attempts=21, base_delay=1.0, max_delay=1.0, jitter="full")
+    call()
+    assert all(0 <= delay <= 1.0 for delay in clock.sleeps)
+    clock.sleeps.clear()
+    service.errors = [ConnectionError()] * 20
+    call = retrying(clock, service, attempts=21, base_delay=1.0, max_delay=1.0, jitter="equal")
+    call()
+    assert all(0.5 <= delay <= 1.0 for delay in clock.sleeps)
+
+
+def test_gives_up_after_the_last_attempt(clock):
+    errors = [ConnectionError(attempt) for attempt in range(3)]
+    service = FlakyService(*errors)
+    call = retrying(clock, service, attempts=3)
+    with pytest.raises(ConnectionError) as raised:
+        call()
+    assert raised.value is errors[-1]
+    assert service.calls == 3
+    assert call.stats()["giveups"] == 1
+
+
+def test_other_exceptions_are_not_retried(clock):
+    service = FlakyService(ValueError("bad request"))
+    call = retrying(clock, service, retry_on=(ConnectionError, TimeoutError))
+    with pytest.raises(ValueError):
+        call()
+    assert service.calls == 1
+    assert clock.sleeps == []
+    assert call.stats()["giveups"] == 0
+
+
+def test_retry_on_predicate(clock):
+    service = FlakyService(OSError(503, "unavailable"), OSError(404, "not found"))
+    call = retrying(clock, service, retry_on=lambda exc: exc.errno == 503)
+    with pytest.raises(OSError) as raised:
+        call()
+    assert raised.value.errno == 404
+    assert service.calls == 2
+
+
+def test_no_retry_past_the_deadline(clock):
+    service = FlakyService(*[ConnectionError()] * 5)
+    call = retrying(clock, service, attempts=10, base_delay=1.0, deadline=3.5)
+    with pytest.raises(ConnectionError):
+        call()
+    # Waits of 1 and 2 seconds fit in the deadline, the next one (4 seconds) would not.
+    assert clock.sleeps == pytest.approx([1.0, 2.0])
+    assert call.stats()["giveups"] == 1
+
+
+def test_exhausted_budget_stops_retries(clock):
+    budget = RetryBudget(ratio=0.0, min_per_second=0.0, max_tokens=1.0, clock=clock)
+    service = FlakyService(*[ConnectionError()] * 5)
+    call = retrying(clock, service, attempts=5, budget=budget)
+    with pytest.raises(ConnectionError):
+        call()
+    assert service.calls == 2
+    stats = call.stats()
+    assert (stats["retries"], stats["budget_exhausted"], stats["giveups"]) == (1, 1, 1)
+
+
+def test_budget_refills_over_time(clock):
+    budget = RetryBudget(ratio=0.0, min_per_second=1.0, max_tokens=1.0, clock=clock)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    clock.now += 1.0
+    assert budget.withdraw()
+
+
+def test_coroutine_function(clock):
+    async def service():
+        flaky()
+        return "ok"
+
+    flaky = FlakyService(ConnectionError())
+    call = retry(service, clock=clock, sleep=clock.sleep_async, jitter=None, base_delay=0.5)
+    assert asyncio.run(call()) == "ok"
+    assert flaky.calls == 2
+    assert clock.sleeps == [0.5]
+
+
+def test_coroutine_function_gives_up(clock):
+    async def service():
+        flaky()
+
+    flaky = FlakyService(*[ConnectionError()] * 3)
+    call = retry(service, attempts=2, clock=clock, sleep=clock.sleep, jitter=None)
+    with pytest.raises(ConnectionError):
+        asyncio.run(call())
+    assert flaky.calls == 2
+    assert call.stats()["giveups"] == 1
+
+
+@pytest.mark.parametrize("options", [{"attempts": 0}, {"backoff": "fibonacci"}, {"jitter": "half"}])
+def test_invalid_options(options):
+    with pytest.raises(ValueError):
+        retry(FlakyService(), **options)
+
+
+def test_class_stays_a_marker():
+    @retry
+    class Client:
+        pass
+
+    assert isinstance(Client(), Client)
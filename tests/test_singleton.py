@@ -0,0 +1,95 @@
+import threading
+
+from decorators import flyweight, multiton, singleton
+
+
+@singleton
+class Settings:
+    def __init__(self, name="default"):
+        self.name = name
+
+
+@singleton
+class Registry:
+    def __init__(self):
+        self.items = []
+
+
+def setup_function():
+    singleton.reset()
+
+
+def test_one_instance():
+    first = Settings("first")
+    assert Settings("second") is first
+    assert first.name == "first"
+    assert isinstance(first, Settings)
+    assert Settings.__name__ == "Settings" and Settings.__qualname__ == "Settings"
+
+
+def test_concurrent_first_calls_build_one_instance():
+    built = []
+
+    @singleton
+    class Slow:
+        def __init__(self):
+            built.append(self)
+
+    instances = []
+    threads = [threading.Thread(target=lambda: instances.append(Slow())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(built) == 1
+    assert all(instance is built[0] for instance in instances)
+
+
+def test_reset():
+    first = Settings()
+    singleton.reset(Settings)
+    assert Settings() is not first
+    registry = Registry()
+    singleton.reset()
+    assert Registry() is not registry
+
+
+def test_subclasses_get_their_own_instance():
+    class Child(Settings):
+        def __init__(self):
+            super().__init__("child")
+
+    assert Child() is Child()
+    assert Child() is not Settings()
+    assert Child().name == "child"
+    child = Child()
+    singleton.reset(Settings)
+    assert Child() is not child
+
+
+def test_multiple_inheritance_of_singletons():
+    class Both(Settings, Registry):
+        pass
+
+    both = Both()
+    assert Both() is both
+    assert isinstance(both, Settings) and isinstance(both, Registry)
+    assert both is not Settings() and both is not Registry()
+
+
+def test_multiple_inheritance_of_other_decorated_classes():
+    @multiton
+    class Tenant:
+        def __init__(self, name):
+            self.name = name
+
+    @flyweight
+    class Glyph:
+        def __init__(self, name):
+            self.name = name
+
+    class Mixed(Tenant, Glyph, Settings):
+        pass
+
+    assert Mixed("a") is Mixed("a")
+    assert Mixed("a").name == "a"
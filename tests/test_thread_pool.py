@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from decorators import BoundedExecutor, future, thread_pool
+
+
+def setup_function():
+    thread_pool.shutdown()
+
+
+def test_pools_are_shared_by_name():
+    pool = thread_pool("test-io", max_workers=2)
+    assert isinstance(pool, BoundedExecutor)
+    assert thread_pool("test-io") is pool
+    assert pool.submit(pow, 2, 10).result() == 1024
+    with pytest.raises(ValueError):
+        thread_pool("test-io", max_workers=3)
+
+
+def test_class_stays_a_marker():
+    @thread_pool
+    class Workers:
+        pass
+
+    assert isinstance(Workers(), Workers)
+
+
+def test_function_runs_on_the_default_pool():
+    @thread_pool
+    def double(value):
+        return value * 2
+
+    assert double(21).result() == 42
+    assert double.pool is thread_pool("default")
+
+
+def test_function_returns_an_awaitable_in_an_event_loop():
+    @thread_pool
+    def double(value):
+        return value * 2
+
+    async def main():
+        return await double(4)
+
+    assert asyncio.run(main()) == 8
+
+
+def test_function_takes_no_pool_options():
+    with pytest.raises(TypeError):
+        thread_pool(len, max_workers=2)
+
+
+def test_future_function_survives_a_shutdown():
+    @future
+    def double(value):
+        return value * 2
+
+    assert double(1).result() == 2
+    pool = double.pool
+    thread_pool.shutdown()
+    assert double(2).result() == 4
+    assert double.pool is not pool and double.pool is thread_pool("default")
+
+
+def test_given_pool_stays_shut_down():
+    pool = BoundedExecutor("test-given")
+
+    @future(pool=pool)
+    def double(value):
+        return value * 2
+
+    assert double(1).result() == 2
+    pool.shutdown()
+    with pytest.raises(RuntimeError):
+        double(2)
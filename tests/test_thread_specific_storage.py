@@ -0,0 +1,100 @@
+import asyncio
+import gc
+import threading
+
+from decorators import thread_specific_storage
+
+
+def in_thread(function):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(function()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def test_one_instance_per_thread():
+    @thread_specific_storage
+    class Parser:
+        def __init__(self, strict=False):
+            self.strict = strict
+
+    parser = Parser(strict=True)
+    assert Parser() is parser and parser.strict
+    other = in_thread(Parser)
+    assert other is not parser and not other.strict
+
+
+def test_instances_are_closed_when_their_thread_ends():
+    closed = []
+
+    @thread_specific_storage
+    class Cursor:
+        def close(self):
+            closed.append(self)
+
+    cursor = in_thread(Cursor)
+    gc.collect()
+    assert closed == [cursor]
+
+
+def test_custom_dispose():
+    disposed = []
+
+    @thread_specific_storage(dispose=disposed.append)
+    class Buffer:
+        pass
+
+    buffer = in_thread(Buffer)
+    gc.collect()
+    assert disposed == [buffer]
+
+
+def test_one_instance_per_task():
+    closed = []
+
+    @thread_specific_storage
+    class Session:
+        def close(self):
+            closed.append(self)
+
+    async def use():
+        session = Session()
+        await asyncio.sleep(0)
+        assert Session() is session
+        return session
+
+    async def main():
+        return await asyncio.gather(use(), use())
+
+    first, second = asyncio.run(main())
+    assert first is not second
+    assert set(closed) == {first, second}
+
+
+def test_tasks_share_the_thread_instance_without_per_task():
+    @thread_specific_storage(per_task=False)
+    class Session:
+        pass
+
+    async def use():
+        return Session()
+
+    async def main():
+        return await asyncio.gather(use(), use())
+
+    first, second = asyncio.run(main())
+    assert first is second
+
+
+def test_subclass_has_its_own_instances():
+    @thread_specific_storage
+    class Parser:
+        pass
+
+    class StrictParser(Parser):
+        pass
+
+    assert StrictParser() is StrictParser()
+    assert type(StrictParser()) is StrictParser
+    assert StrictParser() is not Parser()
@@ -0,0 +1,88 @@
+import pytest
+
+from decorators import RateLimiter, ThrottledError, throttling
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def allowed(limiter, key=None, calls=1):
+    return sum(limiter.try_acquire(key) == 0.0 for _ in range(calls))
+
+
+@pytest.mark.parametrize("algorithm", ["token_bucket", "sliding_window"])
+def test_rate_per_second(clock, algorithm):
+    limiter = RateLimiter(2, algorithm=algorithm, clock=clock)
+    assert allowed(limiter, calls=5) == 2
+    clock.now += 1.01
+    assert allowed(limiter, calls=5) == 2
+
+
+@pytest.mark.parametrize("algorithm", ["token_bucket", "sliding_window"])
+def test_fractional_rate(clock, algorithm):
+    limiter = RateLimiter(0.5, algorithm=algorithm, clock=clock)
+    assert allowed(limiter, calls=3) == 1
+    clock.now += 1.01
+    assert allowed(limiter) == 0
+    clock.now += 1.0
+    assert allowed(limiter) == 1
+
+
+def test_sliding_window_burst(clock):
+    limiter = RateLimiter(1, burst=3, algorithm="sliding_window", clock=clock)
+    assert allowed(limiter, calls=5) == 3
+    # The window of 3 calls at 1 call per second is 3 seconds long.
+    clock.now += 2.0
+    assert allowed(limiter) == 0
+    wait = limiter.try_acquire()
+    assert wait == pytest.approx(1.0)
+    clock.now += wait + 0.01
+    assert allowed(limiter, calls=5) == 3
+
+
+def test_sliding_window_keys_are_limited_apart(clock):
+    limiter = RateLimiter(1, algorithm="sliding_window", clock=clock)
+    assert allowed(limiter, "a", 3) == 1
+    assert allowed(limiter, "b", 3) == 1
+    assert limiter.stats() == {"keys": 2, "allowed": 2, "limited": 4}
+
+
+@pytest.mark.parametrize("algorithm", ["token_bucket", "sliding_window"])
+def test_new_key_past_max_keys_is_limited(clock, algorithm):
+    limiter = RateLimiter(1, algorithm=algorithm, max_keys=3, clock=clock)
+    for key in "abc":
+        assert allowed(limiter, key) == 1
+    assert allowed(limiter, "d", 5) == 1
+    assert limiter.stats()["keys"] <= 3
+
+
+def test_idle_keys_are_dropped_first(clock):
+    limiter = RateLimiter(1, algorithm="sliding_window", max_keys=3, clock=clock)
+    allowed(limiter, "old")
+    clock.now += 5
+    allowed(limiter, "a")
+    allowed(limiter, "b")
+    allowed(limiter, "c")
+    assert set(limiter._keys) == {"a", "b", "c"}
+    assert allowed(limiter, "a") == 0
+
+
+def test_throttling_raises_with_the_wait(clock):
+    @throttling(1, per=10.0, algorithm="sliding_window", clock=clock)
+    def call():
+        return "ok"
+
+    assert call() == "ok"
+    with pytest.raises(ThrottledError) as raised:
+        call()
+    assert raised.value.retry_after == pytest.approx(10.0)
@@ -0,0 +1,121 @@
+import asyncio
+import gc
+import time
+
+from decorators import timed
+
+
+def make_handler(factor):
+    @timed
+    def handle(value):
+        return value * factor
+    return handle
+
+
+def test_counts_calls_per_function():
+    @timed
+    def work(value):
+        return value + 1
+
+    assert [work(1), work(2)] == [2, 3]
+    snapshot = timed.snapshot(work)
+    assert snapshot["calls"] == snapshot["samples"] == 2
+    assert snapshot["min_ns"] <= snapshot["p50_ns"] <= snapshot["max_ns"]
+
+
+def test_closures_sharing_a_qualified_name_are_kept_apart():
+    double, triple = make_handler(2), make_handler(3)
+    double(1)
+    triple(1)
+    triple(1)
+    assert timed.snapshot(double)["calls"] == 1
+    assert timed.snapshot(triple)["calls"] == 2
+    names = [name for name in timed.snapshot() if "make_handler.<locals>.handle" in name]
+    assert len(names) == len(set(names)) >= 2
+
+
+def test_every_n_extrapolates_the_totals():
+    @timed(every_n=10)
+    def work():
+        pass
+
+    for _ in range(100):
+        work()
+    snapshot = timed.snapshot(work)
+    assert (snapshot["calls"], snapshot["samples"]) == (100, 10)
+
+
+def test_coroutine_is_timed_over_the_await():
+    @timed
+    async def work():
+        await asyncio.sleep(0.01)
+
+    asyncio.run(work())
+    assert timed.snapshot(work)["min_ns"] >= 5_000_000
+
+
+def test_reset():
+    @timed
+    def work():
+        pass
+
+    work()
+    timed.reset(work)
+    assert timed.snapshot(work)["calls"] == 0
+
+
+def test_generator_steps_are_timed_without_the_consumer():
+    @timed
+    def numbers():
+        for number in range(3):
+            yield number
+
+    for _ in numbers():
+        time.sleep(0.01)
+    snapshot = timed.snapshot(numbers)
+    assert snapshot["calls"] == 1
+    assert snapshot["max_ns"] < 10_000_000
+
+
+def test_async_generator_steps_are_timed_separately():
+    @timed
+    async def ticks():
+        for tick in range(3):
+            await asyncio.sleep(0.01)
+            yield tick
+
+    async def consume():
+        items = []
+        async for item in ticks():
+            items.append(item)
+            await asyncio.sleep(0.05)
+        return items
+
+    assert asyncio.run(consume()) == [0, 1, 2]
+    snapshot = timed.snapshot(ticks)
+    # The three 10ms steps, not the 150ms the consumer held the items.
+    assert 25_000_000 <= snapshot["max_ns"] < 100_000_000
+    assert timed.snapshot()[f"{ticks.__timed__.name} (first item)"]["calls"] == 1
+
+
+def test_sampled_and_unsampled_wrappers_of_one_function():
+    def work():
+        pass
+
+    every = timed(work, every_n=2)
+    always = timed(work)
+    for _ in range(4):
+        every()
+        always()
+    assert (timed.snapshot(every)["calls"], timed.snapshot(every)["samples"]) == (4, 2)
+    assert (timed.snapshot(always)["calls"], timed.snapshot(always)["samples"]) == (4, 4)
+
+
+def test_timings_of_collected_functions_are_dropped():
+    handler = make_handler(4)
+    handler(1)
+    name = handler.__timed__.name
+    assert name in timed.snapshot()
+    del handler
+    gc.collect()
+    assert name not in timed.snapshot()
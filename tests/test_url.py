@@ -0,0 +1,65 @@
+import asyncio
+import inspect
+
+from decorators import doc_urls, url
+
+
+@url("https://example.com/first")
+@url("https://example.com/second")
+def documented(value):
+    return value
+
+
+def test_function_is_returned_unwrapped():
+    def function():
+        return 1
+
+    assert url("https://example.com")(function) is function
+    assert function.__doc_urls__ == ("https://example.com",)
+
+
+def test_stacked_urls_keep_the_source_order():
+    assert documented(1) == 1
+    assert doc_urls(documented) == ("https://example.com/first", "https://example.com/second")
+    assert doc_urls(f"{__name__}.documented") == doc_urls(documented)
+
+
+def test_class_and_undocumented_objects():
+    @url("https://example.com/class")
+    class Documented:
+        pass
+
+    assert doc_urls(Documented) == ("https://example.com/class",)
+
+    class Subclass(Documented):
+        pass
+
+    assert doc_urls(Subclass) == ()
+    assert doc_urls(len) == ()
+
+
+def test_debug_prints_on_every_call(capsys):
+    @url("https://example.com/debug", debug=True)
+    def function():
+        return 2
+
+    assert function() == 2
+    assert function() == 2
+    assert capsys.readouterr().out == "Doc: https://example.com/debug\n" * 2
+    assert doc_urls(function) == ("https://example.com/debug",)
+
+
+def test_debug_keeps_the_kind_of_function(capsys):
+    @url("https://example.com/async", debug=True)
+    async def coroutine():
+        return 3
+
+    @url("https://example.com/generator", debug=True)
+    def generator():
+        yield 4
+
+    assert inspect.iscoroutinefunction(coroutine)
+    assert inspect.isgeneratorfunction(generator)
+    assert asyncio.run(coroutine()) == 3
+    assert list(generator()) == [4]
+    assert capsys.readouterr().out.count("Doc: ") == 2